@@ -17,9 +17,44 @@ DB_PATH = BASE_DIR / 'treballadors.db'
 # ============================================================================
 # PARÀMETRES DE L'ALGORISME GENÈTIC
 # ============================================================================
+# Motor: 'genetic' (algorisme genètic), 'recuit' (recuit simulat), 'tabu' (cerca tabú)
+# o 'diari' (aparellament de cost mínim dia a dia, determinista)
+MOTOR_OPTIMITZACIO = 'genetic'
+SA_ITERACIONS = 20000  # Moviments que prova el recuit simulat
+TABU_ITERACIONS = 500  # Iteracions (moviments aplicats) de la cerca tabú
+TABU_DURADA = 10  # Iteracions que una parella (necessitat, treballador) abandonada queda tabú
+TABU_ITERACIONS_ESTANCAMENT = 50  # Atura la cerca tabú després de N iteracions sense millora (None = desactivat)
+AG_LLAVOR = None  # Llavor aleatòria (None = una de nova a cada execució, que queda al resum)
+AG_PRESOLUCIO = False  # Amaga als motors les necessitats impossibles (consten com a descobertes) i fixa les forçades
 AG_MIDA_POBLACIO = 50
 AG_GENERACIONS = 150
 AG_PROB_MUTACIO = 0.1
+AG_CONSTRUCCIO = 'ordre'  # Construcció inicial: 'ordre' (de càrrega) o 'restringides' (menys candidats primer)
+AG_PROCESSOS = 1  # Processos per produir i avaluar fills (1 = seqüencial, 0 = tots els nuclis)
+AG_ILLES = 1  # Poblacions independents del model d'illes (1 = població única)
+AG_INTERVAL_MIGRACIO = 10  # Generacions entre migracions
+AG_MIGRANTS = 2  # Individus que emigra cada illa
+AG_TOPOLOGIA_MIGRACIO = 'anell'  # 'anell' o 'aleatoria'
+AG_DESCOMPON_COMPONENTS = False  # Resol per separat els grups de necessitats que no comparteixen treballadors
+AG_MIDA_CACHE = 10000  # Entrades de la cache de fitness (0 = desactivada)
+AG_AVALUACIO_LOTS = False  # Avalua els fills de cada generació junts amb NumPy
+AG_CLASSES_EQUIVALENCIA = False  # Avalua les solucions simètriques (treballadors intercanviables) en una forma canònica equitativa
+AG_CERCA_LOCAL = 0  # Individus d'elit que es milloren amb cerca local a cada generació (0 = desactivada)
+AG_MOVIMENTS_CERCA_LOCAL = 100  # Moviments (reassignació / intercanvi) que s'intenten per individu
+AG_TEMPS_MAXIM = None  # Temps màxim d'execució en segons (None = sense límit)
+AG_SCORE_OBJECTIU = None  # Atura l'execució en arribar a aquest score (None = desactivat)
+AG_GENERACIONS_ESTANCAMENT = None  # Atura després de N generacions sense millora (None = desactivat)
+AG_EPSILON_MILLORA = 0.0  # Millora mínima del score perquè no compti com a estancament
+AG_INTERVAL_CHECKPOINT = 10  # Generacions entre checkpoints (0 = sense checkpoints)
+CHECKPOINT_DIR = BASE_DIR / 'checkpoints'
+AG_TELEMETRIA_JSONL = False  # Desa la telemetria de cada generació a TELEMETRIA_DIR (una línia JSON per generació)
+TELEMETRIA_DIR = BASE_DIR / 'logs' / 'telemetria'
+AG_PARTIR_PLA_PREVI = False  # Sembra la població inicial amb el pla actual d'assig_grup_T
+AG_FRACCIO_PLA_PREVI = 0.5  # Fracció de la població inicial que surt del pla previ
+AG_HORITZO_MOBIL = False  # Resol el període per finestres solapades (períodes llargs)
+AG_DIES_FINESTRA = 28  # Dies de cada finestra de l'horitzó mòbil
+AG_DIES_SOLAPAMENT = 7  # Dies que es tornen a resoldre a la finestra següent
+AG_MAX_DIES_HORITZO_MOBIL = 365  # Període màxim en mode horitzó mòbil
 
 # ============================================================================
 # PARÀMETRES DE TREBALLADORS
@@ -3,6 +3,7 @@ Controller per executar l'algorisme genètic
 Integra genetic_algorithm.py i main.py amb la GUI
 """
 import logging
+import random
 from datetime import date, datetime
 from typing import Dict, Optional, Callable, List
 import threading
@@ -16,11 +17,16 @@ logger = logging.getLogger(__name__)
 class GeneticController:
     """Gestiona l'execució de l'algorisme genètic"""
     
+    # Motors d'optimització disponibles
+    MOTORS = ('genetic', 'recuit', 'tabu', 'diari')
+    
     def __init__(self, db_manager: DatabaseManager = None):
         """Inicialitza el controller"""
         self.db = db_manager or DatabaseManager()
         self.running = False
         self.thread = None
+        # Testimoni de cancel·lació de l'execució en curs (els motors el consulten a cada fill)
+        self.cancel_lacio = threading.Event()
         self.progress_queue = queue.Queue()
         logger.info("GeneticController inicialitzat")
     
@@ -33,6 +39,12 @@ class GeneticController:
                           data_fi: date,
                           mida_poblacio: int = None,
                           generacions: int = None,
+                          temps_maxim: float = None,
+                          reprendre: bool = False,
+                          partir_pla_previ: bool = None,
+                          horitzo_mobil: bool = None,
+                          motor: str = None,
+                          llavor: int = None,
                           on_duplicate: str = 'replace_all',
                           progress_callback: Optional[Callable] = None,
                           finish_callback: Optional[Callable] = None):
@@ -43,7 +55,17 @@ class GeneticController:
             data_inici: Data d'inici del període
             data_fi: Data fi del període
             mida_poblacio: Mida de la població (si None, usa config)
-            generacions: Nombre de generacions (si None, usa config)
+            generacions: Nombre màxim de generacions (si None, usa config)
+            temps_maxim: Temps màxim d'execució en segons (si None, usa config)
+            reprendre: Continua des de l'últim checkpoint del període (si n'hi ha)
+            partir_pla_previ: Sembra la població amb el pla actual d'assig_grup_T (si None, usa config)
+            horitzo_mobil: Resol el període per finestres solapades, per a períodes de més
+                de 90 dies (si None, usa config)
+            motor: Motor d'optimització, 'genetic', 'recuit', 'tabu' o 'diari' (si None, usa config).
+                La cerca tabú sempre parteix del pla actual d'assig_grup_T
+            llavor: Llavor aleatòria; amb les mateixes dades i la mateixa llavor el pla és
+                idèntic sigui quin sigui el nombre de processos (si None, usa config; si
+                tampoc n'hi ha, se'n tria una i queda al resum per poder repetir l'execució)
             on_duplicate: Comportament en duplicats ('replace_all', 'add_new_only')
             progress_callback: Funció per notificar progrés
             finish_callback: Funció per notificar finalització
@@ -62,9 +84,26 @@ class GeneticController:
                 finish_callback(False, error)
             return
         
+        if horitzo_mobil is None:
+            horitzo_mobil = config.AG_HORITZO_MOBIL
+        if motor is None:
+            motor = config.MOTOR_OPTIMITZACIO
+        
+        error = None
+        if motor not in self.MOTORS:
+            error = f"Motor d'optimització desconegut: {motor}"
+        elif horitzo_mobil and motor != 'genetic':
+            error = "L'horitzó mòbil només està disponible amb l'algorisme genètic"
+        if error:
+            logger.error(error)
+            if finish_callback:
+                finish_callback(False, error)
+            return
+        
         dies_totals = (data_fi - data_inici).days + 1
-        if dies_totals > 90:
-            error = "El període no pot superar 90 dies"
+        max_dies = config.AG_MAX_DIES_HORITZO_MOBIL if horitzo_mobil else 90
+        if dies_totals > max_dies:
+            error = f"El període no pot superar {max_dies} dies"
             logger.error(error)
             if finish_callback:
                 finish_callback(False, error)
@@ -75,20 +114,31 @@ class GeneticController:
             mida_poblacio = config.AG_MIDA_POBLACIO
         if generacions is None:
             generacions = config.AG_GENERACIONS
+        if temps_maxim is None:
+            temps_maxim = config.AG_TEMPS_MAXIM
+        if partir_pla_previ is None:
+            partir_pla_previ = config.AG_PARTIR_PLA_PREVI
+        if llavor is None:
+            llavor = config.AG_LLAVOR
+        if llavor is None:
+            llavor = random.SystemRandom().getrandbits(32)
         
         # Executar en thread separat
         self.running = True
+        self.cancel_lacio = threading.Event()
         self.thread = threading.Thread(
             target=self._executar_thread,
-            args=(data_inici, data_fi, mida_poblacio, generacions, 
-                  on_duplicate, progress_callback, finish_callback),
+            args=(data_inici, data_fi, mida_poblacio, generacions, temps_maxim, reprendre,
+                  partir_pla_previ, horitzo_mobil, motor, llavor, on_duplicate,
+                  progress_callback, finish_callback),
             daemon=True
         )
         self.thread.start()
-        logger.info(f"Thread d'algorisme genètic iniciat: {data_inici} - {data_fi}")
+        logger.info(f"Thread d'algorisme genètic iniciat: {data_inici} - {data_fi} (llavor {llavor})")
     
-    def _executar_thread(self, data_inici, data_fi, mida_poblacio, generacions,
-                        on_duplicate, progress_callback, finish_callback):
+    def _executar_thread(self, data_inici, data_fi, mida_poblacio, generacions, temps_maxim,
+                        reprendre, partir_pla_previ, horitzo_mobil, motor, llavor, on_duplicate,
+                        progress_callback, finish_callback):
         """Mètode privat que s'executa en el thread"""
         try:
             logger.info("Iniciant càrrega de dades...")
@@ -100,8 +150,12 @@ class GeneticController:
                 from core.data_loader import DataLoader
                 from core.data_structures import EstadistiquesGlobals
                 from core.genetic_algorithm import AlgorismeGenetic
-                from core.constraints import RestriccionManager
-                from core import constraints
+                from core.rolling_horizon import PlanificadorHoritzoMobil
+                from core.simulated_annealing import RecuitSimulat
+                from core.tabu_search import CercaTabu
+                from core.daily_matching import AssignacioPerDies
+                from core.feasibility import analitza_viabilitat
+                from core.telemetry import RegistreJsonl
             except ImportError as e:
                 logger.error(f"Error important mòduls core: {e}")
                 if finish_callback:
@@ -121,6 +175,11 @@ class GeneticController:
             necessitats = loader.carrega_necessitats_cobertura()
             calendari = loader.carrega_calendari()
             exclude_map = loader.carrega_descansos_dies()
+            # La cerca tabú sempre parteix del pla actual (replanificació)
+            if partir_pla_previ or motor == 'tabu':
+                pla_previ = loader.carrega_assignacions_grup_T()
+            else:
+                pla_previ = None
             
             if progress_callback:
                 progress_callback(15, "Dades carregades. Configurant restriccions...")
@@ -128,60 +187,171 @@ class GeneticController:
             # Estadístiques globals
             estadistiques = EstadistiquesGlobals()
             
-            # Configurar restriccions
-            restriccions = RestriccionManager()
-            
-            # Afegir restriccions rígides (pes infinit)
-            restriccions.afegeix_restriccio(
-                constraints.restriccio_unica_assignacio_per_dia_rigida, 
-                float('inf'), 
-                "Única assignació per dia"
-            )
-            restriccions.afegeix_restriccio(
-                constraints.restriccio_sense_solapaments_rigida, 
-                float('inf'),
-                "Sense solapaments"
-            )
-            restriccions.afegeix_restriccio(
-                constraints.restriccio_descans_minim_12h_rigida, 
-                float('inf'),
-                "Descans mínim 12h"
-            )
-            restriccions.afegeix_restriccio(
-                constraints.restriccio_divendres_cap_setmana_rigida, 
-                float('inf'),
-                "Divendres cap de setmana"
+            # Presolució: els motors no veuen les necessitats impossibles i es fixen les forçades
+            totes_necessitats = necessitats
+            informe_viabilitat = None
+            if config.AG_PRESOLUCIO:
+                informe_viabilitat = analitza_viabilitat(
+                    treballadors, torns, necessitats, calendari, estadistiques, exclude_map
+                )
+                for nec, motiu in informe_viabilitat.impossibles:
+                    logger.warning(f"Necessitat impossible {nec.servei} {nec.data}: {motiu}")
+                necessitats = informe_viabilitat.necessitats_viables(necessitats)
+            assignacions_forcades = (
+                informe_viabilitat.assignacions_forcades() if informe_viabilitat else None
             )
             
-            # Afegir restriccions toves (pes configurable)
-            restriccions.afegeix_restriccio(constraints.restriccio_grup_T, 100.0, "Grup T")
-            restriccions.afegeix_restriccio(constraints.restriccio_sense_descans, 80.0, "Sense descans")
-            restriccions.afegeix_restriccio(constraints.restriccio_formacio_requerida, 100.0, "Formació requerida")
-            restriccions.afegeix_restriccio(constraints.restriccio_linia_correcta, 90.0, "Línia correcta")
-            restriccions.afegeix_restriccio(constraints.restriccio_hores_anuals, 70.0, "Hores anuals")
-            restriccions.afegeix_restriccio(constraints.restriccio_dies_consecutius, 60.0, "Dies consecutius")
-            restriccions.afegeix_restriccio(constraints.restriccio_equitat_canvis_zona, 50.0, "Equitat canvis zona")
-            restriccions.afegeix_restriccio(constraints.restriccio_equitat_canvis_torn, 50.0, "Equitat canvis torn")
-            restriccions.afegeix_restriccio(constraints.restriccio_cobertura_completa, 120.0, "Cobertura completa")
-            restriccions.afegeix_restriccio(constraints.restriccio_distribucio_equilibrada, 40.0, "Distribució equilibrada")
+            # Configurar restriccions
+            restriccions = self.crea_restriccions()
             
             if progress_callback:
                 progress_callback(20, "Iniciant algorisme genètic...")
             
-            # Crear i executar l'algorisme genètic
-            ag = AlgorismeGenetic(
-                treballadors=treballadors,
-                torns=torns,
-                necessitats=necessitats,
-                calendari=calendari,
-                restriccions=restriccions,
-                estadistiques=estadistiques,
+            # Paràmetres de l'AG i opcions d'execució
+            parametres_ag = dict(
                 mida_poblacio=mida_poblacio,
-                exclude_map=exclude_map
+                exclude_map=exclude_map,
+                construccio=config.AG_CONSTRUCCIO,
+                mida_cache=config.AG_MIDA_CACHE,
+                avaluacio_lots=config.AG_AVALUACIO_LOTS,
+                classes_equivalencia=config.AG_CLASSES_EQUIVALENCIA,
+                cerca_local=config.AG_CERCA_LOCAL,
+                moviments_cerca_local=config.AG_MOVIMENTS_CERCA_LOCAL,
+                assignacions_forcades=assignacions_forcades,
+                llavor=llavor
+            )
+            opcions_execucio = dict(
+                generacions=generacions,
+                processos=config.AG_PROCESSOS,
+                temps_maxim=temps_maxim,
+                score_objectiu=config.AG_SCORE_OBJECTIU,
+                generacions_estancament=config.AG_GENERACIONS_ESTANCAMENT,
+                epsilon_millora=config.AG_EPSILON_MILLORA,
+                pla_previ=pla_previ,
+                cancel_lacio=self.cancel_lacio
             )
             
-            # Executar l'algorisme
-            millor_individu = ag.executa(generacions=generacions)
+            if motor == 'diari':
+                # Aparellament de cost mínim dia a dia (determinista, sense iteracions)
+                per_dies = AssignacioPerDies(
+                    treballadors, torns, necessitats, calendari, restriccions, estadistiques,
+                    exclude_map=exclude_map, assignacions_forcades=assignacions_forcades,
+                    llavor=llavor
+                )
+                
+                def progress_dies(fets, total):
+                    if progress_callback:
+                        progress_callback(20 + int(fets / total * 75), f"Dia {fets}/{total}")
+                
+                millor_individu = per_dies.executa(
+                    progress_callback=progress_dies,
+                    cancel_lacio=self.cancel_lacio
+                )
+                resum_execucio = per_dies.resum_execucio
+            elif motor in ('recuit', 'tabu'):
+                # Motors de solució única (mateix model del problema i restriccions)
+                if motor == 'recuit':
+                    motor_unic = RecuitSimulat(
+                        treballadors, torns, necessitats, calendari, restriccions, estadistiques,
+                        exclude_map=exclude_map, assignacions_forcades=assignacions_forcades,
+                        llavor=llavor
+                    )
+                    iteracions = config.SA_ITERACIONS
+                else:
+                    motor_unic = CercaTabu(
+                        treballadors, torns, necessitats, calendari, restriccions, estadistiques,
+                        exclude_map=exclude_map, assignacions_forcades=assignacions_forcades,
+                        llavor=llavor, durada_tabu=config.TABU_DURADA
+                    )
+                    iteracions = config.TABU_ITERACIONS
+                    # L'estancament de la cerca tabú es compta en iteracions, no en generacions
+                    opcions_execucio['generacions_estancament'] = config.TABU_ITERACIONS_ESTANCAMENT
+                
+                def progress_iteracions(fetes, total):
+                    if progress_callback:
+                        progress_callback(20 + int(fetes / total * 75),
+                                          f"Iteració {fetes}/{total}")
+                
+                opcions_execucio.pop('generacions')
+                opcions_execucio.pop('processos')
+                millor_individu = motor_unic.executa(
+                    iteracions=iteracions,
+                    progress_callback=progress_iteracions,
+                    **opcions_execucio
+                )
+                resum_execucio = motor_unic.resum_execucio
+            elif horitzo_mobil:
+                # Finestres solapades resoltes en seqüència (sense checkpoints)
+                planificador = PlanificadorHoritzoMobil(
+                    treballadors=treballadors,
+                    torns=torns,
+                    necessitats=necessitats,
+                    calendari=calendari,
+                    restriccions=restriccions,
+                    estadistiques=estadistiques,
+                    dies_finestra=config.AG_DIES_FINESTRA,
+                    dies_solapament=config.AG_DIES_SOLAPAMENT,
+                    **parametres_ag
+                )
+                
+                def progress_finestra(fetes, total):
+                    if progress_callback:
+                        progress_callback(20 + int(fetes / total * 75),
+                                          f"Finestra {fetes}/{total} completada")
+                
+                millor_individu = planificador.executa(
+                    data_inici, data_fi,
+                    progress_callback=progress_finestra,
+                    **opcions_execucio
+                )
+                resum_execucio = planificador.resum_execucio
+            else:
+                # Crear i executar l'algorisme genètic
+                ag = AlgorismeGenetic(
+                    treballadors=treballadors,
+                    torns=torns,
+                    necessitats=necessitats,
+                    calendari=calendari,
+                    restriccions=restriccions,
+                    estadistiques=estadistiques,
+                    **parametres_ag
+                )
+                
+                # Telemetria per generació: progrés de la GUI i, si està activat, fitxer JSONL
+                registre = (RegistreJsonl(self.fitxer_telemetria(data_inici, data_fi))
+                            if config.AG_TELEMETRIA_JSONL else None)
+                
+                def telemetria(esdeveniment):
+                    if registre is not None:
+                        registre(esdeveniment)
+                    self._progress_ag(esdeveniment, progress_callback)
+                
+                opcions_execucio.update(
+                    fitxer_checkpoint=str(self.fitxer_checkpoint(data_inici, data_fi)),
+                    interval_checkpoint=config.AG_INTERVAL_CHECKPOINT,
+                    reprendre=reprendre,
+                    fraccio_pla=config.AG_FRACCIO_PLA_PREVI
+                )
+                if config.AG_ILLES > 1:
+                    millor_individu = ag.executa_illes(
+                        num_illes=config.AG_ILLES,
+                        interval_migracio=config.AG_INTERVAL_MIGRACIO,
+                        num_migrants=config.AG_MIGRANTS,
+                        topologia=config.AG_TOPOLOGIA_MIGRACIO,
+                        **opcions_execucio
+                    )
+                elif config.AG_DESCOMPON_COMPONENTS:
+                    millor_individu = ag.executa_components(telemetria=telemetria, **opcions_execucio)
+                else:
+                    millor_individu = ag.executa(telemetria=telemetria, **opcions_execucio)
+                resum_execucio = ag.resum_execucio
+            
+            # Cancel·lada: el millor pla parcial no es guarda i el checkpoint es conserva
+            if self.cancel_lacio.is_set():
+                logger.info("Execució cancel·lada: no es guarden els resultats")
+                if finish_callback:
+                    finish_callback(False, "Execució cancel·lada per l'usuari")
+                return
             
             if progress_callback:
                 progress_callback(95, "Guardant resultats...")
@@ -194,21 +364,41 @@ class GeneticController:
                 on_duplicate
             )
             
+            # L'execució ha acabat: el checkpoint ja no cal
+            self.elimina_checkpoint(data_inici, data_fi)
+            
             if progress_callback:
                 progress_callback(100, "Completat!")
             
             # Preparar resum
             assignacions, info = millor_individu if millor_individu else ([], {})
+            if informe_viabilitat is not None and informe_viabilitat.impossibles:
+                # Les necessitats impossibles consten com a descobertes: el pla es torna a
+                # avaluar amb totes les necessitats del període
+                info = dict(info, **restriccions.evalua_solucio(
+                    assignacions, treballadors, torns, totes_necessitats, calendari, estadistiques
+                ))
+            cobertes = {(a.torn_id, a.data) for a in assignacions}
             resum = {
+                'motor': motor,
+                'llavor': llavor,
                 'data_inici': data_inici,
                 'data_fi': data_fi,
                 'generacions': generacions,
                 'mida_poblacio': mida_poblacio,
                 'fitness_final': info.get('fitness', 0),
-                'assignacions': len(assignacions)
+                'assignacions': len(assignacions),
+                'necessitats': len(totes_necessitats),
+                'necessitats_descobertes': sum(
+                    1 for nec in totes_necessitats if (nec.servei, nec.data) not in cobertes
+                )
             }
+            resum.update(resum_execucio)
+            if informe_viabilitat is not None:
+                resum.update(informe_viabilitat.resum())
             
-            logger.info(f"Algorisme completat. Fitness: {resum['fitness_final']:.2f}")
+            logger.info(f"Algorisme completat. Fitness: {resum['fitness_final']:.2f} "
+                        f"(aturada: {resum.get('motiu_aturada')}, {resum.get('temps_execucio', 0):.1f} s)")
             
             if finish_callback:
                 finish_callback(True, resum)
@@ -221,13 +411,57 @@ class GeneticController:
         finally:
             self.running = False
     
-    def _progress_ag(self, generacio: int, total_generacions: int, 
-                    fitness: float, callback: Optional[Callable]):
-        """Notifica el progrés de l'algorisme genètic"""
+    @staticmethod
+    def crea_restriccions():
+        """Gestor de restriccions de l'aplicació: rígides amb pes infinit i toves amb pes finit"""
+        from core.constraints import RestriccionManager
+        from core import constraints
+        
+        restriccions = RestriccionManager()
+        
+        # Afegir restriccions rígides (pes infinit)
+        restriccions.afegeix_restriccio(
+            constraints.restriccio_unica_assignacio_per_dia_rigida, 
+            float('inf'), 
+            "Única assignació per dia"
+        )
+        restriccions.afegeix_restriccio(
+            constraints.restriccio_sense_solapaments_rigida, 
+            float('inf'),
+            "Sense solapaments"
+        )
+        restriccions.afegeix_restriccio(
+            constraints.restriccio_descans_minim_12h_rigida, 
+            float('inf'),
+            "Descans mínim 12h"
+        )
+        restriccions.afegeix_restriccio(
+            constraints.restriccio_divendres_cap_setmana_rigida, 
+            float('inf'),
+            "Divendres cap de setmana"
+        )
+        
+        # Afegir restriccions toves (pes configurable)
+        restriccions.afegeix_restriccio(constraints.restriccio_grup_T, 100.0, "Grup T")
+        restriccions.afegeix_restriccio(constraints.restriccio_sense_descans, 80.0, "Sense descans")
+        restriccions.afegeix_restriccio(constraints.restriccio_formacio_requerida, 100.0, "Formació requerida")
+        restriccions.afegeix_restriccio(constraints.restriccio_linia_correcta, 90.0, "Línia correcta")
+        restriccions.afegeix_restriccio(constraints.restriccio_hores_anuals, 70.0, "Hores anuals")
+        restriccions.afegeix_restriccio(constraints.restriccio_dies_consecutius, 60.0, "Dies consecutius")
+        restriccions.afegeix_restriccio(constraints.restriccio_equitat_canvis_zona, 50.0, "Equitat canvis zona")
+        restriccions.afegeix_restriccio(constraints.restriccio_equitat_canvis_torn, 50.0, "Equitat canvis torn")
+        restriccions.afegeix_restriccio(constraints.restriccio_cobertura_completa, 120.0, "Cobertura completa")
+        restriccions.afegeix_restriccio(constraints.restriccio_distribucio_equilibrada, 40.0, "Distribució equilibrada")
+        return restriccions
+    
+    def _progress_ag(self, esdeveniment, callback: Optional[Callable]):
+        """Notifica el progrés de l'algorisme genètic a partir de la telemetria d'una generació"""
         if callback:
             # Progrés entre 20% i 95%
-            progress = 20 + int((generacio / total_generacions) * 75)
-            missatge = f"Generació {generacio}/{total_generacions} - Fitness: {fitness:.2f}"
+            progress = 20 + int((esdeveniment.generacio / max(esdeveniment.generacions, 1)) * 75)
+            missatge = (f"Generació {esdeveniment.generacio}/{esdeveniment.generacions} - "
+                        f"Fitness: {esdeveniment.millor:.2f} - "
+                        f"Cobertes: {esdeveniment.cobertes}/{esdeveniment.necessitats}")
             callback(progress, missatge)
     
     def _guardar_resultats(self, individu, treballadors: Dict, 
@@ -318,6 +552,35 @@ class GeneticController:
         except Exception as e:
             logger.error(f"Error guardant històric: {e}")
     
+    # ========================================================================
+    # CHECKPOINTS
+    # ========================================================================
+    
+    def fitxer_checkpoint(self, data_inici: date, data_fi: date):
+        """Ruta del checkpoint de l'execució d'un període"""
+        return config.CHECKPOINT_DIR / f"ag_{data_inici.isoformat()}_{data_fi.isoformat()}.pkl.gz"
+    
+    def fitxer_telemetria(self, data_inici: date, data_fi: date):
+        """Ruta del fitxer JSONL de telemetria de l'execució d'un període"""
+        return config.TELEMETRIA_DIR / f"ag_{data_inici.isoformat()}_{data_fi.isoformat()}.jsonl"
+    
+    def hi_ha_checkpoint(self, data_inici: date, data_fi: date) -> bool:
+        """Indica si hi ha una execució interrompuda que es pot reprendre"""
+        return self.fitxer_checkpoint(data_inici, data_fi).exists()
+    
+    def elimina_checkpoint(self, data_inici: date, data_fi: date):
+        try:
+            self.fitxer_checkpoint(data_inici, data_fi).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"No s'ha pogut eliminar el checkpoint: {e}")
+    
+    def reprendre_algorisme(self, data_inici: date, data_fi: date, **kwargs):
+        """
+        Reprèn una execució interrompuda des de l'últim checkpoint del període.
+        Accepta els mateixos arguments que executar_algorisme
+        """
+        self.executar_algorisme(data_inici, data_fi, reprendre=True, **kwargs)
+    
     # ========================================================================
     # CONTROL D'EXECUCIÓ
     # ========================================================================
@@ -325,14 +588,18 @@ class GeneticController:
     def cancel_lar_execucio(self):
         """Cancel·la l'execució de l'algorisme"""
         if self.running:
-            self.running = False
+            self.cancel_lacio.set()
             logger.info("Cancel·lació d'algorisme sol·licitada")
-            # Nota: El thread acabarà quan acabi la generació actual
+            # El motor s'atura abans del fill següent; el thread acaba sense guardar
     
     def is_running(self) -> bool:
         """Retorna si l'algorisme està executant-se"""
         return self.running
     
+    def is_cancelled(self) -> bool:
+        """Retorna si s'ha cancel·lat l'última execució"""
+        return self.cancel_lacio.is_set()
+    
     # ========================================================================
     # CONSULTA DE RESULTATS
     # ========================================================================
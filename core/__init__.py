@@ -9,6 +9,7 @@ from .data_structures import (
     Treballador,
     Torn,
     NecessitatCobertura,
+    HorariNecessitat,
     DiaCalendari,
     ServeiTorn,
     EstadistiquesGlobals
@@ -20,6 +21,14 @@ from .data_loader import DataLoader
 # Imports de genetic_algorithm
 from .genetic_algorithm import AlgorismeGenetic
 
+# Imports dels motors de solució única
+from .simulated_annealing import RecuitSimulat
+from .tabu_search import CercaTabu
+from .daily_matching import AssignacioPerDies
+
+# Imports de stopping
+from .stopping import CriterisAturada
+
 # Imports de constraints
 from .constraints import (
     RestriccionManager,
@@ -46,6 +55,7 @@ __all__ = [
     'Treballador',
     'Torn',
     'NecessitatCobertura',
+    'HorariNecessitat',
     'DiaCalendari',
     'ServeiTorn',
     'EstadistiquesGlobals',
@@ -55,6 +65,10 @@ __all__ = [
     
     # Genetic Algorithm
     'AlgorismeGenetic',
+    'RecuitSimulat',
+    'CercaTabu',
+    'AssignacioPerDies',
+    'CriterisAturada',
     
     # Constraints Manager
     'RestriccionManager',
@@ -0,0 +1,347 @@
+# batch_evaluation.py - AVALUACIÓ PER LOTS DE CROMOSOMES AMB NUMPY (OPCIONAL)
+
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy és opcional: sense, l'avaluació és la de RestriccionManager
+    np = None
+
+from core import constraints
+from core.incremental_evaluation import AvaluadorIncremental
+
+DESCANS_MINIM = 720  # Minuts de descans entre assignacions (12h)
+MAX_DIES_CONSECUTIUS = 9
+
+
+class AvaluadorLots:
+    """
+    Avaluació d'una població sencera de cromosomes d'enters (matriu individus ×
+    necessitats) amb operacions vectoritzades sobre taules treballador × dia.
+
+    Reprodueix les restriccions predefinides de core/constraints.py amb els pesos
+    del RestriccionManager i retorna, per individu, el mateix {'total', 'detall'}
+    que RestriccionManager.evalua_solucio. Les desviacions de les restriccions
+    d'equitat i distribució se sumen en un altre ordre, de manera que poden
+    diferir en l'última xifra decimal.
+
+    Les dades estàtiques de cada gen (necessitat, treballador) es calculen amb
+    l'AvaluadorIncremental la primera vegada que apareixen en un lot.
+    """
+
+    def __init__(self, ag):
+        if np is None:
+            raise ImportError("L'avaluació per lots necessita NumPy")
+        self.ag = ag
+        self._incremental = AvaluadorIncremental(ag)
+        self._funcions = {
+            constraints.restriccio_grup_T: self._score_grup_t,
+            constraints.restriccio_sense_descans: self._score_sense_descans,
+            constraints.restriccio_formacio_requerida: self._score_formacio,
+            constraints.restriccio_linia_correcta: self._score_linia,
+            constraints.restriccio_hores_anuals: self._score_hores_anuals,
+            constraints.restriccio_unica_assignacio_per_dia_rigida: self._score_unica_per_dia,
+            constraints.restriccio_sense_solapaments_rigida: self._score_sense_solapaments,
+            constraints.restriccio_dies_consecutius: self._score_dies_consecutius,
+            constraints.restriccio_descans_minim_12h_rigida: self._score_descans_12h,
+            constraints.restriccio_divendres_cap_setmana_rigida: self._score_divendres,
+            constraints.restriccio_equitat_canvis_zona: self._score_equitat_zona,
+            constraints.restriccio_equitat_canvis_torn: self._score_equitat_torn,
+            constraints.restriccio_cobertura_completa: self._score_cobertura,
+            constraints.restriccio_distribucio_equilibrada: self._score_distribucio,
+        }
+
+        n = len(ag.necessitats)
+        w = len(ag.ids_treballadors)
+        self.num_necessitats = n
+        self.num_treballadors = w
+        treballadors = [ag.treballadors_grup_t[treb_id] for treb_id in ag.ids_treballadors]
+
+        # Per posició: horari resolt, durada, interval i dia
+        self._resolta = np.array([horari is not None for horari in ag.horaris], dtype=bool)
+        self._durada = np.array([0.0 if h is None else h.durada_hores for h in ag.horaris])
+        self._inici = np.array([0 if iv is None else iv[0] for iv in ag.intervals], dtype=np.int64)
+        self._fi = np.array([0 if iv is None else iv[1] for iv in ag.intervals], dtype=np.int64)
+        self._dia = np.array([nec.data.toordinal() for nec in ag.necessitats], dtype=np.int64)
+
+        # Cobertura: les necessitats es compten per (servei, data)
+        grups = {}
+        self._grup = np.array([grups.setdefault((nec.servei, nec.data), len(grups))
+                               for nec in ag.necessitats], dtype=np.int64)
+        self._mida_grup = np.bincount(self._grup, minlength=len(grups))
+
+        # Per treballador: hores, canvis de l'històric i última assignació
+        self._hores_realitzades = np.array([t.hores_anuals_realitzades for t in treballadors], dtype=float)
+        self._max_hores_anuals = np.array([t.max_hores_anuals for t in treballadors], dtype=float)
+        self._max_hores_ampliables = np.array([t.max_hores_ampliables for t in treballadors], dtype=float)
+        self._canvis_zona_historic = np.array([t.canvis_zona for t in treballadors], dtype=np.int64)
+        self._canvis_torn_historic = np.array([t.canvis_torn for t in treballadors], dtype=np.int64)
+        ultimes = [self._incremental.ultima_historic(idx) for idx in range(w)]
+        intervals_ultima = [self._incremental.interval_ultima_historic(idx) for idx in range(w)]
+        self._te_ultima = np.array([u is not None for u in ultimes], dtype=bool)
+        self._dia_ultima = np.array([u.data.toordinal() if u else 0 for u in ultimes], dtype=np.int64)
+        self._inici_ultima = np.array([iv[0] if iv else 0 for iv in intervals_ultima], dtype=np.int64)
+        self._fi_ultima = np.array([iv[1] if iv else 0 for iv in intervals_ultima], dtype=np.int64)
+        self._prepara_dies_historic()
+
+        # Taules (posició, treballador) de les restriccions per assignació; la
+        # columna `w` és la de les necessitats descobertes
+        self._coneguda = np.zeros((n, w + 1), dtype=bool)
+        self._coneguda[:, w] = True
+        self._indicadors = {
+            nom: np.zeros((n, w + 1), dtype=bool)
+            for nom in ('fora_grup_t', 'descans', 'formacio', 'linia', 'divendres', 'canvi_zona', 'canvi_torn')
+        }
+
+    @staticmethod
+    def suporta(restriccions) -> bool:
+        """NumPy disponible i totes les restriccions del gestor amb equivalent vectoritzat"""
+        return np is not None and AvaluadorIncremental.suporta(restriccions)
+
+    # ============= CONFIGURACIÓ =============
+
+    def _prepara_dies_historic(self) -> None:
+        """
+        Dies consecutius: la finestra [primer, últim dia de les necessitats] es
+        recorre dia a dia. De l'històric se'n guarden els dies de dins la finestra,
+        les ratxes que hi toquen per cada costat i la ratxa més llarga de fora
+        """
+        w = self.num_treballadors
+        self._primer_dia = int(self._dia.min()) if len(self._dia) else 0
+        self._num_dies = int(self._dia.max()) - self._primer_dia + 1 if len(self._dia) else 0
+        ultim_dia = self._primer_dia + self._num_dies - 1
+
+        self._historic_finestra = np.zeros((w, self._num_dies), dtype=bool)
+        self._ratxa_abans = np.zeros(w, dtype=np.int64)
+        self._ratxa_despres = np.zeros(w, dtype=np.int64)
+        self._ratxa_fora = np.zeros(w, dtype=np.int64)
+        if not self.ag.estadistiques:
+            return
+        for idx in range(w):
+            dies = sorted(self._incremental.dies_historic(idx))
+            dins = [d - self._primer_dia for d in dies if self._primer_dia <= d <= ultim_dia]
+            self._historic_finestra[idx, dins] = True
+            for tros, es_abans in (([d for d in dies if d < self._primer_dia], True),
+                                   ([d for d in dies if d > ultim_dia], False)):
+                for inici, longitud in self._ratxes(tros):
+                    if es_abans and inici + longitud == self._primer_dia:
+                        self._ratxa_abans[idx] = longitud
+                    elif not es_abans and inici == ultim_dia + 1:
+                        self._ratxa_despres[idx] = longitud
+                    else:
+                        self._ratxa_fora[idx] = max(self._ratxa_fora[idx], longitud)
+
+    @staticmethod
+    def _ratxes(dies: Sequence[int]):
+        """(primer dia, longitud) de cada ratxa de dies consecutius d'una llista ordenada"""
+        ratxes = []
+        for dia in dies:
+            if ratxes and ratxes[-1][0] + ratxes[-1][1] == dia:
+                ratxes[-1][1] += 1
+            else:
+                ratxes.append([dia, 1])
+        return [tuple(r) for r in ratxes]
+
+    def _completa_taules(self, columnes: 'np.ndarray') -> None:
+        """Omple les taules dels gens (posició, treballador) del lot que encara no s'han vist"""
+        files = np.broadcast_to(np.arange(self.num_necessitats), columnes.shape)
+        pendents = ~self._coneguda[files, columnes]
+        if not pendents.any():
+            return
+        for pos, idx in set(zip(files[pendents].tolist(), columnes[pendents].tolist())):
+            self._coneguda[pos, idx] = True
+            info = self._incremental.info_gen(pos, idx)
+            if info is None:
+                continue
+            for nom, taula in self._indicadors.items():
+                taula[pos, idx] = getattr(info, nom)
+
+    # ============= AVALUACIÓ =============
+
+    def avalua(self, cromosomes) -> List[Dict]:
+        """
+        Avalua una població de cromosomes (matriu individus × necessitats o llista
+        de cromosomes de la mateixa longitud). Retorna, per individu, el resultat
+        en el format de RestriccionManager.evalua_solucio
+        """
+        x = np.asarray(cromosomes, dtype=np.int64).reshape(-1, self.num_necessitats)
+        self._prepara_lot(x)
+        scores = {
+            restriccio['funcio']: self._funcions[restriccio['funcio']]()
+            for restriccio in self.ag.restriccions.restriccions
+        }
+
+        resultats = []
+        for i in range(len(x)):
+            score_total = 0
+            detall_scores = {}
+            for restriccio in self.ag.restriccions.restriccions:
+                score = float(scores[restriccio['funcio']][i])
+                score_ponderat = score * restriccio['pes']
+                score_total += score_ponderat
+                detall_scores[restriccio['nom']] = {
+                    'score': score,
+                    'pes': restriccio['pes'],
+                    'ponderat': score_ponderat
+                }
+            resultats.append({'total': score_total, 'detall': detall_scores})
+        return resultats
+
+    def _prepara_lot(self, x: 'np.ndarray') -> None:
+        """Agregats per individu i per (individu, treballador) que comparteixen les restriccions"""
+        p, w = len(x), self.num_treballadors
+        columnes = np.where(x < 0, w, x)
+        self._completa_taules(columnes)
+        self._p = p
+
+        valid = (x >= 0) & self._resolta
+        ind, pos = np.nonzero(valid)
+        treb = x[ind, pos]
+        clau = ind * w + treb
+        self._ind, self._pos, self._treb = ind, pos, treb
+        self._assignacions = np.bincount(ind, minlength=p)
+
+        def per_individu(nom):
+            return np.bincount(ind, weights=self._indicadors[nom][pos, treb], minlength=p)
+
+        def per_treballador(pesos=None):
+            return np.bincount(clau, weights=pesos, minlength=p * w).reshape(p, w)
+
+        self._violacions = {nom: per_individu(nom)
+                            for nom in ('fora_grup_t', 'descans', 'formacio', 'linia', 'divendres')}
+        self._num = per_treballador()
+        self._actius = self._num > 0
+        self._total_actius = self._actius.sum(axis=1)
+        self._hores = per_treballador(self._durada[pos])
+        self._canvis_zona = per_treballador(self._indicadors['canvi_zona'][pos, treb])
+        self._canvis_torn = per_treballador(self._indicadors['canvi_torn'][pos, treb])
+
+        cobertes = np.zeros((p, len(self._mida_grup)), dtype=bool)
+        cobertes[ind, self._grup[pos]] = True
+        self._cobertes = cobertes @ self._mida_grup
+
+        self._prepara_intervals()
+
+    def _prepara_intervals(self) -> None:
+        """
+        Assignacions de cada (individu, treballador) ordenades per inici, amb
+        l'última de l'històric dels treballadors que en tenen alguna: les
+        consecutives donen el descans de 12h i els solapaments del mateix dia
+        """
+        p, w = self._p, self.num_treballadors
+        amb_ultima = self._actius & self._te_ultima
+        ind_u, treb_u = np.nonzero(amb_ultima)
+        ind = np.concatenate([self._ind, ind_u])
+        treb = np.concatenate([self._treb, treb_u])
+        inici = np.concatenate([self._inici[self._pos], self._inici_ultima[treb_u]])
+        fi = np.concatenate([self._fi[self._pos], self._fi_ultima[treb_u]])
+        dia = np.concatenate([self._dia[self._pos], self._dia_ultima[treb_u]])
+
+        ordre = np.lexsort((inici, treb, ind))
+        ind, treb, inici, fi, dia = ind[ordre], treb[ordre], inici[ordre], fi[ordre], dia[ordre]
+        seguents = (ind[1:] == ind[:-1]) & (treb[1:] == treb[:-1])
+        viola_12h = seguents & (inici[1:] - fi[:-1] < DESCANS_MINIM)
+        solapa = seguents & (dia[1:] == dia[:-1]) & (inici[1:] < fi[:-1])
+        self._viola_12h = np.bincount(ind[1:][viola_12h], minlength=p) > 0
+        self._solapa = np.bincount(ind[1:][solapa], minlength=p) > 0
+
+        # Més d'una assignació el mateix dia, o el dia de l'última de l'històric
+        dia_gen = self._dia[self._pos]
+        clau_dia = (self._ind * w + self._treb) * (self._num_dies + 1) + (dia_gen - self._primer_dia)
+        claus, repeticions = np.unique(clau_dia, return_counts=True)
+        duplicats = claus[repeticions > 1] // (w * (self._num_dies + 1))
+        dia_ultima = self._te_ultima[self._treb] & (self._dia_ultima[self._treb] == dia_gen)
+        self._dia_repetit = (np.bincount(duplicats, minlength=p) > 0) | \
+                            (np.bincount(self._ind[dia_ultima], minlength=p) > 0)
+
+    # ============= SCORES =============
+
+    def _proporcio_correctes(self, violacions: 'np.ndarray') -> 'np.ndarray':
+        total = self._assignacions
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total == 0, 100.0, 100 * (1 - violacions / total))
+
+    def _score_grup_t(self):
+        return self._proporcio_correctes(self._violacions['fora_grup_t'])
+
+    def _score_sense_descans(self):
+        return self._proporcio_correctes(self._violacions['descans'])
+
+    def _score_formacio(self):
+        return self._proporcio_correctes(self._violacions['formacio'])
+
+    def _score_linia(self):
+        return self._proporcio_correctes(self._violacions['linia'])
+
+    def _score_hores_anuals(self):
+        hores_totals = self._hores_realitzades + self._hores
+        violacions = self._actius & (hores_totals > self._max_hores_ampliables)
+        dins_estandard = self._actius & ~violacions & (hores_totals <= self._max_hores_anuals)
+        total = self._total_actius
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.minimum(100, 100 * (1 - violacions.sum(axis=1) / total)
+                               + (dins_estandard.sum(axis=1) / total) * 10)
+        return np.where(total == 0, 100.0, score)
+
+    def _score_unica_per_dia(self):
+        return np.where(self._dia_repetit, 0.0, 100.0)
+
+    def _score_sense_solapaments(self):
+        return np.where(self._solapa, 0.0, 100.0)
+
+    def _score_descans_12h(self):
+        return np.where(self._viola_12h, 0.0, 100.0)
+
+    def _score_divendres(self):
+        return np.where(self._violacions['divendres'] > 0, 0.0, 100.0)
+
+    def _score_dies_consecutius(self):
+        """Ratxa més llarga de dies treballats (històric inclòs) recorrent la finestra dia a dia"""
+        p, w = self._p, self.num_treballadors
+        treballats = np.zeros((p, w, self._num_dies), dtype=bool)
+        treballats[self._ind, self._treb, self._dia[self._pos] - self._primer_dia] = True
+        treballats |= self._historic_finestra
+
+        ratxa = np.broadcast_to(self._ratxa_abans, (p, w)).copy()
+        maxim = np.maximum(self._ratxa_fora, self._ratxa_abans) + np.zeros((p, w), dtype=np.int64)
+        for d in range(self._num_dies):
+            ratxa = np.where(treballats[:, :, d], ratxa + 1, 0)
+            np.maximum(maxim, ratxa, out=maxim)
+        np.maximum(maxim, np.where(ratxa > 0, ratxa + self._ratxa_despres, self._ratxa_despres), out=maxim)
+        np.maximum(maxim, 1, out=maxim)
+
+        exces = np.where(self._actius, np.maximum(0, maxim - MAX_DIES_CONSECUTIUS), 0).sum(axis=1)
+        total = self._total_actius
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.maximum(0, 100 - (exces / (total * 5) * 100))
+        return np.where(total == 0, 100.0, score)
+
+    @staticmethod
+    def _score_equitat(canvis: 'np.ndarray', historic: 'np.ndarray'):
+        amb_canvis = canvis > 0
+        n = amb_canvis.sum(axis=1)
+        valors = np.where(amb_canvis, canvis + historic, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mitjana = valors.sum(axis=1) / n
+            variancia = np.where(amb_canvis, (valors - mitjana[:, None]) ** 2, 0).sum(axis=1) / n
+            score = np.maximum(0, 100 - (variancia ** 0.5 / 3 * 100))
+        return np.where(n == 0, 100.0, score)
+
+    def _score_equitat_zona(self):
+        return self._score_equitat(self._canvis_zona, self._canvis_zona_historic)
+
+    def _score_equitat_torn(self):
+        return self._score_equitat(self._canvis_torn, self._canvis_torn_historic)
+
+    def _score_cobertura(self):
+        if self.num_necessitats == 0:
+            return np.full(self._p, 100.0)
+        return 100 * (self._cobertes / self.num_necessitats)
+
+    def _score_distribucio(self):
+        n = self._total_actius
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mitjana = self._num.sum(axis=1) / n
+            desviacio = np.where(self._actius, np.abs(self._num - mitjana[:, None]), 0).sum(axis=1) / n
+            score = np.maximum(0, 100 - (desviacio * 10))
+        return np.where(n == 0, 100.0, score)
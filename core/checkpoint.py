@@ -0,0 +1,51 @@
+# checkpoint.py - PUNTS DE CONTROL DE L'ALGORISME GENÈTIC
+
+import gzip
+import hashlib
+import os
+import pickle
+from typing import Dict, Optional
+
+# Versió del format: els checkpoints d'una altra versió s'ignoren
+VERSIO_CHECKPOINT = 1
+
+
+def desa_checkpoint(fitxer: str, estat: Dict) -> None:
+    """
+    Desa l'estat d'una execució (pickle comprimit amb gzip).
+    S'escriu a un fitxer temporal i es reanomena, de manera que una caiguda
+    a mig escriure no fa malbé el checkpoint anterior. El directori es crea
+    en desar el primer checkpoint
+    """
+    directori = os.path.dirname(fitxer)
+    if directori:
+        os.makedirs(directori, exist_ok=True)
+    temporal = f"{fitxer}.tmp"
+    with gzip.open(temporal, 'wb', compresslevel=6) as f:
+        pickle.dump({'versio': VERSIO_CHECKPOINT, **estat}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, fitxer)
+
+
+def carrega_checkpoint(fitxer: str) -> Optional[Dict]:
+    """Carrega un checkpoint. Retorna None si no existeix, és il·legible o d'una altra versió"""
+    if not os.path.exists(fitxer):
+        return None
+    try:
+        with gzip.open(fitxer, 'rb') as f:
+            estat = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        print(f"   ⚠️ Checkpoint il·legible ({fitxer}): {e}")
+        return None
+    if estat.get('versio') != VERSIO_CHECKPOINT:
+        return None
+    return estat
+
+
+def elimina_checkpoint(fitxer: str) -> None:
+    if os.path.exists(fitxer):
+        os.remove(fitxer)
+
+
+def empremta(*parts) -> str:
+    """Empremta (hex) d'una instància del problema, per no reprendre un checkpoint d'una altra"""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
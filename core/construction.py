@@ -0,0 +1,84 @@
+# construction.py - ORDRE DE RECORREGUT DE LA CONSTRUCCIÓ INICIAL
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Sequence
+
+
+class OrdreCarrega:
+    """Recorre les necessitats en l'ordre de càrrega"""
+
+    def __init__(self, posicions: Iterable[int]):
+        self._posicions = iter(posicions)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        return next(self._posicions)
+
+    def assignada(self, pos: int, idx: int) -> None:
+        pass
+
+
+class OrdreMesRestringides:
+    """
+    Recorre primer les necessitats amb menys candidats disponibles (a igualtat,
+    la de data més antiga). Quan el cridant assigna un treballador amb
+    `assignada`, es torna a comprovar aquest treballador a les necessitats
+    veïnes on era disponible, de manera que l'ordre reflecteix els treballadors
+    ja consumits. La disponibilitat només pot disminuir a mesura que s'assigna.
+    """
+
+    def __init__(self, posicions: Sequence[int],
+                 candidats: Sequence[Sequence[int]],
+                 dates: Dict[int, int],
+                 disponible: Callable[[int, int], bool],
+                 veines: Callable[[int, int], Iterable[int]]):
+        """
+        Args:
+            posicions: Necessitats a recórrer
+            candidats: Per posició, treballadors elegibles
+            dates: Data (ordinal) de cada posició, per desempatar
+            disponible: (pos, idx) -> si el treballador encara pot cobrir la necessitat
+            veines: (pos, idx) -> necessitats afectades si `idx` cobreix `pos`
+        """
+        self._disponible = disponible
+        self._veines = veines
+        self._dates = dates
+        self._pendents = set(posicions)
+        self._disponibles = {
+            pos: {idx for idx in candidats[pos] if disponible(pos, idx)} for pos in posicions
+        }
+        self._cua = [(len(self._disponibles[pos]), dates[pos], pos) for pos in posicions]
+        heapq.heapify(self._cua)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        while self._cua:
+            compte, _, pos = heapq.heappop(self._cua)
+            # Les entrades amb un compte antic es descarten (n'hi ha una de més nova)
+            if pos in self._pendents and compte == len(self._disponibles[pos]):
+                self._pendents.discard(pos)
+                return pos
+        raise StopIteration
+
+    def assignada(self, pos: int, idx: int) -> None:
+        for altra in self._veines(pos, idx):
+            disponibles = self._disponibles.get(altra)
+            if altra not in self._pendents or idx not in disponibles:
+                continue
+            if not self._disponible(altra, idx):
+                disponibles.discard(idx)
+                heapq.heappush(self._cua, (len(disponibles), self._dates[altra], altra))
+
+
+def index_per_treballador_dia(posicions: Iterable[int], candidats: Sequence[Sequence[int]],
+                              dates: Dict[int, int]) -> Dict[tuple, List[int]]:
+    """(treballador, data ordinal) -> posicions on el treballador és candidat"""
+    index = {}
+    for pos in posicions:
+        for idx in candidats[pos]:
+            index.setdefault((idx, dates[pos]), []).append(pos)
+    return index
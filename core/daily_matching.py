@@ -0,0 +1,211 @@
+# daily_matching.py - ASSIGNACIÓ EXACTA PER DIES (APARELLAMENT DE COST MÍNIM)
+
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.data_structures import Assignacio
+from core.single_solution import MotorSolucioUnica
+from core.stopping import MOTIU_CANCEL_LACIO
+
+# Costos de l'aparellament (més baix = millor)
+COST_DESCOBERTA = 1000.0  # Deixar una necessitat sense cobrir
+COST_CANVI_ZONA = 10.0
+COST_CANVI_TORN = 10.0
+COST_HORES_AMPLIADES = 20.0  # Passar de les hores anuals estàndard
+COST_HORES_EXCEDIDES = 200.0  # Passar de les hores ampliables
+COST_DIES_CONSECUTIUS = 50.0  # Superar 9 dies seguits
+COST_PER_ASSIGNACIO = 1.0  # Reparteix la feina entre treballadors
+MAX_DIES_CONSECUTIUS = 9
+
+INFINIT = float('inf')
+
+
+def aparellament_cost_minim(costos: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Algorisme hongarès (potencials, O(n²·m)) per a una matriu n x m amb n <= m.
+    Retorna, per cada fila, la columna assignada minimitzant la suma de costos.
+    Les caselles amb cost infinit no s'assignen mai si hi ha alternativa finita
+    """
+    n = len(costos)
+    if n == 0:
+        return []
+    m = len(costos[0])
+    if n > m:
+        raise ValueError("L'aparellament necessita almenys tantes columnes com files")
+
+    # Índexs 1..n / 1..m; la columna 0 és fictícia
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    fila_de = [0] * (m + 1)
+    cami = [0] * (m + 1)
+
+    for fila in range(1, n + 1):
+        fila_de[0] = fila
+        columna = 0
+        minims = [INFINIT] * (m + 1)
+        usades = [False] * (m + 1)
+        while True:
+            usades[columna] = True
+            actual = fila_de[columna]
+            delta = INFINIT
+            seguent = 0
+            for j in range(1, m + 1):
+                if usades[j]:
+                    continue
+                reduit = costos[actual - 1][j - 1] - u[actual] - v[j]
+                if reduit < minims[j]:
+                    minims[j] = reduit
+                    cami[j] = columna
+                if minims[j] < delta:
+                    delta = minims[j]
+                    seguent = j
+            for j in range(m + 1):
+                if usades[j]:
+                    u[fila_de[j]] += delta
+                    v[j] -= delta
+                else:
+                    minims[j] -= delta
+            columna = seguent
+            if fila_de[columna] == 0:
+                break
+        while columna:
+            anterior = cami[columna]
+            fila_de[columna] = fila_de[anterior]
+            columna = anterior
+
+    assignacio = [0] * n
+    for j in range(1, m + 1):
+        if fila_de[j]:
+            assignacio[fila_de[j] - 1] = j - 1
+    return assignacio
+
+
+class AssignacioPerDies(MotorSolucioUnica):
+    """
+    Solució determinista: cada dia es resol com un aparellament de cost mínim
+    entre necessitats i treballadors elegibles (canvis de zona/torn, hores per
+    sobre del límit estàndard, dies consecutius i repartiment de la feina).
+
+    Els dies es resolen en ordre i l'estat es porta d'un dia al següent
+    (descans de 12h amb la línia temporal, hores i dies treballats), de manera
+    que les regles entre dies es respecten sense resoldre el període sencer.
+    Dona en mil·lisegons un pla de referència reproduïble i una cota superior
+    de la cobertura.
+    """
+
+    def executa(self, verbose: bool = True,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                cancel_lacio=None) -> Tuple[List[Assignacio], Dict]:
+        """
+        Resol el període dia a dia.
+
+        Args:
+            progress_callback: Es crida amb (dies resolts, dies totals) després de cada dia
+            cancel_lacio: Com a AlgorismeGenetic.executa; es comprova entre dies i es
+                retorna el pla dels dies ja resolts
+        """
+        inici = time.time()
+        model = self.model
+        cromosoma = array('i', [-1]) * len(model.necessitats)
+        linia = model.nova_linia_temporal()
+
+        num_treballadors = len(model.ids_treballadors)
+        treballadors = [model.treballadors_grup_t[tid] for tid in model.ids_treballadors]
+        hores = [t.hores_anuals_realitzades for t in treballadors]
+        assignacions_fetes = [0] * num_treballadors
+        dies_treballats = [set(self.avaluador.dies_historic(idx)) for idx in range(num_treballadors)]
+
+        per_dia = {}
+        for pos in self.posicions:
+            per_dia.setdefault(model.necessitats[pos].data, []).append(pos)
+
+        cota_cobertura = 0
+        cancel_lada = False
+        dies = sorted(per_dia)
+        for num, data in enumerate(dies, 1):
+            if cancel_lacio is not None and cancel_lacio.is_set():
+                cancel_lada = True
+                break
+            posicions = per_dia[data]
+            dia = data.toordinal()
+
+            # Cota superior: aparellament màxim només amb l'elegibilitat estàtica
+            cota_cobertura += self._cobertura_maxima(posicions, num_treballadors)
+
+            costos = []
+            for pos in posicions:
+                fila = [INFINIT] * num_treballadors + [COST_DESCOBERTA] * len(posicions)
+                for idx in model.elegibles[pos]:
+                    fila[idx] = self._cost(pos, idx, dia, linia, hores, assignacions_fetes,
+                                           dies_treballats)
+                costos.append(fila)
+
+            for pos, fila, idx in zip(posicions, costos, aparellament_cost_minim(costos)):
+                if idx >= num_treballadors or fila[idx] == INFINIT:
+                    continue
+                cromosoma[pos] = idx
+                linia.afegeix(idx, *model.intervals[pos])
+                hores[idx] += self.avaluador.info_gen(pos, idx).assignacio.durada_hores
+                assignacions_fetes[idx] += 1
+                dies_treballats[idx].add(dia)
+
+            if progress_callback:
+                progress_callback(num, len(dies))
+
+        cobertes = sum(1 for idx in cromosoma if idx >= 0)
+        self.resum_execucio = {
+            'temps_execucio': time.time() - inici,
+            'cota_cobertura': cota_cobertura,
+            'necessitats_cobertes': cobertes
+        }
+        if cancel_lada:
+            self.resum_execucio['motiu_aturada'] = MOTIU_CANCEL_LACIO
+
+        assignacions, resultat = self.resultat(cromosoma)
+        if verbose:
+            print("\n   ✓ Assignació per dies finalitzada!")
+            print(f"   → Necessitats cobertes: {cobertes}/{len(self.necessitats)} "
+                  f"(cota superior: {cota_cobertura})")
+            print(f"   → Score: {resultat['total']:.2f} ({self.resum_execucio['temps_execucio'] * 1000:.0f} ms)")
+        return assignacions, resultat
+
+    def _cost(self, pos: int, idx: int, dia: int, linia, hores: List[float],
+              assignacions_fetes: List[int], dies_treballats: List[set]) -> float:
+        """Cost d'assignar la necessitat `pos` al treballador `idx` (infinit si no és possible)"""
+        info = self.avaluador.info_gen(pos, idx)
+        if info is None or info.divendres or not self.model.compleix_descans_12h(linia, idx, pos):
+            return INFINIT
+        ultima = self.avaluador.ultima_historic(idx)
+        if ultima is not None and ultima.data.toordinal() == dia:
+            return INFINIT
+
+        treb = self.model.treballadors_grup_t[self.model.ids_treballadors[idx]]
+        cost = COST_PER_ASSIGNACIO * assignacions_fetes[idx]
+        cost += COST_CANVI_ZONA * info.canvi_zona + COST_CANVI_TORN * info.canvi_torn
+
+        hores_totals = hores[idx] + info.assignacio.durada_hores
+        if hores_totals > treb.max_hores_ampliables:
+            cost += COST_HORES_EXCEDIDES
+        elif hores_totals > treb.max_hores_anuals:
+            cost += COST_HORES_AMPLIADES
+
+        seguits = 1
+        while dia - seguits in dies_treballats[idx]:
+            seguits += 1
+        if seguits > MAX_DIES_CONSECUTIUS:
+            cost += COST_DIES_CONSECUTIUS
+        return cost
+
+    def _cobertura_maxima(self, posicions: List[int], num_treballadors: int) -> int:
+        """Necessitats del dia que es podrien cobrir alhora amb l'elegibilitat estàtica"""
+        costos = []
+        for pos in posicions:
+            fila = [1.0] * num_treballadors + [2.0] * len(posicions)
+            for idx in self.model.elegibles[pos]:
+                fila[idx] = 0.0
+            costos.append(fila)
+        return sum(
+            1 for pos, columna in zip(posicions, aparellament_cost_minim(costos))
+            if columna < num_treballadors and (self.model.elegibles_bits[pos] >> columna) & 1
+        )
@@ -7,7 +7,7 @@ from typing import List, Dict, Tuple, Set, Optional
 from datetime import time, date, datetime
 from core.data_structures import (
     Torn, ServeiTorn, DiaCalendari, Treballador,
-    NecessitatCobertura, HistoricTreballador, EstadistiquesGlobals
+    NecessitatCobertura, HorariNecessitat, HistoricTreballador, EstadistiquesGlobals
 )
 
 
@@ -198,6 +198,63 @@ class DataLoader:
         
         raise ValueError(f"Codi servei {codi_dia} no trobat al torn {torn.id}")
     
+    @staticmethod
+    def index_serveis_per_codi(torns: Dict[str, Torn]) -> Dict[str, Dict[str, ServeiTorn]]:
+        """
+        Precalcula, per cada torn, el ServeiTorn que correspon a cada codi de calendari.
+        Si un codi apareix a més d'un servei, guanya el primer (igual que troba_servei_per_data)
+        """
+        index = {}
+        for torn_id, torn in torns.items():
+            per_codi = {}
+            for servei in torn.serveis.values():
+                for codi in servei.codis_servei:
+                    per_codi.setdefault(codi, servei)
+            index[torn_id] = per_codi
+        return index
+    
+    @staticmethod
+    def resol_horaris(necessitats: List[NecessitatCobertura],
+                      torns: Dict[str, Torn],
+                      calendari: Dict[date, DiaCalendari]
+                      ) -> Tuple[List[Optional[HorariNecessitat]], Dict[int, str]]:
+        """
+        Resol un sol cop l'horari de cada necessitat (mateixa lògica que troba_servei_per_data)
+        
+        Returns:
+            Tupla (horaris, no_resoltes): horaris[i] és l'HorariNecessitat de necessitats[i]
+            o None si no es pot resoldre; no_resoltes mapeja posició -> motiu
+        """
+        serveis_per_codi = DataLoader.index_serveis_per_codi(torns)
+        horaris = []
+        no_resoltes = {}
+        
+        for pos, nec in enumerate(necessitats):
+            servei = None
+            if nec.servei not in torns:
+                no_resoltes[pos] = f"Torn {nec.servei} no trobat"
+            elif nec.data not in calendari:
+                no_resoltes[pos] = f"Data {nec.data} no trobada al calendari"
+            else:
+                codi_dia = calendari[nec.data].servei_bv
+                servei = serveis_per_codi[nec.servei].get(codi_dia)
+                if servei is None:
+                    no_resoltes[pos] = f"Codi servei {codi_dia} no trobat al torn {nec.servei}"
+            
+            if servei is None:
+                horaris.append(None)
+                continue
+            
+            horaris.append(HorariNecessitat(
+                servei=servei,
+                hora_inici=servei.hora_inici,
+                hora_fi=servei.hora_fi,
+                durada_hores=servei.durada_hores(),
+                creua_mitjanit=servei.creua_mitjanit
+            ))
+        
+        return horaris, no_resoltes
+    
     def carrega_descansos_dies(self) -> Dict[str, Set[date]]:
         """
         Carrega els descansos dels treballadors des de la taula descansos_dies
@@ -506,6 +563,38 @@ class DataLoader:
             return False
 
 
+    def carrega_assignacions_grup_T(self) -> List[Tuple[str, date, str]]:
+        """
+        Carrega el pla actual de la taula assig_grup_T com a (treballador_id, data, servei)
+        """
+        if self.cursor is None or self.conn is None:
+            if not self.connect():
+                raise RuntimeError("No s'ha pogut connectar a la base de dades")
+        
+        pla = []
+        try:
+            self.cursor.execute('SELECT * FROM assig_grup_T')
+            columns = [description[0] for description in self.cursor.description]
+            
+            for row in self.cursor.fetchall():
+                row_dict = dict(zip(columns, row))
+                # El codi del servei pot estar a 'servei' o a 'torn_id'
+                servei = row_dict.get('servei') or row_dict.get('torn_id')
+                if not row_dict.get('treballador_id') or not servei or not row_dict.get('data'):
+                    continue
+                try:
+                    data = self.parse_date_flexible(row_dict['data'])
+                except ValueError:
+                    continue
+                pla.append((row_dict['treballador_id'], data, servei))
+            
+            print(f" ✓ Pla previ carregat: {len(pla)} assignacions")
+        
+        except sqlite3.Error as e:
+            print(f" ⚠️ Error carregant assig_grup_T: {e}")
+        
+        return pla
+    
     def compta_registres_assig_grup_T(self) -> int:
         """
         Compta el nombre de registres actuals a assig_grup_T
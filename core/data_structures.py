@@ -225,6 +225,16 @@ class NecessitatCobertura:
         return self.servei == other.servei and self.data == other.data
 
 
+@dataclass
+class HorariNecessitat:
+    """Horari resolt d'una necessitat: el ServeiTorn que li aplica segons el calendari"""
+    servei: ServeiTorn
+    hora_inici: time
+    hora_fi: time
+    durada_hores: float
+    creua_mitjanit: bool
+
+
 @dataclass
 class HistoricTreballador:
     """Històric d'assignacions d'un treballador"""
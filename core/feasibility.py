@@ -0,0 +1,149 @@
+# feasibility.py - PRESOLUCIÓ: NECESSITATS IMPOSSIBLES I ASSIGNACIONS FORÇADES
+
+import contextlib
+import io
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Tuple
+
+from core.data_structures import NecessitatCobertura, Treballador, Torn, EstadistiquesGlobals
+from core.constraints import RestriccionManager
+from core.genetic_algorithm import AlgorismeGenetic
+from core.incremental_evaluation import viola_divendres
+
+DESCANS_MINIM = 720  # Minuts de descans entre assignacions (12h)
+
+
+@dataclass
+class InformeViabilitat:
+    """Resultat de la presolució"""
+    impossibles: List[Tuple[NecessitatCobertura, str]] = field(default_factory=list)  # (necessitat, motiu)
+    forcades: List[Tuple[NecessitatCobertura, str]] = field(default_factory=list)  # (necessitat, treballador_id)
+
+    def necessitats_viables(self, necessitats: List[NecessitatCobertura]) -> List[NecessitatCobertura]:
+        """Necessitats sense les impossibles (incloses les seves còpies amb el mateix servei i data)"""
+        claus = {(nec.servei, nec.data) for nec, _ in self.impossibles}
+        return [nec for nec in necessitats if (nec.servei, nec.data) not in claus]
+
+    def assignacions_forcades(self) -> Dict[Tuple[str, date], str]:
+        """(servei, data) -> treballador_id de les necessitats amb un sol candidat"""
+        return {(nec.servei, nec.data): treb_id for nec, treb_id in self.forcades}
+
+    def resum(self) -> Dict:
+        return {
+            'necessitats_impossibles': len(self.impossibles),
+            'assignacions_forcades': len(self.forcades)
+        }
+
+    def mostra(self) -> None:
+        print(f"   Presolució: {len(self.impossibles)} necessitats impossibles, "
+              f"{len(self.forcades)} assignacions forçades")
+        for nec, motiu in self.impossibles:
+            print(f"   ⚠️ {nec.servei} {nec.data}: {motiu}")
+
+
+def analitza_viabilitat(treballadors: Dict[str, Treballador],
+                        torns: Dict[str, Torn],
+                        necessitats: List[NecessitatCobertura],
+                        calendari: Dict,
+                        estadistiques: EstadistiquesGlobals,
+                        exclude_map: Dict = None) -> InformeViabilitat:
+    """
+    Comprova cada necessitat contra els filtres rígids abans d'executar cap motor:
+    horari resoluble, treballadors del grup T de la línia i amb la formació, sense
+    descans ni exclusió, i compatibles amb l'històric (descans de 12h, mateix dia
+    que l'última assignació i regla del divendres).
+
+    Després propaga les assignacions forçades (un sol candidat): el treballador
+    forçat deixa de ser candidat de les necessitats del mateix dia o a menys de
+    12h, cosa que pot forçar-ne o fer-ne impossibles d'altres.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = AlgorismeGenetic(
+            treballadors=treballadors, torns=torns, necessitats=necessitats,
+            calendari=calendari, restriccions=RestriccionManager(), estadistiques=estadistiques,
+            mida_poblacio=1, exclude_map=exclude_map, mida_cache=0
+        )
+    linia_historic = model.nova_linia_temporal()
+
+    informe = InformeViabilitat()
+    candidats = {}  # posició -> set d'índexs de treballador
+    for pos in model.posicions_actives:
+        nec = necessitats[pos]
+        motiu = model.necessitats_no_resoltes.get(pos) or _motiu_filtres(model, nec)
+        if motiu is None:
+            candidats[pos] = {
+                idx for idx in model.elegibles[pos]
+                if _compatible_historic(model, linia_historic, pos, idx)
+            }
+            if not candidats[pos]:
+                motiu = ("Tots els candidats incompleixen el descans de 12h, el divendres "
+                         "o ja tenen una assignació aquest dia (històric)")
+        if motiu is not None:
+            candidats.pop(pos, None)
+            informe.impossibles.append((nec, motiu))
+
+    # Propagació de les assignacions forçades fins a un punt fix
+    forcades = {}
+    pendents = [pos for pos, cands in candidats.items() if len(cands) == 1]
+    while pendents:
+        pos = pendents.pop()
+        if pos in forcades or len(candidats.get(pos, ())) != 1:
+            continue
+        idx = next(iter(candidats[pos]))
+        forcades[pos] = idx
+        for altra, cands in list(candidats.items()):
+            if altra == pos or altra in forcades or idx not in cands:
+                continue
+            if not _en_conflicte(model, pos, altra):
+                continue
+            cands.discard(idx)
+            if not cands:
+                del candidats[altra]
+                informe.impossibles.append((
+                    necessitats[altra],
+                    f"Conflicte amb l'assignació forçada de {model.ids_treballadors[idx]} "
+                    f"a {necessitats[pos].servei} {necessitats[pos].data}"
+                ))
+            elif len(cands) == 1:
+                pendents.append(altra)
+
+    informe.forcades = [
+        (necessitats[pos], model.ids_treballadors[idx])
+        for pos, idx in sorted(forcades.items()) if pos in candidats
+    ]
+    return informe
+
+
+def _motiu_filtres(model: AlgorismeGenetic, nec: NecessitatCobertura):
+    """Primer filtre estàtic que deixa la necessitat sense candidats (None si en queden)"""
+    candidats = [t for t in model.treballadors_grup_t.values() if t.linia == nec.linia]
+    if not candidats:
+        return f"Cap treballador del grup T a la línia {nec.linia}"
+    candidats = [t for t in candidats if nec.formacio in t.habilitacions]
+    if not candidats:
+        return f"Cap treballador de la línia {nec.linia} amb la formació {nec.formacio}"
+    exclosos = model.exclude_map.get(nec.data, ())
+    if all(t.te_descans(nec.data) or t.id in exclosos for t in candidats):
+        return "Tots els candidats tenen descans o estan exclosos aquest dia"
+    return None
+
+
+def _compatible_historic(model: AlgorismeGenetic, linia_historic, pos: int, idx: int) -> bool:
+    if not linia_historic.compleix_descans(idx, *model.intervals[pos]):
+        return False
+    treb_id = model.ids_treballadors[idx]
+    historic = model.estadistiques.historials.get(treb_id)
+    ultima = historic.ultima_assignacio if historic else None
+    if ultima is not None and ultima.data == model.necessitats[pos].data:
+        return False
+    return not viola_divendres(model.assignacio(pos, idx), model.treballadors_grup_t[treb_id])
+
+
+def _en_conflicte(model: AlgorismeGenetic, pos: int, altra: int) -> bool:
+    """Dues necessitats no les pot cobrir el mateix treballador (mateix dia o menys de 12h)"""
+    if model.necessitats[pos].data == model.necessitats[altra].data:
+        return True
+    inici1, fi1 = model.intervals[pos]
+    inici2, fi2 = model.intervals[altra]
+    return inici2 - fi1 < DESCANS_MINIM and inici1 - fi2 < DESCANS_MINIM
@@ -1,14 +1,35 @@
 # genetic_algorithm.py - CORREGIT AMB REPARACIÓ INTEL·LIGENT
 
+import contextlib
+import hashlib
+import io
+import math
+import multiprocessing
+import os
 import random
-from typing import List, Dict, Tuple
-from datetime import datetime
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from datetime import date
+from typing import Callable, Iterable, List, Dict, Tuple, Optional, Union
 from core.data_structures import (
     Assignacio, Treballador, Torn, NecessitatCobertura, 
-    DiaCalendari, ServeiTorn, EstadistiquesGlobals
+    DiaCalendari, ServeiTorn, HorariNecessitat, EstadistiquesGlobals
 )
 from core.constraints import RestriccionManager
 from core.data_loader import DataLoader
+from core.timeline import LiniaTemporal, minuts_des_de_epoca, interval_assignacio
+from core.stopping import CriterisAturada
+from core.checkpoint import desa_checkpoint, carrega_checkpoint, empremta
+from core.incremental_evaluation import AvaluadorIncremental
+from core.batch_evaluation import AvaluadorLots
+from core.construction import OrdreCarrega, OrdreMesRestringides, index_per_treballador_dia
+from core.telemetry import EsdevenimentGeneracio, Telemetria, TempsFases
+from core.population import Poblacio
+
+# Un individu és un cromosoma d'enters (array 'i'): posició = necessitat, valor = treballador
+Individu = array
 
 class AlgorismeGenetic:
     def __init__(self, 
@@ -19,7 +40,35 @@ class AlgorismeGenetic:
                  restriccions: RestriccionManager,
                  estadistiques: EstadistiquesGlobals,
                  mida_poblacio: int = 50,
-                 exclude_map: Dict = None):
+                 exclude_map: Dict = None,
+                 mida_cache: int = 10000,
+                 cerca_local: int = 0,
+                 moviments_cerca_local: int = 100,
+                 assignacions_forcades: Dict[Tuple[str, date], str] = None,
+                 construccio: str = 'ordre',
+                 llavor: Optional[int] = None,
+                 avaluacio_lots: bool = False,
+                 classes_equivalencia: bool = False):
+        if construccio not in ('ordre', 'restringides'):
+            raise ValueError(f"Construcció desconeguda: {construccio}")
+
+        # Paràmetres de construcció: es reenvien un sol cop als processos treballadors
+        self._parametres = dict(
+            treballadors=treballadors, torns=torns, necessitats=necessitats,
+            calendari=calendari, restriccions=restriccions, estadistiques=estadistiques,
+            mida_poblacio=mida_poblacio, exclude_map=exclude_map,
+            mida_cache=mida_cache, cerca_local=cerca_local,
+            moviments_cerca_local=moviments_cerca_local, assignacions_forcades=assignacions_forcades,
+            construccio=construccio, llavor=llavor, avaluacio_lots=avaluacio_lots,
+            classes_equivalencia=classes_equivalencia
+        )
+        self._num_processos = 1
+
+        # Flux aleatori propi (no el mòdul global `random`): amb la mateixa `llavor`,
+        # la mateixa instància dona el mateix pla sigui quin sigui el nombre de processos
+        self.llavor = llavor
+        self.rng = random.Random(llavor)
+
         self.treballadors = treballadors
         self.torns = torns
         self.necessitats = necessitats
@@ -28,6 +77,10 @@ class AlgorismeGenetic:
         self.estadistiques = estadistiques
         self.mida_poblacio = mida_poblacio
 
+        # construccio: ordre de la construcció inicial, 'ordre' (de càrrega) o
+        # 'restringides' (primer les necessitats amb menys candidats)
+        self.construccio = construccio
+
         # exclude_map: opcional, map de date -> set(treballador_id) per excloure
         self.exclude_map = exclude_map or {}
 
@@ -44,581 +97,1239 @@ class AlgorismeGenetic:
             if nec.data not in self.necessitats_per_data:
                 self.necessitats_per_data[nec.data] = []
             self.necessitats_per_data[nec.data].append(nec)
+
+        # Índexs per al cromosoma d'enters: posició = índex a self.necessitats,
+        # valor = índex del treballador a self.ids_treballadors (-1 = descoberta)
+        self.ids_treballadors = list(self.treballadors_grup_t.keys())
+        self.index_treballador = {tid: i for i, tid in enumerate(self.ids_treballadors)}
+
+        # Índex persistent (servei, data) -> posició de la necessitat
+        self.posicio_necessitat = {}
+        for pos, nec in enumerate(necessitats):
+            self.posicio_necessitat.setdefault((nec.servei, nec.data), pos)
+
+        # Necessitats duplicades (mateix servei i data) només es cobreixen un cop
+        self.posicions_actives = [
+            pos for pos, nec in enumerate(necessitats)
+            if self.posicio_necessitat[(nec.servei, nec.data)] == pos
+        ]
+
+        # Elegibilitat estàtica per necessitat (grup T, descans, línia, formació i exclude_map).
+        # Es calcula un sol cop i la comparteixen construcció, mutació i reparació
+        self.elegibles, self.elegibles_bits = self._calcula_elegibilitat()
+
+        # Assignacions forçades per la presolució ((servei, data) -> treballador_id):
+        # el treballador passa a ser l'únic elegible de la necessitat
+        for (servei, data), treb_id in (assignacions_forcades or {}).items():
+            pos = self.posicio_necessitat.get((servei, data))
+            idx = self.index_treballador.get(treb_id)
+            if pos is not None and idx is not None and (self.elegibles_bits[pos] >> idx) & 1:
+                self.elegibles[pos] = (idx,)
+                self.elegibles_bits[pos] = 1 << idx
+
+        # Horari resolt de cada necessitat (None si el torn o el codi de calendari no existeixen)
+        self.horaris, self.necessitats_no_resoltes = DataLoader.resol_horaris(
+            necessitats, torns, calendari
+        )
+        if self.necessitats_no_resoltes:
+            print(f"   ⚠️ Necessitats sense horari resoluble: {len(self.necessitats_no_resoltes)}")
+
+        # Interval ocupat per cada necessitat (minuts des de l'època) i intervals de l'històric
+        # per treballador, base de les línies temporals del descans de 12h
+        self.intervals = [
+            None if horari is None else self._interval_necessitat(nec, horari)
+            for nec, horari in zip(necessitats, self.horaris)
+        ]
+        self._intervals_historic = self._calcula_intervals_historic()
+
+        # Classes de treballadors intercanviables (mateixa línia, habilitacions, zona, torn
+        # i descansos a la finestra): els individus s'avaluen i es descodifiquen en la forma
+        # canònica en què els paquets de necessitats de cada classe es reparteixen
+        # equitativament, de manera que les solucions simètriques comparteixen fitness i cache
+        self.classes_equivalencia = []
+        self._classe = {}  # idx -> posició a classes_equivalencia
+        if classes_equivalencia:
+            self.classes_equivalencia = self._calcula_classes_equivalencia()
+            self._classe = {idx: c for c, classe in enumerate(self.classes_equivalencia) for idx in classe}
+            print(f"   Classes de treballadors equivalents: {len(self.classes_equivalencia)} "
+                  f"({len(self._classe)} treballadors)")
+        self._linia_historic = LiniaTemporal(self._intervals_historic)
+        self._compatibles_historic = {}  # (posició, treballador) -> compatible amb l'històric
+        self._pesos_classe = {}  # (classe, posició) -> (hores, canvis de zona i torn)
+
+        # Assignacions ja construïdes per (posició, treballador): es reutilitzen entre individus
+        self._cache_assignacions = {}
+
+        # Cache LRU de fitness indexada pel digest de l'assignació necessitat -> treballador
+        # (mida_cache = 0 la desactiva). Els comptadors remots acumulen els dels processos
+        self.mida_cache = mida_cache
+        self._cache_fitness = OrderedDict()
+        self.cache_encerts = 0
+        self.cache_errades = 0
+        self._cache_remot = [0, 0]
+
+        # Telemetria: avaluacions completes i temps per fase des de l'última generació
+        # (els processos treballadors retornen els seus amb cada lot)
+        self.avaluacions = 0
+        self._fases = TempsFases()
+
+        # Cancel·lació cooperativa: testimoni de l'execució en curs (threading.Event o, als
+        # processos treballadors, l'Event que el procés principal activa quan es cancel·la)
+        self._cancel_lacio = None
+        self._avis_processos = None
+
+        # Cerca local memètica: a cada generació s'intenten millorar els `cerca_local`
+        # millors individus amb fins a `moviments_cerca_local` moviments avaluats incrementalment
+        self.cerca_local = cerca_local
+        self.moviments_cerca_local = moviments_cerca_local
+        self.millores_cerca_local = 0
+        self._avaluador = None
+        # Necessitats que els moviments poden canviar (també les dels motors de solució única)
+        self.posicions_cerca_local = [
+            pos for pos in self.posicions_actives
+            if self.horaris[pos] is not None and self.elegibles[pos]
+        ]
+        if cerca_local > 0:
+            if AvaluadorIncremental.suporta(restriccions):
+                self._avaluador = AvaluadorIncremental(self)
+            else:
+                print("   ⚠️ Restriccions sense avaluació incremental: cerca local desactivada")
+
+        # Avaluació per lots (NumPy): els fills de cada generació (o de cada lot d'un procés
+        # treballador) s'avaluen junts en lloc d'un a un
+        self._avaluador_lots = None
+        if avaluacio_lots:
+            if AvaluadorLots.suporta(restriccions):
+                self._avaluador_lots = AvaluadorLots(self)
+            else:
+                print("   ⚠️ Avaluació per lots no disponible (cal NumPy i les restriccions "
+                      "predefinides): desactivada")
+
+        # Resum de l'última execució (cache, ...)
+        self.resum_execucio = {}
     
-    def _compleix_descans_12h(self, treb_id: str, data_nova, hora_inici_nova, 
-                              assignacions_actuals: List[Assignacio]) -> bool:
+    def _calcula_elegibilitat(self) -> Tuple[List[Tuple[int, ...]], List[int]]:
         """
-        Verifica que hi hagi 12h de descans des de l'última assignació
+        Aplica els filtres estàtics a cada parella necessitat-treballador.
+        Retorna, per posició de necessitat, la tupla d'índexs de treballadors elegibles
+        i el mateix conjunt com a bitset (bit i = treballador i)
         """
-        # Comprovem amb l'històric
-        historic = self.estadistiques.get_historic(treb_id)
+        elegibles = []
+        elegibles_bits = []
+
+        for nec in self.necessitats:
+            exclosos = self.exclude_map.get(nec.data, ())
+            idxs = []
+            bits = 0
+            for idx, treb_id in enumerate(self.ids_treballadors):
+                treb = self.treballadors_grup_t[treb_id]
+                if treb_id in exclosos:
+                    continue
+                if treb.te_descans(nec.data):
+                    continue
+                if treb.linia != nec.linia:
+                    continue
+                if nec.formacio not in treb.habilitacions:
+                    continue
+                idxs.append(idx)
+                bits |= 1 << idx
+            elegibles.append(tuple(idxs))
+            elegibles_bits.append(bits)
+
+        return elegibles, elegibles_bits
+
+    @staticmethod
+    def _interval_necessitat(nec: NecessitatCobertura, horari: HorariNecessitat) -> Tuple[int, int]:
+        """Interval [inici, fi] d'una necessitat en minuts des de l'època"""
+        inici = minuts_des_de_epoca(nec.data, horari.hora_inici)
+        fi = minuts_des_de_epoca(nec.data, horari.hora_fi)
+        if horari.hora_fi < horari.hora_inici:
+            fi += 1440
+        return inici, fi
+
+    def _calcula_intervals_historic(self) -> Dict[int, Tuple[List[int], List[int]]]:
+        """Intervals de l'històric de cada treballador del grup T, ordenats per inici"""
+        base = {}
+        for idx, treb_id in enumerate(self.ids_treballadors):
+            historic = self.estadistiques.historials.get(treb_id)
+            if not historic or not historic.assignacions_any:
+                continue
+            intervals = sorted(interval_assignacio(a) for a in historic.assignacions_any)
+            base[idx] = ([i for i, _ in intervals], [f for _, f in intervals])
+        return base
+
+    def nova_linia_temporal(self, solucio: List[Assignacio] = None) -> LiniaTemporal:
+        """Línia temporal amb l'històric i, opcionalment, les assignacions d'una solució"""
+        linia = LiniaTemporal(self._intervals_historic)
+        for assign in solucio or ():
+            idx = self.index_treballador.get(assign.treballador_id)
+            if idx is not None:
+                linia.afegeix(idx, *interval_assignacio(assign))
+        return linia
+
+    def compleix_descans_12h(self, linia: LiniaTemporal, idx_treb: int, pos: int) -> bool:
+        """
+        Verifica que cobrir la necessitat `pos` deixi 12h de descans amb l'assignació
+        anterior i la següent del treballador (històric inclòs)
+        """
+        inici, fi = self.intervals[pos]
+        return linia.compleix_descans(idx_treb, inici, fi)
+    
+    def _ordre_construccio(self, posicions: List[int],
+                           disponible: Callable[[int, int], bool]) -> Union[OrdreCarrega, OrdreMesRestringides]:
+        """
+        Ordre en què la construcció inicial recorre les necessitats: el de càrrega o,
+        amb construccio='restringides', primer les que tenen menys candidats disponibles
+        """
+        if self.construccio != 'restringides':
+            return OrdreCarrega(posicions)
         
-        ultimes_assignacions = []
-        if historic and historic.assignacions_any:
-            ultimes_assignacions.extend(historic.assignacions_any[-10:])  # Últimes 10
+        dates = {pos: self.necessitats[pos].data.toordinal() for pos in posicions}
+        index = index_per_treballador_dia(posicions, self.elegibles, dates)
         
-        # Afegim assignacions actuals d'aquest treballador
-        ultimes_assignacions.extend([a for a in assignacions_actuals if a.treballador_id == treb_id])
+        def veines(pos: int, idx: int):
+            # Un torn pot afectar el descans de 12h fins a dos dies abans o després
+            dia = dates[pos]
+            for altre_dia in range(dia - 2, dia + 3):
+                yield from index.get((idx, altre_dia), ())
         
-        if not ultimes_assignacions:
-            return True
+        return OrdreMesRestringides(posicions, self.elegibles, dates, disponible, veines)
+    
+    def genera_solucio_aleatoria(self) -> List[Assignacio]:
+        """Com genera_cromosoma_aleatori, en forma de llista d'assignacions"""
+        return self.descodifica(self.genera_cromosoma_aleatori())
+    
+    def genera_poblacio_inicial(self, executor: Optional[Executor] = None,
+                                pla_previ: Optional[array] = None,
+                                fraccio_pla: float = 0.5) -> List[Tuple[Individu, Dict]]:
+        """
+        Genera la població inicial amb diversitat. Amb `pla_previ` (cromosoma de
+        cromosoma_pla_previ), una fracció de la població és el pla i còpies mutades
+        """
+        print(f"   Generant població inicial de {self.mida_poblacio} individus...")
         
-        # Ordenem per data
-        ultimes_assignacions.sort(key=lambda a: (a.data, a.hora_inici))
+        poblacio = []
+        if pla_previ is not None:
+            poblacio = self._llavors_pla_previ(pla_previ, max(1, int(self.mida_poblacio * fraccio_pla)))
+            print(f"      {len(poblacio)} individus a partir del pla previ")
+        mida = self.mida_poblacio - len(poblacio)
         
-        inici_nova = datetime.combine(data_nova, hora_inici_nova)
+        # Afegim variació aleatòria progressiva (el primer individu no es muta)
+        probs_mutacio = [0.0] + [
+            0.1 + (i / mida * 0.3) for i in range(1, mida)
+        ] if mida > 0 else []
         
-        # Comprovem només amb les assignacions properes en el temps
-        for assign_anterior in reversed(ultimes_assignacions):
-            # Si l'assignació anterior és més de 2 dies abans, no cal comprovar
-            if (data_nova - assign_anterior.data).days > 2:
-                continue
+        if executor is not None:
+            poblacio += self._nous_individus(probs_mutacio, False, executor)
+        else:
+            for prob_mutacio in self._fins_cancel_lacio(probs_mutacio):
+                poblacio.extend(self._nous_individus([prob_mutacio], False))
                 
-            fi_anterior = assign_anterior.hora_fi_real()
-            if not isinstance(fi_anterior, datetime):
-                fi_anterior = datetime.combine(assign_anterior.data, fi_anterior)
-            
-            hores_descans = (inici_nova - fi_anterior).total_seconds() / 3600
-            
-            if hores_descans < 12:
-                return False
+                if len(poblacio) % 10 == 0:
+                    print(f"      {len(poblacio)}/{self.mida_poblacio} individus generats")
         
-        return True
+        if not poblacio:
+            # Cancel·lada abans del primer individu: el pla buit fa de millor provisional
+            buit = array('i', [-1]) * len(self.necessitats)
+            poblacio.append((buit, self.puntua(buit)))
+        return poblacio
     
-    def genera_solucio_aleatoria(self) -> List[Assignacio]:
+    def cromosoma_pla_previ(self, pla: List[Tuple[str, date, str]]) -> array:
         """
-        Genera una solució inicial amb filtres intel·ligents i validacions rígides
+        Tradueix un pla existent (treballador_id, data, servei) a un cromosoma de la
+        instància actual. Es descarten les files sense necessitat o de treballadors que
+        avui no hi són elegibles (descansos, línia, formació), que repeteixen dia o que
+        trenquen el descans de 12h; la reparació cobreix els forats que queden
         """
-        assignacions = []
-        # CONTROL RÍGID: Un treballador només pot tenir una assignació per dia
-        treballadors_per_dia = {}  # {(treballador_id, data): True}
+        cromosoma = array('i', [-1]) * len(self.necessitats)
+        ocupats = set()
+        linia = self.nova_linia_temporal()
         
-        for necessitat in self.necessitats:
-            # Busquem el torn corresponent
-            if necessitat.servei not in self.torns:
+        for treb_id, data, servei in sorted(pla, key=lambda f: (f[1], f[2], f[0])):
+            pos = self.posicio_necessitat.get((servei, data))
+            idx = self.index_treballador.get(treb_id)
+            if pos is None or idx is None or cromosoma[pos] >= 0 or self.horaris[pos] is None:
                 continue
-            
-            torn = self.torns[necessitat.servei]
-            
-            # Intentem trobar l'horari correcte per aquesta data
-            try:
-                servei = DataLoader.troba_servei_per_data(
-                    torn, 
-                    necessitat.data, 
-                    self.calendari
-                )
-            except:
+            if not (self.elegibles_bits[pos] >> idx) & 1 or (idx, data) in ocupats:
                 continue
-            
-            # Creem una llista de treballadors candidats (només grup T)
-            candidats = []
+            if not self.compleix_descans_12h(linia, idx, pos):
+                continue
+            cromosoma[pos] = idx
+            ocupats.add((idx, data))
+            linia.afegeix(idx, *self.intervals[pos])
+        
+        return self.reparacio_cromosoma(cromosoma)
+    
+    def _llavors_pla_previ(self, pla_previ: array, num: int) -> List[Tuple[Individu, Dict]]:
+        """El pla previ sense canvis i `num - 1` còpies amb mutació creixent, reparades"""
+        llavors = [(pla_previ, self._avalua(pla_previ))]
+        for i in self._fins_cancel_lacio(range(1, num)):
+            copia = self.reparacio_cromosoma(
+                self.mutacio_cromosoma(pla_previ, prob_mutacio=0.05 + 0.25 * i / num)
+            )
+            llavors.append((copia, self._avalua(copia)))
+        return llavors
+    
+    def seleccio_torneig(self, poblacio: List[Tuple], 
+                         mida_torneig: int = 3) -> Individu:
+        """Selecciona un individu per torneig"""
+        torneig = self.rng.sample(poblacio, min(mida_torneig, len(poblacio)))
+        return max(torneig, key=lambda x: x[1]['total'])[0]
+    
+    # Operadors sobre llistes d'assignacions: l'AG treballa sempre amb cromosomes;
+    # la llista es codifica (les assignacions repetides es descarten) i el resultat es descodifica
+    
+    def encreuament(self, pare1: List[Assignacio], 
+                   pare2: List[Assignacio]) -> List[Assignacio]:
+        """Com encreuament_cromosoma, sobre llistes d'assignacions"""
+        return self.descodifica(self.encreuament_cromosoma(self.codifica(pare1), self.codifica(pare2)))
+    
+    def mutacio(self, solucio: List[Assignacio], 
+                prob_mutacio: float = 0.1) -> List[Assignacio]:
+        """Com mutacio_cromosoma, sobre una llista d'assignacions"""
+        return self.descodifica(self.mutacio_cromosoma(self.codifica(solucio), prob_mutacio))
+    
+    def evalua_validesa(self, solucio: List[Assignacio]) -> float:
+        """Com evalua_validesa_cromosoma, sobre una llista d'assignacions"""
+        return self.evalua_validesa_cromosoma(self.codifica(solucio))
+    
+    def reparacio(self, solucio: List[Assignacio]) -> List[Assignacio]:
+        """Com reparacio_cromosoma, sobre una llista d'assignacions"""
+        return self.descodifica(self.reparacio_cromosoma(self.codifica(solucio)))
+    
+    # ============= REPRESENTACIÓ EN CROMOSOMA D'ENTERS =============
 
-            for treb_id, treb in self.treballadors_grup_t.items():
-                # VALIDACIÓ RÍGIDA 1: No pot tenir ja una assignació aquest dia
-                if (treb_id, necessitat.data) in treballadors_per_dia:
-                    continue
-                
-                # Filtre 0: Excloem si en aquesta data el treballador ja tenia assignació (opció add_new_only)
-                if necessitat.data in self.exclude_map and treb_id in self.exclude_map[necessitat.data]:
-                    continue
+    def assignacio(self, pos: int, idx_treb: int) -> Optional[Assignacio]:
+        """
+        Retorna l'Assignacio de la necessitat `pos` al treballador `idx_treb`.
+        Es construeix un sol cop i es reutilitza entre tots els individus.
+        """
+        key = (pos, idx_treb)
+        if key not in self._cache_assignacions:
+            horari = self.horaris[pos]
+            assignacio = None
+            if horari is not None:
+                necessitat = self.necessitats[pos]
+                treb = self.treballadors_grup_t[self.ids_treballadors[idx_treb]]
+                assignacio = Assignacio(
+                    treballador_id=treb.id,
+                    torn_id=necessitat.servei,
+                    data=necessitat.data,
+                    hora_inici=horari.hora_inici,
+                    hora_fi=horari.hora_fi,
+                    durada_hores=horari.durada_hores,
+                    es_canvi_zona=treb.es_canvi_zona(necessitat.zona),
+                    es_canvi_torn=treb.es_canvi_torn(necessitat.torn)
+                )
+            self._cache_assignacions[key] = assignacio
+        return self._cache_assignacions[key]
 
-                # Filtre 1: No pot tenir descans
-                if treb.te_descans(necessitat.data):
-                    continue
+    def _linia_temporal_cromosoma(self, cromosoma: array) -> LiniaTemporal:
+        """Línia temporal amb l'històric i els gens coberts d'un cromosoma"""
+        linia = LiniaTemporal(self._intervals_historic)
+        for pos, idx in enumerate(cromosoma):
+            if idx >= 0 and self.intervals[pos] is not None:
+                linia.afegeix(idx, *self.intervals[pos])
+        return linia
 
-                # Filtre 2: Ha de ser de la mateixa línia
-                if treb.linia != necessitat.linia:
-                    continue
+    def codifica(self, solucio: List[Assignacio]) -> array:
+        """
+        Converteix una llista d'assignacions en cromosoma d'enters.
+        Les assignacions sense necessitat o de treballadors fora del grup T es descarten.
+        """
+        cromosoma = array('i', [-1]) * len(self.necessitats)
+        for assign in solucio:
+            pos = self.posicio_necessitat.get((assign.torn_id, assign.data))
+            idx = self.index_treballador.get(assign.treballador_id)
+            if pos is None or idx is None:
+                continue
+            if cromosoma[pos] == -1:
+                cromosoma[pos] = idx
+        return cromosoma
 
-                # Filtre 3: Ha de tenir la formació necessària
-                if necessitat.formacio not in treb.habilitacions:
-                    continue
+    def descodifica(self, cromosoma: array) -> List[Assignacio]:
+        """Converteix un cromosoma d'enters en la llista d'assignacions equivalent"""
+        solucio = []
+        for pos, idx in enumerate(cromosoma):
+            if idx < 0:
+                continue
+            assignacio = self.assignacio(pos, idx)
+            if assignacio is not None:
+                solucio.append(assignacio)
+        return solucio
 
-                # Filtre 4: No pot superar hores anuals màximes
-                hores_necessaries = servei.durada_hores()
-                if treb.hores_anuals_realitzades + hores_necessaries > treb.max_hores_ampliables:
-                    continue
+    def genera_cromosoma_aleatori(self) -> array:
+        """
+        Genera una solució inicial amb filtres intel·ligents i validacions rígides
+        """
+        cromosoma = array('i', [-1]) * len(self.necessitats)
+        ocupats = set()  # {(idx_treballador, data)}
+        linia = self.nova_linia_temporal()  # Intervals ocupats (descans 12h)
+        num_assignacions = [0] * len(self.ids_treballadors)
 
-                # VALIDACIÓ RÍGIDA 2: Ha de complir 12h de descans
-                if not self._compleix_descans_12h(treb_id, necessitat.data, servei.hora_inici, assignacions):
-                    continue
+        def disponible(pos: int, idx: int) -> bool:
+            if (idx, self.necessitats[pos].data) in ocupats:
+                return False
+            treb = self.treballadors_grup_t[self.ids_treballadors[idx]]
+            if treb.hores_anuals_realitzades + self.assignacio(pos, idx).durada_hores > treb.max_hores_ampliables:
+                return False
+            return self.compleix_descans_12h(linia, idx, pos)
 
-                candidats.append(treb_id)
+        ordre = self._ordre_construccio(
+            [pos for pos in self.posicions_actives if self.horaris[pos] is not None], disponible
+        )
+        for pos in ordre:
+            necessitat = self.necessitats[pos]
+            candidats_prioritzats = []
 
-            if not candidats:
-                continue
+            for idx in self.elegibles[pos]:
+                if not disponible(pos, idx):
+                    continue
 
-            # Prioritzem treballadors amb menys assignacions i dins hores estàndard
-            candidats_prioritzats = []
+                treb = self.treballadors_grup_t[self.ids_treballadors[idx]]
+                assignacio = self.assignacio(pos, idx)
 
-            for treb_id in candidats:
-                treb = self.treballadors_grup_t[treb_id]
+                # Prioritzem treballadors dins hores estàndard, de la seva zona i torn
+                # i amb menys assignacions (equilibri)
                 prioritat = 0
-
-                # Bonus si està dins hores estàndard
                 if treb.esta_dins_limit_estandard():
                     prioritat += 10
-
-                # Bonus si és la seva zona (menys canvis)
-                if not treb.es_canvi_zona(necessitat.zona):
+                if not assignacio.es_canvi_zona:
                     prioritat += 5
-
-                # Bonus si és el seu torn (menys canvis)
-                if not treb.es_canvi_torn(necessitat.torn):
+                if not assignacio.es_canvi_torn:
                     prioritat += 5
+                prioritat -= num_assignacions[idx] * 2
 
-                # Penalització per cada assignació que ja té (equilibri)
-                num_assignacions = sum(1 for a in assignacions if a.treballador_id == treb_id)
-                prioritat -= num_assignacions * 2
+                candidats_prioritzats.append((idx, prioritat))
 
-                candidats_prioritzats.append((treb_id, prioritat))
+            if not candidats_prioritzats:
+                continue
 
-            # Ordenem per prioritat i triem amb pes aleatori
             candidats_prioritzats.sort(key=lambda x: x[1], reverse=True)
-
-            # Selecció estocàstica: més probabilitat pels millors
             pesos = [max(1, c[1]) for c in candidats_prioritzats[:10]]
-            treballador_escollit = random.choices(
-                [c[0] for c in candidats_prioritzats[:10]], 
-                weights=pesos, 
+            escollit = self.rng.choices(
+                [c[0] for c in candidats_prioritzats[:10]],
+                weights=pesos,
                 k=1
             )[0]
 
-            # Creem l'assignació
-            treb = self.treballadors_grup_t[treballador_escollit]
-
-            assignacio = Assignacio(
-                treballador_id=treballador_escollit,
-                torn_id=necessitat.servei,
-                data=necessitat.data,
-                hora_inici=servei.hora_inici,
-                hora_fi=servei.hora_fi,
-                durada_hores=servei.durada_hores(),
-                es_canvi_zona=treb.es_canvi_zona(necessitat.zona),
-                es_canvi_torn=treb.es_canvi_torn(necessitat.torn)
-            )
+            cromosoma[pos] = escollit
+            ocupats.add((escollit, necessitat.data))
+            linia.afegeix(escollit, *self.intervals[pos])
+            num_assignacions[escollit] += 1
+            ordre.assignada(pos, escollit)
 
-            assignacions.append(assignacio)
-            # REGISTREM que aquest treballador ja té assignació aquest dia
-            treballadors_per_dia[(treballador_escollit, necessitat.data)] = True
-        
-        return assignacions
-    
-    def genera_poblacio_inicial(self) -> List[Tuple[List[Assignacio], Dict]]:
-        """Genera la població inicial amb diversitat"""
-        poblacio = []
-        
-        print(f"   Generant població inicial de {self.mida_poblacio} individus...")
-        
-        for i in range(self.mida_poblacio):
-            solucio = self.genera_solucio_aleatoria()
-            
-            # Afegim variació aleatòria progressiva
-            if i > 0:
-                prob_mutacio = 0.1 + (i / self.mida_poblacio * 0.3)
-                solucio = self.mutacio(solucio, prob_mutacio=prob_mutacio)
-            
-            resultat = self.restriccions.evalua_solucio(
-                solucio, self.treballadors, self.torns, 
-                self.necessitats, self.calendari, self.estadistiques
-            )
-            
-            poblacio.append((solucio, resultat))
-            
-            if (i + 1) % 10 == 0:
-                print(f"      {i + 1}/{self.mida_poblacio} individus generats")
-        
-        return poblacio
-    
-    def seleccio_torneig(self, poblacio: List[Tuple], 
-                         mida_torneig: int = 3) -> List[Assignacio]:
-        """Selecciona un individu per torneig"""
-        torneig = random.sample(poblacio, min(mida_torneig, len(poblacio)))
-        return max(torneig, key=lambda x: x[1]['total'])[0]
-    
-    def encreuament(self, pare1: List[Assignacio], 
-                   pare2: List[Assignacio]) -> List[Assignacio]:
+        return cromosoma
+
+    def encreuament_cromosoma(self, pare1: array, pare2: array) -> array:
         """
-        Encreuament intel·ligent: manté assignacions per necessitat
-        VALIDACIÓ: Assegura que no hi hagi duplicats de treballador-dia
+        Encreuament intel·ligent: per cada necessitat es tria el gen d'un dels pares
+        segons criteris d'equitat, sense repetir treballador-dia
         """
-        if len(pare1) == 0 or len(pare2) == 0:
-            return pare1 if len(pare1) > 0 else pare2
-        
-        fill = []
-        treballadors_per_dia = {}  # Control de duplicats
-        
-        # Per cada necessitat, triem l'assignació del pare1 o pare2
-        for necessitat in self.necessitats:
-            assign_pare1 = None
-            assign_pare2 = None
-            
-            for a in pare1:
-                if a.torn_id == necessitat.servei and a.data == necessitat.data:
-                    assign_pare1 = a
-                    break
-            
-            for a in pare2:
-                if a.torn_id == necessitat.servei and a.data == necessitat.data:
-                    assign_pare2 = a
-                    break
-            
-            # Filtrem assignacions que violarien la restricció d'una per dia
-            candidats = []
-            
-            if assign_pare1:
-                key = (assign_pare1.treballador_id, assign_pare1.data)
-                if key not in treballadors_per_dia:
-                    candidats.append(assign_pare1)
-            
-            if assign_pare2:
-                key = (assign_pare2.treballador_id, assign_pare2.data)
-                if key not in treballadors_per_dia:
-                    candidats.append(assign_pare2)
-            
+        fill = array('i', [-1]) * len(self.necessitats)
+        ocupats = set()
+
+        for pos in self.posicions_actives:
+            data = self.necessitats[pos].data
+            candidats = [idx for idx in (pare1[pos], pare2[pos])
+                         if idx >= 0 and (idx, data) not in ocupats]
+
             if not candidats:
                 continue
-            
-            # Triem entre els candidats vàlids
+
             if len(candidats) == 1:
-                assignacio_triada = candidats[0]
+                triat = candidats[0]
             else:
-                # Avaluem quina és millor segons criteris d'equitat
-                assign_pare1, assign_pare2 = candidats[0], candidats[1]
-                treb1 = self.treballadors_grup_t.get(assign_pare1.treballador_id)
-                treb2 = self.treballadors_grup_t.get(assign_pare2.treballador_id)
-                
-                score1 = 0
-                score2 = 0
-                
-                if treb1:
-                    if treb1.esta_dins_limit_estandard():
-                        score1 += 2
-                    if not assign_pare1.es_canvi_zona:
-                        score1 += 1
-                    if not assign_pare1.es_canvi_torn:
-                        score1 += 1
-                
-                if treb2:
-                    if treb2.esta_dins_limit_estandard():
-                        score2 += 2
-                    if not assign_pare2.es_canvi_zona:
-                        score2 += 1
-                    if not assign_pare2.es_canvi_torn:
-                        score2 += 1
-                
-                # Selecció estocàstica basada en scores
+                score1 = self._puntuacio_gen(pos, candidats[0])
+                score2 = self._puntuacio_gen(pos, candidats[1])
                 if score1 + score2 > 0:
-                    prob_pare1 = score1 / (score1 + score2)
-                    if random.random() < prob_pare1:
-                        assignacio_triada = assign_pare1
-                    else:
-                        assignacio_triada = assign_pare2
+                    triat = candidats[0] if self.rng.random() < score1 / (score1 + score2) else candidats[1]
                 else:
-                    assignacio_triada = random.choice([assign_pare1, assign_pare2])
-            
-            fill.append(assignacio_triada)
-            treballadors_per_dia[(assignacio_triada.treballador_id, assignacio_triada.data)] = True
-        
+                    triat = self.rng.choice(candidats)
+
+            fill[pos] = triat
+            ocupats.add((triat, data))
+
         return fill
-    
-    def mutacio(self, solucio: List[Assignacio], 
-                prob_mutacio: float = 0.1) -> List[Assignacio]:
+
+    def _puntuacio_gen(self, pos: int, idx_treb: int) -> int:
+        """Criteris d'equitat de l'encreuament per a un gen"""
+        assignacio = self.assignacio(pos, idx_treb)
+        treb = self.treballadors_grup_t[self.ids_treballadors[idx_treb]]
+        score = 0
+        if treb.esta_dins_limit_estandard():
+            score += 2
+        if assignacio is not None:
+            if not assignacio.es_canvi_zona:
+                score += 1
+            if not assignacio.es_canvi_torn:
+                score += 1
+        return score
+
+    def mutacio_cromosoma(self, cromosoma: array, prob_mutacio: float = 0.1) -> array:
         """
-        Mutació: canvia algunes assignacions prioritzant l'equitat
-        VALIDACIÓ: Assegura que no es creïn duplicats de treballador-dia
+        Mutació: canvia alguns gens prioritzant l'equitat, sense repetir treballador-dia.
+        El descans de 12h es comprova contra totes les assignacions del cromosoma
         """
-        nova_solucio = []
-        # Control d'assignacions per treballador i dia
-        treballadors_per_dia = {}
-        
-        # Primer passem per totes les assignacions per registrar-les
-        for assign in solucio:
-            treballadors_per_dia[(assign.treballador_id, assign.data)] = assign
-        
-        for assign in solucio:
-            if random.random() < prob_mutacio:
-                # Busquem la necessitat corresponent
-                necessitat = None
-                for nec in self.necessitats:
-                    if nec.servei == assign.torn_id and nec.data == assign.data:
-                        necessitat = nec
-                        break
-                
-                if necessitat:
-                    # Busquem treballadors alternatius del grup T
-                    candidats = []
-                    
-                    for treb_id, treb in self.treballadors_grup_t.items():
-                        # Skip el treballador actual
-                        if treb_id == assign.treballador_id:
-                            continue
-                        
-                        # VALIDACIÓ RÍGIDA: No pot tenir ja una assignació aquest dia
-                        if (treb_id, necessitat.data) in treballadors_per_dia:
-                            continue
-                        
-                        # Excloem segons exclude_map
-                        if necessitat.data in self.exclude_map and treb_id in self.exclude_map[necessitat.data]:
-                            continue
-
-                        if treb.te_descans(necessitat.data):
-                            continue
-                        if treb.linia != necessitat.linia:
-                            continue
-                        if necessitat.formacio not in treb.habilitacions:
-                            continue
-                        
-                        # Comprovem hores disponibles
-                        if treb.hores_disponibles() < assign.durada_hores:
-                            continue
-                        
-                        # VALIDACIÓ RÍGIDA: Ha de complir 12h de descans
-                        if not self._compleix_descans_12h(treb_id, necessitat.data, assign.hora_inici, nova_solucio):
-                            continue
-                        
-                        candidats.append(treb_id)
-                    
-                    if candidats:
-                        # Triem un nou treballador
-                        nou_treballador = random.choice(candidats)
-                        treb = self.treballadors_grup_t[nou_treballador]
-                        
-                        # ACTUALITZEM el registre
-                        treballadors_per_dia.pop((assign.treballador_id, assign.data), None)
-                        
-                        nova_assignacio = Assignacio(
-                            treballador_id=nou_treballador,
-                            torn_id=assign.torn_id,
-                            data=assign.data,
-                            hora_inici=assign.hora_inici,
-                            hora_fi=assign.hora_fi,
-                            durada_hores=assign.durada_hores,
-                            es_canvi_zona=treb.es_canvi_zona(necessitat.zona),
-                            es_canvi_torn=treb.es_canvi_torn(necessitat.torn)
-                        )
-                        
-                        treballadors_per_dia[(nou_treballador, necessitat.data)] = nova_assignacio
-                        nova_solucio.append(nova_assignacio)
-                    else:
-                        nova_solucio.append(assign)
-                else:
-                    nova_solucio.append(assign)
+        nou = array('i', cromosoma)
+        ocupats = {(idx, self.necessitats[pos].data) for pos, idx in enumerate(nou) if idx >= 0}
+        linia = self._linia_temporal_cromosoma(nou)
+
+        for pos in self.posicions_actives:
+            actual = nou[pos]
+            if actual < 0 or self.rng.random() >= prob_mutacio:
+                continue
+
+            necessitat = self.necessitats[pos]
+            assignacio_actual = self.assignacio(pos, actual)
+            if assignacio_actual is None:
+                continue
+
+            candidats = []
+            for idx in self.elegibles[pos]:
+                if idx == actual:
+                    continue
+                if (idx, necessitat.data) in ocupats:
+                    continue
+
+                treb_id = self.ids_treballadors[idx]
+                treb = self.treballadors_grup_t[treb_id]
+                if treb.hores_disponibles() < assignacio_actual.durada_hores:
+                    continue
+                if not self.compleix_descans_12h(linia, idx, pos):
+                    continue
+
+                candidats.append(idx)
+
+            if candidats:
+                nou_idx = self.rng.choice(candidats)
+                ocupats.discard((actual, necessitat.data))
+                ocupats.add((nou_idx, necessitat.data))
+                linia.elimina(actual, *self.intervals[pos])
+                linia.afegeix(nou_idx, *self.intervals[pos])
+                nou[pos] = nou_idx
+
+        return nou
+
+    def reparacio_cromosoma(self, cromosoma: array) -> array:
+        """
+        Repara un cromosoma de manera intel·ligent:
+        1. Allibera els gens que repeteixen treballador-dia
+        2. Intenta cobrir les necessitats descobertes amb treballadors lliures
+        """
+        reparat = array('i', [-1]) * len(self.necessitats)
+        ocupats = set()
+
+        for pos in self.posicions_actives:
+            idx = cromosoma[pos]
+            if idx < 0:
+                continue
+            key = (idx, self.necessitats[pos].data)
+            if key in ocupats:
+                continue
+            reparat[pos] = idx
+            ocupats.add(key)
+
+        linia = self._linia_temporal_cromosoma(reparat)
+
+        for pos in self.posicions_actives:
+            if reparat[pos] >= 0 or self.horaris[pos] is None:
+                continue
+
+            nec = self.necessitats[pos]
+            candidats_ordenats = []
+
+            for idx in self.elegibles[pos]:
+                if (idx, nec.data) in ocupats:
+                    continue
+
+                treb = self.treballadors_grup_t[self.ids_treballadors[idx]]
+                assignacio = self.assignacio(pos, idx)
+                prioritat = 0
+                if not assignacio.es_canvi_zona:
+                    prioritat += 10
+                if not assignacio.es_canvi_torn:
+                    prioritat += 10
+                if treb.esta_dins_limit_estandard():
+                    prioritat += 5
+
+                candidats_ordenats.append((idx, prioritat))
+
+            candidats_ordenats.sort(key=lambda x: x[1], reverse=True)
+
+            for idx, _ in candidats_ordenats:
+                if not self.compleix_descans_12h(linia, idx, pos):
+                    continue
+
+                reparat[pos] = idx
+                ocupats.add((idx, nec.data))
+                linia.afegeix(idx, *self.intervals[pos])
+                break
+
+        return reparat
+
+    def evalua_validesa_cromosoma(self, cromosoma: array) -> float:
+        """
+        Retorna una penalització basada en violacions de restriccions (treballador-dia
+        repetit i necessitats descobertes). Penalitzacions més altes = solucions pitjors
+        """
+        penalitzacio = 0.0
+        vistes = set()
+        cobertes = 0
+
+        for pos in self.posicions_actives:
+            idx = cromosoma[pos]
+            if idx < 0:
+                continue
+            cobertes += 1
+            key = (idx, self.necessitats[pos].data)
+            if key in vistes:
+                penalitzacio += 50.0
             else:
-                nova_solucio.append(assign)
+                vistes.add(key)
+
+        penalitzacio += (len(self.necessitats) - cobertes) * 20.0
+
+        return penalitzacio
+
+    # ============= CLASSES DE TREBALLADORS EQUIVALENTS =============
+
+    def _calcula_classes_equivalencia(self) -> List[Tuple[int, ...]]:
+        """
+        Agrupa els treballadors amb la mateixa línia, habilitacions, zona, torn assignat,
+        límits d'hores anuals, descansos i exclusions a la finestra (fins a dos dies
+        després, per la regla del divendres) i les mateixes necessitats elegibles. Per a
+        la cerca només es distingeixen per les hores fetes, els canvis i l'històric.
+        Retorna les classes de més d'un treballador, ordenades per equitat (menys hores primer)
+        """
+        if not self.necessitats:
+            return []
+        primer = min(nec.data for nec in self.necessitats).toordinal()
+        ultim = max(nec.data for nec in self.necessitats).toordinal() + 2
+        finestra = [date.fromordinal(d) for d in range(primer, ultim + 1)]
+
+        columnes = [[] for _ in self.ids_treballadors]
+        for pos, idxs in enumerate(self.elegibles):
+            for idx in idxs:
+                columnes[idx].append(pos)
+
+        grups = {}
+        for idx, treb_id in enumerate(self.ids_treballadors):
+            treb = self.treballadors_grup_t[treb_id]
+            clau = (
+                treb.linia, frozenset(treb.habilitacions), treb.zona, treb.torn_assignat,
+                treb.max_hores_anuals, treb.max_hores_ampliables,
+                tuple(treb.te_descans(d) for d in finestra),
+                tuple(treb_id in self.exclude_map.get(d, ()) for d in finestra),
+                tuple(columnes[idx])
+            )
+            grups.setdefault(clau, []).append(idx)
+
+        def equitat(idx):
+            treb = self.treballadors_grup_t[self.ids_treballadors[idx]]
+            return treb.hores_anuals_realitzades, treb.canvis_zona + treb.canvis_torn, idx
+
+        return [tuple(sorted(idxs, key=equitat)) for idxs in grups.values() if len(idxs) > 1]
+
+    def _compatible_historic(self, pos: int, idx: int) -> bool:
+        """El treballador pot cobrir la necessitat respecte del seu històric (12h i mateix dia)"""
+        clau = (pos, idx)
+        if clau not in self._compatibles_historic:
+            compatible = True
+            historic = self.estadistiques.historials.get(self.ids_treballadors[idx])
+            ultima = historic.ultima_assignacio if historic else None
+            if ultima is not None and ultima.data == self.necessitats[pos].data:
+                compatible = False
+            elif self.intervals[pos] is not None:
+                compatible = self._linia_historic.compleix_descans(idx, *self.intervals[pos])
+            self._compatibles_historic[clau] = compatible
+        return self._compatibles_historic[clau]
+
+    def _pes_classe(self, c: int, pos: int) -> Tuple[float, int]:
+        """(hores, canvis de zona i torn) de la necessitat `pos` per a qualsevol membre de la classe `c`"""
+        clau = (c, pos)
+        if clau not in self._pesos_classe:
+            treb = self.treballadors_grup_t[self.ids_treballadors[self.classes_equivalencia[c][0]]]
+            nec = self.necessitats[pos]
+            hores = self.horaris[pos].durada_hores if self.horaris[pos] is not None else 0.0
+            self._pesos_classe[clau] = (hores, treb.es_canvi_zona(nec.zona) + treb.es_canvi_torn(nec.torn))
+        return self._pesos_classe[clau]
+
+    def _nivell_hores(self, idx: int, hores: float) -> int:
+        """Franja de les hores anuals amb `hores` més: 0 dins l'estàndard, 1 ampliable, 2 excés"""
+        treb = self.treballadors_grup_t[self.ids_treballadors[idx]]
+        total = treb.hores_anuals_realitzades + hores
+        if total <= treb.max_hores_anuals:
+            return 0
+        return 1 if total <= treb.max_hores_ampliables else 2
+
+    def _canonitza(self, individu: Individu) -> Individu:
+        """
+        Forma canònica d'un cromosoma respecte de les classes de treballadors equivalents.
+        Dins d'una classe, permutar els paquets de necessitats (les que cobreix cada
+        treballador) dona solucions simètriques: els paquets es reparteixen de més a menys
+        hores (i canvis) entre els membres de menys a més hores fetes, saltant els que
+        l'històric no permet i els que quedarien en una franja d'hores anuals pitjor que
+        la del treballador original del paquet. Si una classe no es pot repartir així,
+        es deixa com estava
+        """
+        if not self._classe:
+            return individu
+
+        paquets = {}  # idx -> posicions que cobreix
+        for pos, idx in enumerate(individu):
+            if idx >= 0 and idx in self._classe:
+                paquets.setdefault(idx, []).append(pos)
+        if not paquets:
+            return individu
+
+        canonic = array('i', individu)
+        for c in sorted({self._classe[idx] for idx in paquets}):
+            membres = self.classes_equivalencia[c]
+
+            def pes(paquet):
+                pesos = [self._pes_classe(c, pos) for pos in paquet]
+                return -sum(h for h, _ in pesos), -sum(n for _, n in pesos), paquet
+
+            lliures = list(membres)
+            repartiment = []
+            for paquet, propietari in sorted(((paquets[idx], idx) for idx in membres if idx in paquets),
+                                             key=lambda parella: pes(parella[0])):
+                hores = sum(self._pes_classe(c, pos)[0] for pos in paquet)
+                nivell = self._nivell_hores(propietari, hores)
+                membre = next((idx for idx in lliures
+                               if self._nivell_hores(idx, hores) <= nivell
+                               and all(self._compatible_historic(pos, idx) for pos in paquet)), None)
+                if membre is None:
+                    break
+                lliures.remove(membre)
+                repartiment.append((membre, paquet))
+            else:
+                for membre, paquet in repartiment:
+                    for pos in paquet:
+                        canonic[pos] = membre
+        return canonic
+
+    # ============= AVALUACIÓ =============
+
+    def a_assignacions(self, individu: Individu) -> List[Assignacio]:
+        """
+        Retorna l'individu com a llista d'assignacions (per avaluar o persistir),
+        amb el repartiment canònic de les classes de treballadors equivalents
+        """
+        return self.descodifica(self._canonitza(individu))
+
+    @staticmethod
+    def _num_assignacions(individu: Individu) -> int:
+        return sum(1 for idx in individu if idx >= 0)
+
+    def _avalua(self, individu: Individu) -> Dict:
+        """
+        Avalua un individu amb el RestriccionManager, passant per la cache de fitness.
+        Retorna sempre una còpia: els cridants hi integren la validesa.
+        Les solucions simètriques (classes equivalents) s'avaluen en la forma canònica
+        """
+        individu = self._canonitza(individu)
+        if self.mida_cache <= 0:
+            return self._avalua_sense_cache(individu)
         
-        return nova_solucio
+        clau = self._clau_cache(individu)
+        resultat = self._cache_fitness.get(clau)
+        if resultat is not None:
+            self._cache_fitness.move_to_end(clau)
+            self.cache_encerts += 1
+        else:
+            self.cache_errades += 1
+            resultat = self._avalua_sense_cache(individu)
+            self._cache_fitness[clau] = resultat
+            if len(self._cache_fitness) > self.mida_cache:
+                self._cache_fitness.popitem(last=False)
+        return dict(resultat)
     
-    def evalua_validesa(self, solucio: List[Assignacio]) -> float:
+    def _avalua_lot(self, individus: List[array]) -> List[Dict]:
         """
-        Retorna una penalització basada en violacions de restriccions.
-        Serveix per guiar l'AG cap a solucions més vàlides.
-        Penalitzacions més altes = solucions pitjors.
+        Com `_avalua` per a una llista de cromosomes: els que no són a la cache
+        (sense repetir els iguals) s'avaluen junts amb l'AvaluadorLots
         """
-        penalitzacio = 0.0
+        individus = [self._canonitza(individu) for individu in individus]
+        if self.mida_cache <= 0:
+            self.avaluacions += len(individus)
+            return self._avaluador_lots.avalua(individus)
         
-        # Penalització per duplicats de treballador-dia
-        treballador_dia = {}
-        duplicats_treb_dia = 0
-        for assign in solucio:
-            key = (assign.treballador_id, assign.data)
-            if key in treballador_dia:
-                duplicats_treb_dia += 1
-                penalitzacio += 50.0
+        resultats = [None] * len(individus)
+        pendents = {}  # clau -> índexs dels individus amb aquesta clau
+        for i, individu in enumerate(individus):
+            clau = self._clau_cache(individu)
+            resultat = self._cache_fitness.get(clau)
+            if resultat is not None:
+                self._cache_fitness.move_to_end(clau)
+                self.cache_encerts += 1
+                resultats[i] = dict(resultat)
+            elif clau in pendents:
+                self.cache_encerts += 1
+                pendents[clau].append(i)
             else:
-                treballador_dia[key] = True
+                self.cache_errades += 1
+                pendents[clau] = [i]
         
-        # Penalització per duplicats de torn-data
-        torn_data = {}
-        duplicats_torn_data = 0
-        for assign in solucio:
-            key = (assign.torn_id, assign.data)
-            if key in torn_data:
-                duplicats_torn_data += 1
-                penalitzacio += 50.0
-            else:
-                torn_data[key] = True
+        if pendents:
+            self.avaluacions += len(pendents)
+            nous = self._avaluador_lots.avalua([individus[idxs[0]] for idxs in pendents.values()])
+            for (clau, idxs), resultat in zip(pendents.items(), nous):
+                self._cache_fitness[clau] = resultat
+                if len(self._cache_fitness) > self.mida_cache:
+                    self._cache_fitness.popitem(last=False)
+                for i in idxs:
+                    resultats[i] = dict(resultat)
+        return resultats
+    
+    def _avalua_sense_cache(self, individu: Individu) -> Dict:
+        """Avaluació completa d'un individu (ja en forma canònica)"""
+        self.avaluacions += 1
+        return self.restriccions.evalua_solucio(
+            self.descodifica(individu), self.treballadors, self.torns,
+            self.necessitats, self.calendari, self.estadistiques
+        )
+    
+    def _clau_cache(self, individu: Individu) -> bytes:
+        """Digest de l'assignació canònica necessitat -> treballador d'un individu"""
+        return hashlib.blake2b(individu.tobytes(), digest_size=16).digest()
+    
+    def _pren_comptadors_cache(self) -> Tuple[int, int]:
+        """Retorna i reinicia els comptadors locals (encerts, errades)"""
+        comptadors = (self.cache_encerts, self.cache_errades)
+        self.cache_encerts = self.cache_errades = 0
+        return comptadors
+    
+    def _acumula_cache(self, comptadors: Tuple[int, int]) -> None:
+        """Suma els comptadors de cache retornats per un procés treballador o una illa"""
+        self._cache_remot[0] += comptadors[0]
+        self._cache_remot[1] += comptadors[1]
+    
+    def _pren_telemetria(self) -> Telemetria:
+        """Retorna i reinicia les avaluacions i els temps per fase acumulats"""
+        avaluacions, self.avaluacions = self.avaluacions, 0
+        return avaluacions, self._fases.pren()
+    
+    def _acumula_telemetria(self, telemetria: Telemetria) -> None:
+        """Suma la telemetria retornada per un procés treballador"""
+        self.avaluacions += telemetria[0]
+        self._fases.acumula(telemetria[1])
+    
+    def _reinicia_resum(self) -> None:
+        self._pren_telemetria()
+        self.cache_encerts = self.cache_errades = 0
+        self.millores_cerca_local = 0
+        self._cache_remot = [0, 0]
+        self.resum_execucio = {}
+    
+    def _resum_cache(self) -> Dict:
+        encerts = self.cache_encerts + self._cache_remot[0]
+        errades = self.cache_errades + self._cache_remot[1]
+        total = encerts + errades
+        return {
+            'cache_encerts': encerts,
+            'cache_errades': errades,
+            'cache_taxa_encerts': encerts / total if total else 0.0
+        }
+
+    def puntua(self, individu: Individu, validesa_penalty: float = None) -> Dict:
+        """Avalua un individu i integra la penalització de validesa en el score total"""
+        if validesa_penalty is None:
+            validesa_penalty = self.evalua_validesa_cromosoma(individu)
+        resultat = self._avalua(individu)
+        resultat['validesa_penalty'] = validesa_penalty
+        resultat['total'] -= validesa_penalty * 0.05  # Pes del 5%
+        return resultat
+    
+    def _nou_individu(self, prob_mutacio: float, reparar: bool = False) -> Tuple[Individu, Dict]:
+        """Genera, muta i avalua un individu nou (reparat i amb validesa si `reparar`)"""
+        self._fases.inicia()
+        solucio = self.genera_cromosoma_aleatori()
+        self._fases.marca('construccio')
+        if prob_mutacio > 0:
+            solucio = self.mutacio_cromosoma(solucio, prob_mutacio=prob_mutacio)
+            self._fases.marca('mutacio')
+        if reparar:
+            solucio = self.reparacio_cromosoma(solucio)
+            self._fases.marca('reparacio')
+            resultat = self.puntua(solucio)
+        else:
+            resultat = self._avalua(solucio)
+        self._fases.marca('avaluacio')
+        return solucio, resultat
+    
+    def _produeix_fill(self, pare1: Individu, pare2: Individu,
+                       prob_mut: float) -> Tuple[Individu, Dict]:
+        """Encreuament, mutació, reparació i avaluació d'un fill"""
+        fill, validesa_penalty = self._genera_fill(pare1, pare2, prob_mut)
+        resultat = self.puntua(fill, validesa_penalty)
+        self._fases.marca('avaluacio')
+        return fill, resultat
+    
+    def _genera_fill(self, pare1: Individu, pare2: Individu,
+                     prob_mut: float) -> Tuple[Individu, float]:
+        """Encreuament, mutació i reparació d'un fill; retorna (fill, penalització de validesa)"""
+        self._fases.inicia()
+        fill = self.encreuament_cromosoma(pare1, pare2)
+        self._fases.marca('encreuament')
+        fill = self.mutacio_cromosoma(fill, prob_mutacio=prob_mut)
+        self._fases.marca('mutacio')
         
-        # Penalització per necessitats descobertes
-        necessitats_cobertes = set()
-        for assign in solucio:
-            for nec in self.necessitats:
-                if nec.servei == assign.torn_id and nec.data == assign.data:
-                    necessitats_cobertes.add((nec.servei, nec.data))
+        # NOVA LÍNA: Avaluem validesa antes de reparar
+        validesa_penalty = self.evalua_validesa_cromosoma(fill)
         
-        necessitats_descobertes = len(self.necessitats) - len(necessitats_cobertes)
-        penalitzacio += necessitats_descobertes * 20.0
+        # NOVA LÍNA: Reparació intel·ligent si té problemes greus
+        if validesa_penalty > 50:
+            fill = self.reparacio_cromosoma(fill)
+            validesa_penalty = self.evalua_validesa_cromosoma(fill)  # Reevaluem
         
-        return penalitzacio
+        # Reparació sempre al final (passa de neteja)
+        fill = self.reparacio_cromosoma(fill)
+        self._fases.marca('reparacio')
+        return fill, validesa_penalty
     
-    def reparacio(self, solucio: List[Assignacio]) -> List[Assignacio]:
+    def _produeix_lot(self, tasques: List[Tuple[Individu, Individu, int]],
+                      prob_mut: float) -> List[Tuple[Individu, Dict]]:
+        """Fills de les tasques (pare1, pare2, llavor); amb l'avaluador per lots, s'avaluen junts"""
+        if self._avaluador_lots is None:
+            return [self._amb_llavor(llavor, self._produeix_fill, pare1, pare2, prob_mut)
+                    for pare1, pare2, llavor in self._fins_cancel_lacio(tasques)]
+        
+        fills = [self._amb_llavor(llavor, self._genera_fill, pare1, pare2, prob_mut)
+                 for pare1, pare2, llavor in self._fins_cancel_lacio(tasques)]
+        self._fases.inicia()
+        resultats = self._avalua_lot([fill for fill, _ in fills])
+        for resultat, (_, validesa_penalty) in zip(resultats, fills):
+            # NOVA LÍNA: Integrem validesa en el score total
+            resultat['validesa_penalty'] = validesa_penalty
+            resultat['total'] -= validesa_penalty * 0.05  # Pes del 5%
+        self._fases.marca('avaluacio')
+        return [(fill, resultat) for (fill, _), resultat in zip(fills, resultats)]
+    
+    # ============= EXECUCIÓ EN PARAL·LEL =============
+    
+    def _crea_executor(self, processos: int) -> Optional[ProcessPoolExecutor]:
         """
-        Repara una solució de manera intel·ligent:
-        1. Elimina duplicats mantenint els millors
-        2. Intenta reasignar les necessitats descobertes
-        3. Aplica estratègia de reparació progressiva
+        Crea el pool de processos (None si l'execució és seqüencial).
+        Cada procés construeix la seva còpia de l'AG un sol cop a l'inici i rep
+        l'avís de cancel·lació
         """
-        # Pas 1: Identificar i resoldre duplicats de torn-data
-        vistes_torn_data = {}  # {(torn_id, data): assignacio}
-        treballador_dia_vistes = {}  # {(treballador_id, data): assignacio}
-        solucio_sense_duplicats = []
-        duplicats_eliminats = []
-        
-        for assign in solucio:
-            key_torn = (assign.torn_id, assign.data)
-            key_treb = (assign.treballador_id, assign.data)
-            
-            # Prioritat 1: Evitem duplicats de torn-data (crític)
-            if key_torn in vistes_torn_data:
-                duplicats_eliminats.append(assign)
-                continue
-            
-            # Prioritat 2: Evitem duplicats de treballador-dia
-            if key_treb in treballador_dia_vistes:
-                duplicats_eliminats.append(assign)
-                continue
-            
-            solucio_sense_duplicats.append(assign)
-            vistes_torn_data[key_torn] = assign
-            treballador_dia_vistes[key_treb] = assign
+        if processos is not None and processos <= 0:
+            processos = os.cpu_count() or 1
+        self._num_processos = processos or 1
+        if self._num_processos <= 1:
+            return None
+        context = multiprocessing.get_context()
+        self._avis_processos = context.Event()
+        return ProcessPoolExecutor(
+            max_workers=self._num_processos,
+            mp_context=context,
+            initializer=_inicialitza_proces,
+            initargs=(self._parametres, self._avis_processos)
+        )
+    
+    def _lots(self, elements: List) -> List[List]:
+        """Reparteix les tasques en lots (dos per procés) per reduir la comunicació"""
+        mida = max(1, math.ceil(len(elements) / (self._num_processos * 2)))
+        return [elements[i:i + mida] for i in range(0, len(elements), mida)]
+    
+    def _cancel_lat(self) -> bool:
+        return self._cancel_lacio is not None and self._cancel_lacio.is_set()
+    
+    def _fins_cancel_lacio(self, elements):
+        """Recorre `elements` mentre no es demani la cancel·lació (es comprova abans de cada un)"""
+        for element in elements:
+            if self._cancel_lat():
+                return
+            yield element
+    
+    def _espera(self, tasques: List) -> List:
+        """
+        Resultats de les tasques, en ordre. Mentre s'espera es vigila la cancel·lació:
+        si arriba, s'avisa els processos, que tornen de seguida el que porten fet
+        """
+        pendents = set(tasques)
+        while pendents:
+            _, pendents = wait(pendents, timeout=0.1)
+            if self._avis_processos is not None and self._cancel_lat():
+                self._avis_processos.set()
+        return [tasca.result() for tasca in tasques]
+    
+    def _amb_llavor(self, llavor: int, funcio: Callable, *args):
+        """
+        Crida `funcio` amb un flux aleatori propi derivat de `llavor`. Cada fill i
+        cada individu nou rep la seva llavor del flux principal, de manera que el
+        resultat no depèn de com es reparteixen les tasques entre processos
+        """
+        with self._flux(random.Random(llavor)):
+            return funcio(*args)
+    
+    @contextlib.contextmanager
+    def _flux(self, rng: random.Random):
+        """Substitueix temporalment el flux aleatori principal per `rng`"""
+        principal, self.rng = self.rng, rng
+        try:
+            yield rng
+        finally:
+            self.rng = principal
+    
+    def _produeix_fills(self, parelles: List[Tuple[Individu, Individu]], prob_mut: float,
+                        executor: Optional[Executor] = None) -> List[Tuple[Individu, Dict]]:
+        """Produeix i avalua un fill per parella de pares, en paral·lel si hi ha executor"""
+        tasques = [(pare1, pare2, self.rng.getrandbits(32)) for pare1, pare2 in parelles]
+        if executor is None:
+            return self._produeix_lot(tasques, prob_mut)
         
-        # Pas 2: Intentem cobrir les necessitats descobertes per duplicats
-        necessitats_descobertes = []
-        for nec in self.necessitats:
-            key = (nec.servei, nec.data)
-            if key not in vistes_torn_data:
-                necessitats_descobertes.append(nec)
-        
-        # Per cada necessitat descoberta, busquem un treballador lliure
-        reasignacions_exitoses = 0
-        for nec in necessitats_descobertes:
-            # Cercle de búsqueda prioritzat: primer candidats que tenien la necessitat
-            candidats_ordenats = []
-            
-            for treb_id, treb in self.treballadors_grup_t.items():
-                key_treb = (treb_id, nec.data)
-                
-                # Saltem si ja té assignació aquest dia
-                if key_treb in treballador_dia_vistes:
-                    continue
-                
-                # Validacions bàsiques
-                if treb.te_descans(nec.data):
-                    continue
-                if treb.linia != nec.linia:
-                    continue
-                if nec.formacio not in treb.habilitacions:
-                    continue
-                
-                # Calculem prioritat: preferim treballadors que tenien aquesta necessitat
-                prioritat = 0
-                if not treb.es_canvi_zona(nec.zona):
-                    prioritat += 10
-                if not treb.es_canvi_torn(nec.torn):
-                    prioritat += 10
-                if treb.esta_dins_limit_estandard():
-                    prioritat += 5
-                
-                candidats_ordenats.append((treb_id, prioritat))
-            
-            if not candidats_ordenats:
-                continue
-            
-            # Ordenem per prioritat
-            candidats_ordenats.sort(key=lambda x: x[1], reverse=True)
-            
-            # Intentem els millors candidats
-            for treb_id, _ in candidats_ordenats:
-                try:
-                    servei = DataLoader.troba_servei_per_data(
-                        self.torns[nec.servei], nec.data, self.calendari
-                    )
-                    
-                    if not self._compleix_descans_12h(treb_id, nec.data, servei.hora_inici, solucio_sense_duplicats):
-                        continue
-                    
-                    treb = self.treballadors_grup_t[treb_id]
-                    
-                    nova_assign = Assignacio(
-                        treballador_id=treb_id,
-                        torn_id=nec.servei,
-                        data=nec.data,
-                        hora_inici=servei.hora_inici,
-                        hora_fi=servei.hora_fi,
-                        durada_hores=servei.durada_hores(),
-                        es_canvi_zona=treb.es_canvi_zona(nec.zona),
-                        es_canvi_torn=treb.es_canvi_torn(nec.torn)
-                    )
-                    
-                    solucio_sense_duplicats.append(nova_assign)
-                    treballador_dia_vistes[key_treb] = nova_assign
-                    vistes_torn_data[(nec.servei, nec.data)] = nova_assign
-                    reasignacions_exitoses += 1
-                    break  # Necessitat coberta, passem a la següent
-                
-                except:
-                    continue
+        tasques = [
+            executor.submit(
+                _produeix_fills_proces,
+                lot, prob_mut
+            )
+            for lot in self._lots(tasques)
+        ]
+        return self._recull(tasques)
+    
+    def _nous_individus(self, probs_mutacio: List[float], reparar: bool,
+                        executor: Optional[Executor] = None) -> List[Tuple[Individu, Dict]]:
+        """Genera i avalua individus nous, en paral·lel si hi ha executor"""
+        tasques = [(prob, self.rng.getrandbits(32)) for prob in probs_mutacio]
+        if executor is None:
+            return [self._amb_llavor(llavor, self._nou_individu, prob, reparar)
+                    for prob, llavor in self._fins_cancel_lacio(tasques)]
         
-        return solucio_sense_duplicats
+        tasques = [
+            executor.submit(_nous_individus_proces, lot, reparar)
+            for lot in self._lots(tasques)
+        ]
+        return self._recull(tasques)
+    
+    def _recull(self, tasques: List) -> List[Tuple[Individu, Dict]]:
+        """Recull, en ordre, els individus de les tasques, els comptadors de cache i la telemetria"""
+        individus = []
+        for lot, comptadors, telemetria in self._espera(tasques):
+            self._acumula_cache(comptadors)
+            self._acumula_telemetria(telemetria)
+            individus.extend(lot)
+        return individus
     
     def executa(self, generacions: int = 100, 
-                verbose: bool = True) -> Tuple[List[Assignacio], Dict]:
+                verbose: bool = True,
+                processos: int = 1,
+                temps_maxim: Optional[float] = None,
+                score_objectiu: Optional[float] = None,
+                generacions_estancament: Optional[int] = None,
+                epsilon_millora: float = 0.0,
+                fitxer_checkpoint: Optional[str] = None,
+                interval_checkpoint: int = 10,
+                reprendre: bool = False,
+                pla_previ: Optional[List[Tuple[str, date, str]]] = None,
+                fraccio_pla: float = 0.5,
+                telemetria: Optional[Callable[[EsdevenimentGeneracio], None]] = None,
+                cancel_lacio=None) -> Tuple[List[Assignacio], Dict]:
         """
-        Executa l'algorisme genètic amb reparació i evaluació de validesa integrades
+        Executa l'algorisme genètic amb reparació i evaluació de validesa integrades.
+        S'atura en esgotar les generacions o quan es compleix algun criteri d'aturada
+        (el motiu i el temps queden a `resum_execucio`)
+        
+        Args:
+            generacions: Nombre màxim de generacions
+            verbose: Mostra el progrés per pantalla
+            processos: Processos per produir i avaluar fills (1 = seqüencial, 0 = tots els nuclis)
+            temps_maxim: Temps màxim de rellotge en segons (None = sense límit)
+            score_objectiu: S'atura quan el millor score arriba a aquest valor
+            generacions_estancament: S'atura després de N generacions sense millora
+            epsilon_millora: Millora mínima del score perquè no compti com a estancament
+            fitxer_checkpoint: Fitxer on es desa l'estat cada `interval_checkpoint` generacions
+            reprendre: Continua des del checkpoint (si n'hi ha un d'aquesta mateixa instància)
+            pla_previ: Pla existent (treballador_id, data, servei) amb què es sembra
+                la població inicial (arrencada en calent)
+            fraccio_pla: Fracció de la població inicial que surt del pla previ
+            telemetria: Es crida amb un EsdevenimentGeneracio per la població inicial
+                i després de cada generació
+            cancel_lacio: Event (threading.Event) que atura l'execució abans del fill
+                següent; es retorna el millor individu trobat fins aleshores
         """
-        poblacio = self.genera_poblacio_inicial()
+        self._reinicia_resum()
+        criteris = CriterisAturada(temps_maxim, score_objectiu, generacions_estancament,
+                                   epsilon_millora, cancel_lacio)
+        self._cancel_lacio = cancel_lacio
+        cromosoma_pla = self.prepara_pla_previ(pla_previ, verbose)
+        executor = self._crea_executor(processos)
+        try:
+            if verbose and executor is not None:
+                print(f"   Execució en paral·lel amb {self._num_processos} processos")
+            return self._executa(generacions, verbose, executor, criteris,
+                                 fitxer_checkpoint, interval_checkpoint, reprendre,
+                                 cromosoma_pla, fraccio_pla, telemetria)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            criteris.cancel_lada()
+            self.resum_execucio.update(self._resum_cache())
+            self.resum_execucio.update(criteris.resum())
+            if self._avaluador is not None:
+                self.resum_execucio['millores_cerca_local'] = self.millores_cerca_local
+    
+    def _executa(self, generacions: int, verbose: bool, executor: Optional[Executor],
+                 criteris: CriterisAturada, fitxer_checkpoint: Optional[str] = None,
+                 interval_checkpoint: int = 10, reprendre: bool = False,
+                 pla_previ: Optional[array] = None, fraccio_pla: float = 0.5,
+                 telemetria: Optional[Callable[[EsdevenimentGeneracio], None]] = None) -> Tuple[List[Assignacio], Dict]:
+        inici = time.time()
+        estat = self._carrega_estat(fitxer_checkpoint, 'poblacio') if reprendre else None
         
-        millor_global = max(poblacio, key=lambda x: x[1]['total'])
+        if estat is not None:
+            self.rng.setstate(estat['estat_rng'])
+            poblacio = Poblacio(estat['poblacio'])
+            millor_global = estat['millor']
+            sense_millora = estat['generacions_sense_millora']
+            fetes = estat['generacio']
+            if verbose:
+                print(f"   ↺ Reprenent des del checkpoint (generació {fetes}, "
+                      f"millor = {millor_global[1]['total']:.2f})")
+        else:
+            poblacio = Poblacio(self.genera_poblacio_inicial(executor, pla_previ, fraccio_pla))
+            millor_global = poblacio.millor()
+            sense_millora = 0
+            fetes = 0
+        self.resum_execucio['generacio_represa'] = fetes
         
         if verbose:
             print(f"\n   Millor individu inicial: {millor_global[1]['total']:.2f}")
-            print(f"   Assignacions inicials: {len(millor_global[0])}/{len(self.necessitats)}")
+            print(f"   Assignacions inicials: {self._num_assignacions(millor_global[0])}/{len(self.necessitats)}")
+        
+        def desa(gen, poblacio, millor, sense_millora):
+            if (fetes + gen) % interval_checkpoint == 0:
+                self._desa_estat(fitxer_checkpoint, 'poblacio', {
+                    'poblacio': poblacio.parelles(),
+                    'millor': millor,
+                    'generacions_sense_millora': sense_millora,
+                    'generacio': fetes + gen,
+                    'estat_rng': self.rng.getstate()
+                })
+        
+        def emet(gen, poblacio, millor, millor_actual, prob_mut, inici):
+            telemetria(self._esdeveniment_generacio(
+                fetes + gen, generacions, poblacio, millor, millor_actual, prob_mut, inici, criteris
+            ))
         
-        generacions_sense_millora = 0
+        if telemetria is not None:
+            emet(0, poblacio, millor_global, poblacio.millor(),
+                 self._prob_mutacio(sense_millora), inici)
         
+        poblacio, millor_global, _ = self._evoluciona(
+            poblacio, millor_global, sense_millora, max(generacions - fetes, 0), executor,
+            verbose=verbose, criteris=criteris,
+            checkpoint=desa if fitxer_checkpoint and interval_checkpoint > 0 else None,
+            telemetria=emet if telemetria is not None else None
+        )
+        
+        if verbose:
+            print(f"\n   ✓ Algorisme finalitzat!")
+            self._mostra_aturada(criteris)
+            validesa_final = self.evalua_validesa_cromosoma(millor_global[0])
+            print(f"   → Millor score final: {millor_global[1]['total']:.2f}")
+            print(f"   → Penalització validesa final: {validesa_final:.1f}")
+            print(f"   → Assignacions finals: {self._num_assignacions(millor_global[0])}/{len(self.necessitats)}")
+            self._mostra_resum_cache()
+        
+        return self.a_assignacions(millor_global[0]), millor_global[1]
+    
+    def prepara_pla_previ(self, pla_previ: Optional[List[Tuple[str, date, str]]],
+                          verbose: bool) -> Optional[array]:
+        """Cromosoma del pla previ (None si no n'hi ha o no cobreix cap necessitat)"""
+        if not pla_previ:
+            return None
+        cromosoma = self.cromosoma_pla_previ(pla_previ)
+        cobertes = sum(1 for idx in cromosoma if idx >= 0)
+        self.resum_execucio['necessitats_pla_previ'] = cobertes
+        if verbose:
+            print(f"   Pla previ: {len(pla_previ)} assignacions → {cobertes}/{len(self.necessitats)} "
+                  f"necessitats cobertes després de reparar")
+        return cromosoma if cobertes else None
+    
+    def _empremta(self, tipus: str) -> str:
+        """Empremta de la instància (treballadors i necessitats) i del tipus d'execució"""
+        return empremta(
+            tipus, self.ids_treballadors,
+            [(n.servei, n.data.toordinal()) for n in self.necessitats]
+        )
+    
+    def _desa_estat(self, fitxer: str, tipus: str, estat: Dict) -> None:
+        desa_checkpoint(fitxer, {'empremta': self._empremta(tipus), **estat})
+    
+    def _carrega_estat(self, fitxer: Optional[str], tipus: str) -> Optional[Dict]:
+        """Carrega el checkpoint si és d'aquesta instància i tipus d'execució (si no, None)"""
+        if not fitxer:
+            return None
+        estat = carrega_checkpoint(fitxer)
+        if estat is not None and estat.get('empremta') != self._empremta(tipus):
+            print("   ⚠️ El checkpoint és d'una altra instància del problema: es comença de zero")
+            return None
+        return estat
+    
+    @staticmethod
+    def _mostra_aturada(criteris: CriterisAturada) -> None:
+        resum = criteris.resum()
+        print(f"   → Aturada: {resum['motiu_aturada']} després de {resum['generacions_executades']} "
+              f"generacions ({resum['temps_execucio']:.1f} s)")
+    
+    def _mostra_resum_cache(self) -> None:
+        resum = self._resum_cache()
+        if resum['cache_encerts'] + resum['cache_errades']:
+            print(f"   → Cache de fitness: {resum['cache_encerts']} encerts / "
+                  f"{resum['cache_errades']} errades ({resum['cache_taxa_encerts']:.0%})")
+    
+    def _evoluciona(self, poblacio: Iterable[Tuple[Individu, Dict]], millor_global: Tuple[Individu, Dict],
+                    generacions_sense_millora: int, generacions: int,
+                    executor: Optional[Executor] = None, verbose: bool = False,
+                    reinici_diversitat: bool = True,
+                    criteris: Optional[CriterisAturada] = None,
+                    checkpoint=None,
+                    telemetria=None) -> Tuple[Poblacio, Tuple[Individu, Dict], int]:
+        """
+        Fa evolucionar una població durant `generacions` generacions, o fins que
+        es compleixi algun dels `criteris` d'aturada. Si hi ha `checkpoint`, es crida
+        al final de cada generació amb (generació, població, millor, generacions sense millora);
+        si hi ha `telemetria`, amb (generació, població, millor, millor de la generació,
+        probabilitat de mutació, inici de la generació).
+        Retorna (població, millor individu global, generacions sense millora)
+        """
+        poblacio = Poblacio(poblacio)
         for gen in range(generacions):
-            nova_poblacio = []
+            if self._cancel_lat():
+                break
+            inici_generacio = time.time()
             
-            # Elitisme: mantenim els 3 millors
-            poblacio_ordenada = sorted(poblacio, key=lambda x: x[1]['total'], reverse=True)
-            nova_poblacio.extend(poblacio_ordenada[:3])
+            # Elitisme: mantenim els 3 millors (els 5 millors es guarden per al reinici)
+            millors = [poblacio[i] for i in poblacio.millors(5)]
+            nova_poblacio = Poblacio(millors[:3])
             
-            # Generem la resta de la població
-            while len(nova_poblacio) < self.mida_poblacio:
-                pare1 = self.seleccio_torneig(poblacio)
-                pare2 = self.seleccio_torneig(poblacio)
-                
-                fill = self.encreuament(pare1, pare2)
-                
-                # Mutació adaptativa
-                prob_mut = 0.05 + (0.20 * generacions_sense_millora / 25)
-                prob_mut = min(prob_mut, 0.35)
-                fill = self.mutacio(fill, prob_mutacio=prob_mut)
-                
-                # NOVA LÍNA: Avaluem validesa antes de reparar
-                validesa_penalty = self.evalua_validesa(fill)
-                
-                # NOVA LÍNA: Reparació intel·ligent si té problemes greus
-                if validesa_penalty > 50:
-                    fill = self.reparacio(fill)
-                    validesa_penalty = self.evalua_validesa(fill)  # Reevaluem
-                
-                # Reparació sempre al final (passa de neteja)
-                fill = self.reparacio(fill)
-                
-                resultat = self.restriccions.evalua_solucio(
-                    fill, self.treballadors, self.torns, 
-                    self.necessitats, self.calendari, self.estadistiques
-                )
-                
-                # NOVA LÍNA: Integrem validesa en el score total
-                resultat['validesa_penalty'] = validesa_penalty
-                resultat['total'] -= validesa_penalty * 0.05  # Pes del 5%
-                
-                nova_poblacio.append((fill, resultat))
+            # Mutació adaptativa
+            prob_mut = self._prob_mutacio(generacions_sense_millora)
+            
+            # Generem la resta de la població (torneigs alternats: pare1, pare2, ...)
+            self._fases.inicia()
+            guanyadors = poblacio.torneigs(self.rng, 2 * (self.mida_poblacio - len(nova_poblacio)))
+            parelles = [
+                (poblacio.individus[i], poblacio.individus[j])
+                for i, j in zip(guanyadors[::2], guanyadors[1::2])
+            ]
+            self._fases.marca('seleccio')
+            nova_poblacio.amplia(self._produeix_fills(parelles, prob_mut, executor))
+            
+            if self._avaluador is not None:
+                self._fases.inicia()
+                self._aplica_cerca_local(nova_poblacio)
+                self._fases.marca('cerca_local')
+            
+            # Una generació interrompuda per la cancel·lació queda incompleta: es descarta
+            if self._cancel_lat():
+                break
             
             poblacio = nova_poblacio
-            millor_actual = max(poblacio, key=lambda x: x[1]['total'])
+            millor_actual = poblacio.millor()
             
             if millor_actual[1]['total'] > millor_global[1]['total']:
                 millor_global = millor_actual
@@ -627,40 +1338,550 @@ class AlgorismeGenetic:
                 generacions_sense_millora += 1
             
             if verbose and gen % 10 == 0:
-                validesa_global = self.evalua_validesa(millor_global[0])
+                validesa_global = self.evalua_validesa_cromosoma(millor_global[0])
                 print(f"   Generació {gen:3d}: Millor = {millor_global[1]['total']:6.2f} | "
                       f"Actual = {millor_actual[1]['total']:6.2f} | "
-                      f"Cobertes = {len(millor_global[0])}/{len(self.necessitats)} | "
+                      f"Cobertes = {self._num_assignacions(millor_global[0])}/{len(self.necessitats)} | "
                       f"Validesa = {validesa_global:6.1f} | "
                       f"Mut = {prob_mut:.2f}")
             
+            if telemetria is not None:
+                telemetria(gen + 1, poblacio, millor_global, millor_actual, prob_mut, inici_generacio)
+            
+            if criteris is not None and criteris.comprova(millor_global[1]['total']):
+                break
+            
             # Reinici si portem molt temps sense millora
-            if generacions_sense_millora > 35:
+            if reinici_diversitat and generacions_sense_millora > 35:
                 if verbose:
                     print(f"   ↻ Reiniciant diversitat (gen {gen})...")
                 
-                nous_individus = []
-                for _ in range(self.mida_poblacio - 5):
-                    sol = self.genera_solucio_aleatoria()
-                    sol = self.mutacio(sol, prob_mutacio=0.5)
-                    sol = self.reparacio(sol)
-                    res = self.restriccions.evalua_solucio(
-                        sol, self.treballadors, self.torns,
-                        self.necessitats, self.calendari, self.estadistiques
-                    )
-                    validesa_penalty = self.evalua_validesa(sol)
-                    res['validesa_penalty'] = validesa_penalty
-                    res['total'] -= validesa_penalty * 0.05
-                    nous_individus.append((sol, res))
+                nous_individus = self._nous_individus(
+                    [0.5] * (self.mida_poblacio - 5), True, executor
+                )
+                if self._cancel_lat():
+                    break
                 
-                poblacio = poblacio_ordenada[:5] + nous_individus
+                poblacio = Poblacio(millors + nous_individus)
                 generacions_sense_millora = 0
+            
+            if checkpoint is not None:
+                checkpoint(gen + 1, poblacio, millor_global, generacions_sense_millora)
+        
+        return poblacio, millor_global, generacions_sense_millora
+    
+    @staticmethod
+    def _prob_mutacio(generacions_sense_millora: int) -> float:
+        """Mutació adaptativa: creix amb l'estancament fins a 0.35"""
+        return min(0.05 + (0.20 * generacions_sense_millora / 25), 0.35)
+    
+    def _esdeveniment_generacio(self, generacio: int, generacions: int,
+                                poblacio: Poblacio,
+                                millor_global: Tuple[Individu, Dict],
+                                millor_actual: Tuple[Individu, Dict],
+                                prob_mut: float, inici: float,
+                                criteris: CriterisAturada) -> EsdevenimentGeneracio:
+        """Telemetria d'una generació; pren (i reinicia) les avaluacions i els temps per fase"""
+        avaluacions, temps_fases = self._pren_telemetria()
+        durada = time.time() - inici
+        return EsdevenimentGeneracio(
+            generacio=generacio,
+            generacions=generacions,
+            millor=millor_global[1]['total'],
+            actual=millor_actual[1]['total'],
+            cobertes=self._num_assignacions(millor_global[0]),
+            necessitats=len(self.necessitats),
+            diversitat=self._diversitat(poblacio, millor_actual[0]),
+            prob_mutacio=prob_mut,
+            temps_fases=temps_fases,
+            avaluacions=avaluacions,
+            avaluacions_per_segon=avaluacions / durada if durada > 0 else 0.0,
+            temps_generacio=durada,
+            temps_transcorregut=criteris.temps_transcorregut()
+        )
+    
+    def _diversitat(self, poblacio: Poblacio, referencia: Individu) -> float:
+        """Fracció mitjana de gens de la població que difereixen de `referencia`"""
+        if not poblacio or not referencia:
+            return 0.0
+        diferents = sum(
+            a != b
+            for individu, _ in poblacio
+            for a, b in zip(individu, referencia)
+        )
+        return diferents / (len(poblacio) * len(referencia))
+
+
+    # ============= CERCA LOCAL (MEMÈTIC) =============
+    
+    def cerca_local_individu(self, individu: Individu, resultat: Dict,
+                             max_moviments: Optional[int] = None) -> Tuple[Individu, Dict]:
+        """
+        Millora un individu amb moviments de reassignació (una necessitat passa a un
+        altre treballador elegible, o es cobreix si estava descoberta) i d'intercanvi
+        (dues necessitats s'intercanvien els treballadors). Els moviments s'avaluen de
+        forma incremental i només s'accepten si milloren els nivells (violacions
+        rígides, score tou), com al recuit i la cerca tabú: amb pesos infinits el
+        total és inf o nan i no es pot comparar.
+        Retorna l'individu original si no hi ha millora
+        """
+        if self._avaluador is None or not self.posicions_cerca_local:
+            return individu, resultat
+        if max_moviments is None:
+            max_moviments = self.moviments_cerca_local
+        
+        avaluador = self._avaluador.carrega(individu)
+        cromosoma = avaluador.cromosoma
+        inicial = actual = avaluador.nivells()
+        
+        for _ in range(max_moviments):
+            pos = self.rng.choice(self.posicions_cerca_local)
+            if self.rng.random() < 0.5:
+                canvis = self.moviment_reassignacio(cromosoma, pos)
+            else:
+                canvis = self.moviment_intercanvi(cromosoma, pos)
+            if not canvis:
+                continue
+            
+            inversos = [(p, cromosoma[p]) for p, _ in reversed(canvis)]
+            for p, idx in canvis:
+                avaluador.canvia(p, idx)
+            nou = avaluador.nivells()
+            if self._millora_nivells(nou, actual):
+                actual = nou
+            else:
+                avaluador.desfes(inversos)
+        
+        if not self._millora_nivells(actual, inicial):
+            return individu, resultat
+        
+        # El resultat definitiu surt de l'avaluació completa (detall per restricció)
+        millorat = array('i', cromosoma)
+        resultat_millorat = self.puntua(millorat)
+        self.millores_cerca_local += 1
+        return millorat, resultat_millorat
+    
+    @staticmethod
+    def _millora_nivells(nou: Tuple[float, float], actual: Tuple[float, float]) -> bool:
+        """Menys violacions rígides o, amb les mateixes, més score tou"""
+        if nou[0] != actual[0]:
+            return nou[0] > actual[0]
+        return nou[1] > actual[1] + 1e-9
+    
+    def moviment_reassignacio(self, cromosoma: array, pos: int) -> List[Tuple[int, int]]:
+        """Canvis (posició, treballador) que passen la necessitat `pos` a un altre elegible"""
+        nou = self.rng.choice(self.elegibles[pos])
+        return [] if nou == cromosoma[pos] else [(pos, nou)]
+    
+    def moviment_intercanvi(self, cromosoma: array, pos: int) -> List[Tuple[int, int]]:
+        """
+        Canvis (posició, treballador) que intercanvien els treballadors de la necessitat
+        `pos` i d'una altra a l'atzar, si cadascun és elegible per a la de l'altre
+        """
+        altra = self.rng.choice(self.posicions_cerca_local)
+        a, b = cromosoma[pos], cromosoma[altra]
+        if a < 0 or b < 0 or a == b:
+            return []
+        if not (self.elegibles_bits[pos] >> b) & 1 or not (self.elegibles_bits[altra] >> a) & 1:
+            return []
+        return [(pos, b), (altra, a)]
+    
+    def _pren_millores_cerca_local(self) -> int:
+        """Retorna i reinicia el comptador local de millores de la cerca local"""
+        millores, self.millores_cerca_local = self.millores_cerca_local, 0
+        return millores
+    
+    def _aplica_cerca_local(self, poblacio: Poblacio) -> None:
+        """Aplica la cerca local als `cerca_local` millors individus de la població (al seu lloc)"""
+        for i in self._fins_cancel_lacio(poblacio.millors(self.cerca_local)):
+            poblacio.substitueix(i, *self.cerca_local_individu(*poblacio[i]))
+
+
+    # ============= MODEL D'ILLES =============
+    
+    def _inicia_illa(self, llavor: int, pla_previ: Optional[array] = None,
+                     fraccio_pla: float = 0.5) -> Dict:
+        """Crea una illa amb la seva població inicial i el seu propi flux aleatori"""
+        rng = random.Random(llavor)
+        with self._flux(rng), contextlib.redirect_stdout(io.StringIO()):
+            poblacio = Poblacio(self.genera_poblacio_inicial(pla_previ=pla_previ, fraccio_pla=fraccio_pla))
+        return {
+            'poblacio': poblacio.parelles(),
+            'millor': poblacio.millor(),
+            'generacions_sense_millora': 0,
+            'estat_rng': rng.getstate(),
+            'comptadors_cache': self._pren_comptadors_cache()
+        }
+    
+    def _evoluciona_illa(self, illa: Dict, generacions: int,
+                         criteris: Optional[CriterisAturada] = None) -> Dict:
+        """
+        Fa evolucionar una illa `generacions` generacions (sense reinici de diversitat).
+        Amb `criteris`, s'atura abans si s'esgota el temps o s'arriba a l'objectiu
+        """
+        rng = random.Random()
+        rng.setstate(illa['estat_rng'])
+        criteris = criteris or CriterisAturada()
+        
+        with self._flux(rng):
+            poblacio, millor, sense_millora = self._evoluciona(
+                illa['poblacio'], illa['millor'], illa['generacions_sense_millora'], generacions,
+                reinici_diversitat=False, criteris=criteris
+            )
+        
+        return {
+            'poblacio': poblacio.parelles(),
+            'millor': millor,
+            'generacions_sense_millora': sense_millora,
+            'estat_rng': rng.getstate(),
+            'comptadors_cache': self._pren_comptadors_cache(),
+            'millores_cerca_local': self._pren_millores_cerca_local(),
+            'historial': criteris.historial
+        }
+    
+    def _migra(self, illes: List[Dict], num_migrants: int, topologia: str) -> None:
+        """
+        Envia els `num_migrants` millors individus de cada illa a la seva destinació,
+        on substitueixen els pitjors. Topologies: 'anell' (i -> i+1) o 'aleatoria'
+        (parelles aleatòries que s'intercanvien els millors)
+        """
+        n = len(illes)
+        if n < 2 or num_migrants <= 0:
+            return
+        
+        if topologia == 'anell':
+            destins = [(i, (i + 1) % n) for i in range(n)]
+        elif topologia == 'aleatoria':
+            ordre = list(range(n))
+            self.rng.shuffle(ordre)
+            destins = []
+            for i in range(0, n - 1, 2):
+                destins.append((ordre[i], ordre[i + 1]))
+                destins.append((ordre[i + 1], ordre[i]))
+        else:
+            raise ValueError(f"Topologia de migració desconeguda: {topologia}")
+        
+        # Els emigrants es trien abans de substituir res (migració simultània)
+        poblacions = [Poblacio(illa['poblacio']) for illa in illes]
+        emigrants = [[poblacio[i] for i in poblacio.millors(num_migrants)] for poblacio in poblacions]
+        for origen, desti in destins:
+            poblacio = poblacions[desti]
+            for i, (individu, resultat) in zip(poblacio.pitjors(num_migrants), emigrants[origen]):
+                poblacio.substitueix(i, individu, resultat)
+            illes[desti]['poblacio'] = poblacio.parelles()
+    
+    def executa_illes(self, generacions: int = 100,
+                      num_illes: int = 4,
+                      interval_migracio: int = 10,
+                      num_migrants: int = 2,
+                      topologia: str = 'anell',
+                      processos: int = 0,
+                      verbose: bool = True,
+                      temps_maxim: Optional[float] = None,
+                      score_objectiu: Optional[float] = None,
+                      generacions_estancament: Optional[int] = None,
+                      epsilon_millora: float = 0.0,
+                      fitxer_checkpoint: Optional[str] = None,
+                      interval_checkpoint: int = 10,
+                      reprendre: bool = False,
+                      pla_previ: Optional[List[Tuple[str, date, str]]] = None,
+                      fraccio_pla: float = 0.5,
+                      cancel_lacio=None) -> Tuple[List[Assignacio], Dict]:
+        """
+        Model d'illes: `num_illes` poblacions independents (cadascuna amb el seu flux
+        aleatori) evolucionen en processos separats i cada `interval_migracio`
+        generacions s'intercanvien els millors individus.
+        La migració manté la diversitat, de manera que les illes no fan reinicis.
+        
+        Args:
+            generacions: Generacions totals de cada illa
+            num_illes: Nombre d'illes
+            interval_migracio: Generacions entre migracions
+            num_migrants: Individus que emigra cada illa
+            topologia: 'anell' o 'aleatoria'
+            processos: Processos (0 = un per illa fins al nombre de nuclis, 1 = seqüencial)
+            temps_maxim, score_objectiu, generacions_estancament, epsilon_millora:
+                Criteris d'aturada, com a `executa`. L'estancament es mesura sobre el
+                millor score de totes les illes
+            fitxer_checkpoint, interval_checkpoint, reprendre: Com a `executa`. L'estat
+                es desa després de la migració, com a mínim cada `interval_checkpoint` generacions
+            pla_previ, fraccio_pla: Com a `executa`; cada illa es sembra amb el pla previ
+            cancel_lacio: Com a `executa`; les illes tornen el seu estat de seguida
+        """
+        self._reinicia_resum()
+        criteris = CriterisAturada(temps_maxim, score_objectiu, generacions_estancament,
+                                   epsilon_millora, cancel_lacio)
+        self._cancel_lacio = cancel_lacio
+        cromosoma_pla = self.prepara_pla_previ(pla_previ, verbose)
+        if processos is not None and processos <= 0:
+            processos = min(num_illes, os.cpu_count() or 1)
+        executor = self._crea_executor(min(processos or 1, num_illes))
+        
+        def llanca(funcio_proces, metode, arguments):
+            if executor is None:
+                illes = [metode(*args) for args in arguments]
+            else:
+                illes = self._espera([executor.submit(funcio_proces, *args) for args in arguments])
+            for illa in illes:
+                self._acumula_cache(illa.pop('comptadors_cache'))
+                self.millores_cerca_local += illa.pop('millores_cerca_local', 0)
+            return illes
+        
+        try:
+            if verbose:
+                print(f"   Model d'illes: {num_illes} illes, migració cada {interval_migracio} "
+                      f"generacions ({topologia}), {self._num_processos} processos")
+            
+            estat = self._carrega_estat(fitxer_checkpoint, f'illes-{num_illes}') if reprendre else None
+            if estat is not None:
+                self.rng.setstate(estat['estat_rng'])
+                illes = estat['illes']
+                fetes = estat['generacio']
+                if verbose:
+                    print(f"   ↺ Reprenent des del checkpoint (generació {fetes})")
+            else:
+                illes = llanca(_inicia_illa_proces, self._inicia_illa,
+                               [(self.rng.getrandbits(32), cromosoma_pla, fraccio_pla)
+                                for _ in range(num_illes)])
+                fetes = 0
+            self.resum_execucio['generacio_represa'] = fetes
+            desat = fetes
+            
+            while fetes < generacions and not criteris.motiu:
+                bloc = min(interval_migracio, generacions - fetes)
+                illes = llanca(_evoluciona_illa_proces, self._evoluciona_illa,
+                               [(illa, bloc, criteris.per_illa()) for illa in illes])
+                
+                # Millor global de cada generació del bloc (una illa aturada manté el seu últim)
+                historials = [illa.pop('historial') for illa in illes]
+                for g in range(max(len(h) for h in historials)):
+                    fetes += 1
+                    if criteris.comprova(max(h[min(g, len(h) - 1)] for h in historials)):
+                        break
+                criteris.cancel_lada()
+                
+                if fetes < generacions and not criteris.motiu:
+                    self._migra(illes, num_migrants, topologia)
+                
+                if fitxer_checkpoint and interval_checkpoint > 0 and fetes - desat >= interval_checkpoint:
+                    self._desa_estat(fitxer_checkpoint, f'illes-{num_illes}', {
+                        'illes': illes, 'generacio': fetes, 'estat_rng': self.rng.getstate()
+                    })
+                    desat = fetes
+                
+                if verbose:
+                    millors = [illa['millor'][1]['total'] for illa in illes]
+                    print(f"   Generació {fetes:3d}: Millor per illa = "
+                          + " | ".join(f"{m:.2f}" for m in millors))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            self.resum_execucio.update(self._resum_cache())
+            self.resum_execucio.update(criteris.resum())
+            if self._avaluador is not None:
+                self.resum_execucio['millores_cerca_local'] = self.millores_cerca_local
+        
+        millor, millor_resultat = max(
+            (illa['millor'] for illa in illes), key=lambda x: x[1]['total']
+        )
         
         if verbose:
-            print(f"\n   ✓ Algorisme finalitzat!")
-            validesa_final = self.evalua_validesa(millor_global[0])
-            print(f"   → Millor score final: {millor_global[1]['total']:.2f}")
-            print(f"   → Penalització validesa final: {validesa_final:.1f}")
-            print(f"   → Assignacions finals: {len(millor_global[0])}/{len(self.necessitats)}")
+            print("\n   ✓ Algorisme finalitzat!")
+            self._mostra_aturada(criteris)
+            print(f"   → Millor score final: {millor_resultat['total']:.2f}")
+            print(f"   → Assignacions finals: {self._num_assignacions(millor)}/{len(self.necessitats)}")
+            self._mostra_resum_cache()
+        
+        return self.a_assignacions(millor), millor_resultat
+
+
+    # ============= DESCOMPOSICIÓ EN COMPONENTS =============
+    
+    def components(self) -> List[Tuple[List[int], List[int]]]:
+        """
+        Components connexos del graf d'elegibilitat necessitat-treballador.
+        Dues necessitats són del mateix component si comparteixen algun treballador
+        elegible (directament o a través d'altres necessitats); com que els filtres de
+        línia i formació són rígids, components diferents no competeixen mai pels
+        mateixos treballadors.
+        Retorna [(posicions de necessitats, índexs de treballadors)], del més gran al més petit.
+        Les necessitats sense cap candidat (o sense horari) no formen part de cap component
+        """
+        pare = list(range(len(self.ids_treballadors)))
+        
+        def arrel(i):
+            while pare[i] != i:
+                pare[i] = pare[pare[i]]
+                i = pare[i]
+            return i
+        
+        posicions = [
+            pos for pos in self.posicions_actives
+            if self.elegibles[pos] and self.horaris[pos] is not None
+        ]
+        for pos in posicions:
+            primer = arrel(self.elegibles[pos][0])
+            for idx in self.elegibles[pos][1:]:
+                altre = arrel(idx)
+                if altre != primer:
+                    pare[altre] = primer
+        
+        per_arrel = {}
+        for pos in posicions:
+            per_arrel.setdefault(arrel(self.elegibles[pos][0]), ([], set()))[0].append(pos)
+        for idx in range(len(self.ids_treballadors)):
+            component = per_arrel.get(arrel(idx))
+            if component is not None:
+                component[1].add(idx)
+        
+        components = [(posicions, sorted(idxs)) for posicions, idxs in per_arrel.values()]
+        components.sort(key=lambda c: len(c[0]), reverse=True)
+        return components
+    
+    def executa_components(self, generacions: int = 100,
+                           processos: int = 0,
+                           verbose: bool = True,
+                           **opcions) -> Tuple[List[Assignacio], Dict]:
+        """
+        Resol cada component connex (vegeu `components`) com una instància
+        independent, en processos separats si n'hi ha, i fusiona els resultats en
+        un sol pla que es torna a avaluar sencer (les restriccions d'equitat són
+        globals i no es poden sumar per components).
+        
+        Args:
+            generacions: Generacions de cada component
+            processos: Processos (0 = un per component fins al nombre de nuclis, 1 = seqüencial)
+            **opcions: Arguments d'`executa` per a cada component (criteris d'aturada,
+                pla_previ, cancel_lacio...). Els checkpoints i la telemetria només
+                s'apliquen si hi ha un sol component
+        """
+        self._reinicia_resum()
+        components = self.components()
+        if len(components) <= 1:
+            return self.executa(generacions=generacions, verbose=verbose, **opcions)
         
-        return millor_global[0], millor_global[1]
\ No newline at end of file
+        if verbose:
+            print(f"   Descomposició en {len(components)} components: "
+                  + ", ".join(f"{len(p)} nec./{len(t)} treb." for p, t in components))
+        
+        for clau in ('fitxer_checkpoint', 'interval_checkpoint', 'reprendre', 'telemetria'):
+            opcions.pop(clau, None)
+        self._cancel_lacio = opcions.pop('cancel_lacio', None)
+        opcions = dict(opcions, generacions=generacions, verbose=False, processos=1)
+        tasques = [
+            (self._parametres_component(posicions, idxs, self.rng.getrandbits(32)), opcions)
+            for posicions, idxs in components
+        ]
+        
+        if processos is not None and processos <= 0:
+            processos = os.cpu_count() or 1
+        processos = min(processos or 1, len(tasques))
+        if processos > 1:
+            # Amb la cancel·lació, cada component torna de seguida el seu millor pla
+            context = multiprocessing.get_context()
+            self._avis_processos = context.Event()
+            with ProcessPoolExecutor(max_workers=processos, mp_context=context,
+                                     initializer=_inicialitza_avis,
+                                     initargs=(self._avis_processos,)) as executor:
+                resultats = self._espera([executor.submit(_resol_component_proces, *tasca)
+                                          for tasca in tasques])
+        else:
+            resultats = [_resol_component_proces(*tasca, self._cancel_lacio) for tasca in tasques]
+        
+        # Fusió: cada component només cobreix les seves necessitats
+        cromosoma = array('i', [-1]) * len(self.necessitats)
+        for files, _ in resultats:
+            for treb_id, data, servei in files:
+                pos = self.posicio_necessitat.get((servei, data))
+                idx = self.index_treballador.get(treb_id)
+                if pos is not None and idx is not None:
+                    cromosoma[pos] = idx
+        
+        resultat = self.puntua(cromosoma)
+        resultat['components'] = [resum for _, resum in resultats]
+        
+        self.resum_execucio['components'] = len(components)
+        self.resum_execucio['temps_execucio'] = max(r.get('temps_execucio', 0.0) for _, r in resultats)
+        for clau in ('cache_encerts', 'cache_errades', 'millores_cerca_local'):
+            self.resum_execucio[clau] = sum(r.get(clau, 0) for _, r in resultats)
+        total_cache = self.resum_execucio['cache_encerts'] + self.resum_execucio['cache_errades']
+        self.resum_execucio['cache_taxa_encerts'] = (
+            self.resum_execucio['cache_encerts'] / total_cache if total_cache else 0.0
+        )
+        
+        if verbose:
+            print("\n   ✓ Algorisme finalitzat!")
+            print(f"   → Millor score final: {resultat['total']:.2f}")
+            print(f"   → Assignacions finals: {self._num_assignacions(cromosoma)}/{len(self.necessitats)}")
+        
+        return self.a_assignacions(cromosoma), resultat
+    
+    def _parametres_component(self, posicions: List[int], idxs: List[int], llavor: int) -> Dict:
+        """Paràmetres de construcció de la subinstància d'un component (amb la seva llavor)"""
+        parametres = dict(self._parametres, llavor=llavor)
+        parametres['necessitats'] = [self.necessitats[pos] for pos in posicions]
+        parametres['treballadors'] = {
+            self.ids_treballadors[idx]: self.treballadors_grup_t[self.ids_treballadors[idx]]
+            for idx in idxs
+        }
+        return parametres
+
+
+# ============= PROCESSOS TREBALLADORS =============
+
+# Còpia de l'AG de cada procés treballador. Es construeix un sol cop amb la instància
+# del problema (només lectura); després cada tasca només intercanvia cromosomes i scores
+_AG_PROCES: Optional[AlgorismeGenetic] = None
+
+# Avís de cancel·lació del procés principal (multiprocessing.Event compartit pel pool)
+_AVIS_PROCES = None
+
+
+def _inicialitza_avis(avis) -> None:
+    global _AVIS_PROCES
+    _AVIS_PROCES = avis
+
+
+def _inicialitza_proces(parametres: Dict, avis=None) -> None:
+    global _AG_PROCES
+    _inicialitza_avis(avis)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _AG_PROCES = AlgorismeGenetic(**parametres)
+    _AG_PROCES._cancel_lacio = avis
+
+
+def _produeix_fills_proces(parelles: List[Tuple[array, array, int]],
+                           prob_mut: float) -> Tuple[List[Tuple[array, Dict]], Tuple[int, int], Telemetria]:
+    ag = _AG_PROCES
+    fills = ag._produeix_lot(parelles, prob_mut)
+    return fills, ag._pren_comptadors_cache(), ag._pren_telemetria()
+
+
+def _nous_individus_proces(probs_mutacio: List[Tuple[float, int]],
+                           reparar: bool) -> Tuple[List[Tuple[array, Dict]], Tuple[int, int], Telemetria]:
+    ag = _AG_PROCES
+    individus = [ag._amb_llavor(llavor, ag._nou_individu, prob, reparar)
+                 for prob, llavor in ag._fins_cancel_lacio(probs_mutacio)]
+    return individus, ag._pren_comptadors_cache(), ag._pren_telemetria()
+
+
+def _inicia_illa_proces(llavor: int, pla_previ: Optional[array] = None,
+                        fraccio_pla: float = 0.5) -> Dict:
+    return _AG_PROCES._inicia_illa(llavor, pla_previ, fraccio_pla)
+
+
+def _evoluciona_illa_proces(illa: Dict, generacions: int,
+                            criteris: Optional[CriterisAturada] = None) -> Dict:
+    return _AG_PROCES._evoluciona_illa(illa, generacions, criteris)
+
+
+def _resol_component_proces(parametres: Dict, opcions: Dict,
+                            cancel_lacio=None) -> Tuple[List[Tuple[str, date, str]], Dict]:
+    """Resol la subinstància d'un component i en retorna les assignacions i el resum"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        ag = AlgorismeGenetic(**parametres)
+        solucio, resultat = ag.executa(cancel_lacio=cancel_lacio or _AVIS_PROCES, **opcions)
+    files = [(a.treballador_id, a.data, a.torn_id) for a in solucio]
+    resum = dict(ag.resum_execucio, necessitats=len(ag.necessitats),
+                 treballadors=len(ag.ids_treballadors), total=resultat['total'])
+    return files, resum
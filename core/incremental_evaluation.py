@@ -0,0 +1,423 @@
+# incremental_evaluation.py - AVALUACIÓ INCREMENTAL DE CROMOSOMES
+
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from core import constraints
+from core.data_structures import Assignacio
+from core.timeline import interval_assignacio
+
+
+@dataclass
+class InfoGen:
+    """Dades estàtiques d'un gen (necessitat, treballador) que fan servir les restriccions"""
+    assignacio: Assignacio
+    inici: int  # Minuts des de l'època
+    fi: int
+    dia: int  # Data com a ordinal
+    fora_grup_t: bool
+    descans: bool
+    formacio: bool
+    linia: bool
+    divendres: bool
+    canvi_zona: bool
+    canvi_torn: bool
+
+
+def viola_divendres(assignacio: Assignacio, treb) -> bool:
+    """Mateix criteri que restriccio_divendres_cap_setmana_rigida per a una assignació"""
+    d = assignacio.data
+    if d.weekday() != 4:
+        return False
+    if not (treb.te_descans(d.fromordinal(d.toordinal() + 1))
+            and treb.te_descans(d.fromordinal(d.toordinal() + 2))):
+        return False
+    hora_fi = assignacio.hora_fi
+    return (hora_fi < assignacio.hora_inici or hora_fi.hour > 22
+            or (hora_fi.hour == 22 and hora_fi.minute > 0))
+
+
+class AvaluadorIncremental:
+    """
+    Avaluació d'un cromosoma d'enters a partir d'agregats per treballador.
+
+    Reprodueix les restriccions de core/constraints.py (amb els mateixos pesos
+    del RestriccionManager) de manera que canviar un gen només recalcula els dos
+    treballadors afectats: el score total surt dels agregats en O(treballadors)
+    en lloc de reconstruir i avaluar totes les assignacions.
+    Si el gestor té restriccions que no es coneixen, `suporta` retorna False
+    i cal fer servir l'avaluació completa.
+    """
+
+    def __init__(self, ag):
+        self.ag = ag
+        self.num_treballadors = len(ag.ids_treballadors)
+        self.num_necessitats = len(ag.necessitats)
+        self._funcions = self._funcions_score()
+        self._violacions_rigides = {
+            constraints.restriccio_unica_assignacio_per_dia_rigida: lambda: self.duplicats + self.dies_ultima,
+            constraints.restriccio_sense_solapaments_rigida: lambda: self.total_solapa,
+            constraints.restriccio_descans_minim_12h_rigida: lambda: self.total_viola_12h,
+            constraints.restriccio_divendres_cap_setmana_rigida: lambda: self.divendres,
+        }
+
+        # Les restriccions indexen les necessitats per (servei, data): guanya l'última
+        self._necessitats_map = {(nec.servei, nec.data): nec for nec in ag.necessitats}
+        multiplicitat = {}
+        for nec in ag.necessitats:
+            clau = (nec.servei, nec.data)
+            multiplicitat[clau] = multiplicitat.get(clau, 0) + 1
+        self._multiplicitat = [multiplicitat[(nec.servei, nec.data)] for nec in ag.necessitats]
+        self._actives = set(ag.posicions_actives)
+
+        # Històric de cada treballador: última assignació i dies treballats
+        self._ultima = []
+        self._interval_ultima = []
+        self._dies_historic = []
+        for treb_id in ag.ids_treballadors:
+            historic = ag.estadistiques.historials.get(treb_id) if ag.estadistiques else None
+            ultima = historic.ultima_assignacio if historic else None
+            self._ultima.append(ultima)
+            self._interval_ultima.append(interval_assignacio(ultima) if ultima else None)
+            self._dies_historic.append(
+                frozenset(a.data.toordinal() for a in historic.assignacions_any) if historic else frozenset()
+            )
+
+        self._infos = {}
+        self.cromosoma = None
+
+    # ============= CONFIGURACIÓ =============
+
+    def _funcions_score(self) -> Dict:
+        return {
+            constraints.restriccio_grup_T: self._score_grup_t,
+            constraints.restriccio_sense_descans: self._score_sense_descans,
+            constraints.restriccio_formacio_requerida: self._score_formacio,
+            constraints.restriccio_linia_correcta: self._score_linia,
+            constraints.restriccio_hores_anuals: self._score_hores_anuals,
+            constraints.restriccio_unica_assignacio_per_dia_rigida: self._score_unica_per_dia,
+            constraints.restriccio_sense_solapaments_rigida: self._score_sense_solapaments,
+            constraints.restriccio_dies_consecutius: self._score_dies_consecutius,
+            constraints.restriccio_descans_minim_12h_rigida: self._score_descans_12h,
+            constraints.restriccio_divendres_cap_setmana_rigida: self._score_divendres,
+            constraints.restriccio_equitat_canvis_zona: self._score_equitat_zona,
+            constraints.restriccio_equitat_canvis_torn: self._score_equitat_torn,
+            constraints.restriccio_cobertura_completa: self._score_cobertura,
+            constraints.restriccio_distribucio_equilibrada: self._score_distribucio,
+        }
+
+    @staticmethod
+    def suporta(restriccions) -> bool:
+        """Indica si totes les restriccions del gestor tenen equivalent incremental"""
+        conegudes = {
+            constraints.restriccio_grup_T, constraints.restriccio_sense_descans,
+            constraints.restriccio_formacio_requerida, constraints.restriccio_linia_correcta,
+            constraints.restriccio_hores_anuals, constraints.restriccio_unica_assignacio_per_dia_rigida,
+            constraints.restriccio_sense_solapaments_rigida, constraints.restriccio_dies_consecutius,
+            constraints.restriccio_descans_minim_12h_rigida, constraints.restriccio_divendres_cap_setmana_rigida,
+            constraints.restriccio_equitat_canvis_zona, constraints.restriccio_equitat_canvis_torn,
+            constraints.restriccio_cobertura_completa, constraints.restriccio_distribucio_equilibrada,
+        }
+        return all(r['funcio'] in conegudes for r in restriccions.restriccions)
+
+    def info_gen(self, pos: int, idx: int) -> Optional[InfoGen]:
+        """Dades estàtiques del gen (necessitat `pos`, treballador `idx`); None si no té horari"""
+        clau = (pos, idx)
+        if clau not in self._infos:
+            assignacio = self.ag.assignacio(pos, idx)
+            info = None
+            if assignacio is not None:
+                treb = self.ag.treballadors_grup_t[self.ag.ids_treballadors[idx]]
+                nec = self._necessitats_map.get((assignacio.torn_id, assignacio.data))
+                inici, fi = interval_assignacio(assignacio)
+                info = InfoGen(
+                    assignacio=assignacio,
+                    inici=inici,
+                    fi=fi,
+                    dia=assignacio.data.toordinal(),
+                    fora_grup_t=treb.grup != 'T',
+                    descans=treb.te_descans(assignacio.data),
+                    formacio=nec is not None and nec.formacio not in treb.habilitacions,
+                    linia=nec is not None and treb.linia != nec.linia,
+                    divendres=viola_divendres(assignacio, treb),
+                    canvi_zona=nec is not None and treb.es_canvi_zona(nec.zona),
+                    canvi_torn=nec is not None and treb.es_canvi_torn(nec.torn)
+                )
+            self._infos[clau] = info
+        return self._infos[clau]
+
+    def ultima_historic(self, idx: int) -> Optional[Assignacio]:
+        """Última assignació de l'històric del treballador `idx` (None si no en té)"""
+        return self._ultima[idx]
+
+    def interval_ultima_historic(self, idx: int) -> Optional[Tuple[int, int]]:
+        """Interval (minuts des de l'època) de l'última assignació de l'històric"""
+        return self._interval_ultima[idx]
+
+    def dies_historic(self, idx: int) -> FrozenSet[int]:
+        """Dies (ordinals) que el treballador `idx` ha treballat segons l'històric"""
+        return self._dies_historic[idx]
+
+    # ============= ESTAT =============
+
+    def carrega(self, cromosoma: array) -> 'AvaluadorIncremental':
+        """Inicialitza els agregats a partir d'un cromosoma (se'n fa una còpia)"""
+        n = self.num_treballadors
+        self.cromosoma = array('i', cromosoma)
+        self.assignacions = 0
+        self.fora_grup_t = self.descans = self.formacio = self.linia = self.divendres = 0
+        self.duplicats = 0  # Assignacions de més en un mateix treballador-dia
+        self.duplicats_actius = 0  # Ídem només entre posicions actives (validesa)
+        self.dies_ultima = 0  # Assignacions el mateix dia que l'última de l'històric
+        self.cobertes = 0  # Necessitats (amb repeticions) cobertes
+        self.actives_cobertes = 0
+
+        self.num = [0] * n
+        self.hores = [0.0] * n
+        self.canvis_zona = [0] * n
+        self.canvis_torn = [0] * n
+        self.gens = [set() for _ in range(n)]
+        self.dies = [{} for _ in range(n)]
+        self.dies_actius = [{} for _ in range(n)]
+
+        self.viola_12h = [False] * n
+        self.solapa = [False] * n
+        self.exces_consecutius = [0] * n
+        self.total_viola_12h = self.total_solapa = self.total_exces = 0
+
+        for pos, idx in enumerate(self.cromosoma):
+            if idx >= 0:
+                self._compta(pos, idx, 1)
+        for idx in range(n):
+            if self.num[idx]:
+                self._recalcula_treballador(idx)
+        return self
+
+    def canvia(self, pos: int, nou: int) -> None:
+        """Assigna la necessitat `pos` al treballador `nou` (-1 = descoberta)"""
+        vell = self.cromosoma[pos]
+        if vell == nou:
+            return
+        if vell >= 0:
+            self._compta(pos, vell, -1)
+        self.cromosoma[pos] = nou
+        if nou >= 0:
+            self._compta(pos, nou, 1)
+        if vell >= 0:
+            self._recalcula_treballador(vell)
+        if nou >= 0:
+            self._recalcula_treballador(nou)
+
+    def _compta(self, pos: int, idx: int, signe: int) -> None:
+        if pos in self._actives:
+            self.actives_cobertes += signe
+            self.duplicats_actius += self._compta_dia(
+                self.dies_actius[idx], self.ag.necessitats[pos].data.toordinal(), signe
+            )
+        info = self.info_gen(pos, idx)
+        if info is None:
+            return
+
+        self.assignacions += signe
+        self.fora_grup_t += signe * info.fora_grup_t
+        self.descans += signe * info.descans
+        self.formacio += signe * info.formacio
+        self.linia += signe * info.linia
+        self.divendres += signe * info.divendres
+        self.cobertes += signe * self._multiplicitat[pos]
+
+        self.num[idx] += signe
+        self.hores[idx] += signe * info.assignacio.durada_hores
+        self.canvis_zona[idx] += signe * info.canvi_zona
+        self.canvis_torn[idx] += signe * info.canvi_torn
+        if signe > 0:
+            self.gens[idx].add(pos)
+        else:
+            self.gens[idx].discard(pos)
+
+        self.duplicats += self._compta_dia(self.dies[idx], info.dia, signe)
+        ultima = self._ultima[idx]
+        if ultima is not None and ultima.data.toordinal() == info.dia:
+            self.dies_ultima += signe
+
+    @staticmethod
+    def _compta_dia(dies: Dict[int, int], dia: int, signe: int) -> int:
+        """Actualitza el comptador d'un dia i retorna la variació de duplicats"""
+        abans = dies.get(dia, 0)
+        dies[dia] = abans + signe
+        return max(0, abans + signe - 1) - max(0, abans - 1)
+
+    def _recalcula_treballador(self, idx: int) -> None:
+        """Recalcula descans de 12h, solapaments i dies consecutius d'un treballador"""
+        infos = [self.info_gen(pos, idx) for pos in sorted(self.gens[idx])]
+        ultima = self._interval_ultima[idx]
+
+        viola_12h = solapa = False
+        exces = 0
+        if infos:
+            # Descans de 12h entre assignacions consecutives (última de l'històric inclosa)
+            intervals = ([ultima] if ultima else []) + [(i.inici, i.fi) for i in infos]
+            intervals.sort(key=lambda x: x[0])
+            viola_12h = any(b[0] - a[1] < 720 for a, b in zip(intervals, intervals[1:]))
+
+            # Solapaments dins del mateix dia
+            per_dia = {}
+            for info in infos:
+                per_dia.setdefault(info.dia, []).append((info.inici, info.fi))
+            if ultima:
+                dia_ultima = self._ultima[idx].data.toordinal()
+                if dia_ultima in per_dia:
+                    per_dia[dia_ultima].insert(0, ultima)
+            for llista in per_dia.values():
+                if len(llista) < 2:
+                    continue
+                llista.sort(key=lambda x: x[0])
+                if any(b[0] < a[1] for a, b in zip(llista, llista[1:])):
+                    solapa = True
+                    break
+
+            # Màxim de dies consecutius (històric inclòs)
+            dies = sorted({d for d, n in self.dies[idx].items() if n} | self._dies_historic[idx])
+            consecutius = maxim = 1
+            for anterior, actual in zip(dies, dies[1:]):
+                if actual - anterior == 1:
+                    consecutius += 1
+                    maxim = max(maxim, consecutius)
+                else:
+                    consecutius = 1
+            exces = max(0, maxim - 9)
+
+        self.total_viola_12h += viola_12h - self.viola_12h[idx]
+        self.total_solapa += solapa - self.solapa[idx]
+        self.total_exces += exces - self.exces_consecutius[idx]
+        self.viola_12h[idx] = viola_12h
+        self.solapa[idx] = solapa
+        self.exces_consecutius[idx] = exces
+
+    # ============= SCORES =============
+
+    def _proporcio_correctes(self, violacions: int) -> float:
+        if self.assignacions == 0:
+            return 100
+        return 100 * (1 - violacions / self.assignacions)
+
+    def _score_grup_t(self) -> float:
+        return self._proporcio_correctes(self.fora_grup_t)
+
+    def _score_sense_descans(self) -> float:
+        return self._proporcio_correctes(self.descans)
+
+    def _score_formacio(self) -> float:
+        return self._proporcio_correctes(self.formacio)
+
+    def _score_linia(self) -> float:
+        return self._proporcio_correctes(self.linia)
+
+    def _score_hores_anuals(self) -> float:
+        violacions = dins_estandard = total = 0
+        for idx, num in enumerate(self.num):
+            if not num:
+                continue
+            total += 1
+            treb = self.ag.treballadors_grup_t[self.ag.ids_treballadors[idx]]
+            hores_totals = treb.hores_anuals_realitzades + self.hores[idx]
+            if hores_totals > treb.max_hores_ampliables:
+                violacions += 1
+            elif hores_totals <= treb.max_hores_anuals:
+                dins_estandard += 1
+        if total == 0:
+            return 100
+        return min(100, 100 * (1 - violacions / total) + (dins_estandard / total) * 10)
+
+    def _score_unica_per_dia(self) -> float:
+        return 0 if self.duplicats or self.dies_ultima else 100
+
+    def _score_sense_solapaments(self) -> float:
+        return 0 if self.total_solapa else 100
+
+    def _score_dies_consecutius(self) -> float:
+        total = sum(1 for num in self.num if num)
+        if total == 0:
+            return 100
+        return max(0, 100 - (self.total_exces / (total * 5) * 100))
+
+    def _score_descans_12h(self) -> float:
+        return 0 if self.total_viola_12h else 100
+
+    def _score_divendres(self) -> float:
+        return 0 if self.divendres else 100
+
+    def _score_equitat(self, canvis: List[int], historic: str) -> float:
+        valors = [
+            c + getattr(self.ag.treballadors_grup_t[self.ag.ids_treballadors[idx]], historic)
+            for idx, c in enumerate(canvis) if c
+        ]
+        if not valors:
+            return 100
+        mitjana = sum(valors) / len(valors)
+        variancia = sum((v - mitjana) ** 2 for v in valors) / len(valors)
+        return max(0, 100 - (variancia ** 0.5 / 3 * 100))
+
+    def _score_equitat_zona(self) -> float:
+        return self._score_equitat(self.canvis_zona, 'canvis_zona')
+
+    def _score_equitat_torn(self) -> float:
+        return self._score_equitat(self.canvis_torn, 'canvis_torn')
+
+    def _score_cobertura(self) -> float:
+        if self.num_necessitats == 0:
+            return 100
+        return 100 * (self.cobertes / self.num_necessitats)
+
+    def _score_distribucio(self) -> float:
+        valors = [num for num in self.num if num]
+        if not valors:
+            return 100
+        mitjana = sum(valors) / len(valors)
+        desviacio = sum(abs(v - mitjana) for v in valors) / len(valors)
+        return max(0, 100 - (desviacio * 10))
+
+    def total(self) -> float:
+        """Score total ponderat, com RestriccionManager.evalua_solucio"""
+        score_total = 0
+        for restriccio in self.ag.restriccions.restriccions:
+            score_total += self._funcions[restriccio['funcio']]() * restriccio['pes']
+        return score_total
+
+    def nivells(self) -> Tuple[float, float]:
+        """
+        Score en dos nivells per comparar lexicogràficament: (- violacions de les
+        restriccions rígides, score ponderat de les restriccions de pes finit amb la
+        validesa). Amb pesos infinits el total és inf o nan, i els scores rígids són
+        tot o res: comptar les violacions guia la cerca cap a solucions vàlides
+        """
+        violacions = 0
+        toves = 0
+        for restriccio in self.ag.restriccions.restriccions:
+            violacions += self._violacions_rigides.get(restriccio['funcio'], lambda: 0)()
+            if not math.isinf(restriccio['pes']):
+                toves += self._funcions[restriccio['funcio']]() * restriccio['pes']
+        return -violacions, toves - self.validesa() * 0.05
+
+    def validesa(self) -> float:
+        """Penalització de validesa, com evalua_validesa_cromosoma"""
+        return self.duplicats_actius * 50.0 + (self.num_necessitats - self.actives_cobertes) * 20.0
+
+    def puntuacio(self) -> float:
+        """Score total amb la penalització de validesa integrada, com puntua"""
+        return self.total() - self.validesa() * 0.05
+
+    def prova(self, canvis: List[Tuple[int, int]]) -> float:
+        """
+        Puntuació després d'aplicar els canvis (pos, treballador). Els canvis es
+        queden aplicats: si no interessen, cal desfer-los amb `desfes`
+        """
+        for pos, nou in canvis:
+            self.canvia(pos, nou)
+        return self.puntuacio()
+
+    def desfes(self, canvis_inversos: List[Tuple[int, int]]) -> None:
+        for pos, vell in canvis_inversos:
+            self.canvia(pos, vell)
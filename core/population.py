@@ -0,0 +1,93 @@
+# population.py - POBLACIÓ COM A ESTRUCTURA DE VECTORS
+
+import heapq
+import random
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+Parella = Tuple[Any, Dict]  # (individu, resultat)
+
+
+class Poblacio:
+    """
+    Població guardada en vectors paral·lels: individus, resultats i els scores
+    totals en un array('d') contigu. La selecció (millors, pitjors, torneigs)
+    treballa amb índexs sobre `scores` sense tocar els diccionaris de resultat,
+    i els individus es substitueixen al seu lloc.
+
+    Es recorre com una seqüència de parelles (individu, resultat), igual que
+    les llistes que fan servir els checkpoints i les illes.
+    """
+
+    __slots__ = ('individus', 'resultats', 'scores')
+
+    def __init__(self, parelles: Iterable[Parella] = ()):
+        self.individus = []
+        self.resultats = []
+        self.scores = array('d')
+        self.amplia(parelles)
+
+    def __len__(self) -> int:
+        return len(self.individus)
+
+    def __iter__(self) -> Iterator[Parella]:
+        return zip(self.individus, self.resultats)
+
+    def __getitem__(self, i: int) -> Parella:
+        return self.individus[i], self.resultats[i]
+
+    def afegeix(self, individu, resultat: Dict) -> None:
+        self.individus.append(individu)
+        self.resultats.append(resultat)
+        self.scores.append(resultat['total'])
+
+    def amplia(self, parelles: Iterable[Parella]) -> None:
+        for individu, resultat in parelles:
+            self.afegeix(individu, resultat)
+
+    def substitueix(self, i: int, individu, resultat: Dict) -> None:
+        self.individus[i] = individu
+        self.resultats[i] = resultat
+        self.scores[i] = resultat['total']
+
+    def parelles(self) -> List[Parella]:
+        return list(zip(self.individus, self.resultats))
+
+    def index_millor(self) -> int:
+        millor = max(self.scores)
+        # Un NaN només guanya si és el primer (com max amb clau): llavors és l'índex 0
+        return self.scores.index(millor) if millor == millor else 0
+
+    def millor(self) -> Parella:
+        return self[self.index_millor()]
+
+    def millors(self, k: int) -> List[int]:
+        """Índexs dels `k` millors, de millor a pitjor (a igualtat, el primer), en O(n log k)"""
+        return heapq.nlargest(k, range(len(self.scores)), key=self.scores.__getitem__)
+
+    def pitjors(self, k: int) -> List[int]:
+        """Índexs dels `k` pitjors, de pitjor a millor"""
+        return heapq.nsmallest(k, range(len(self.scores)), key=self.scores.__getitem__)
+
+    def torneigs(self, rng: random.Random, num: int, mida: int = 3) -> List[int]:
+        """
+        Índexs dels guanyadors de `num` torneigs de `mida` individus diferents
+        (a igualtat, guanya el primer sortejat)
+        """
+        scores = self.scores
+        n = len(scores)
+        mida = min(mida, n)
+        aleatori = rng.random
+        guanyadors = []
+        for _ in range(num):
+            millor = int(aleatori() * n)
+            sortejats = [millor]
+            while len(sortejats) < mida:
+                i = int(aleatori() * n)
+                if i in sortejats:
+                    continue
+                sortejats.append(i)
+                if scores[i] > scores[millor]:
+                    millor = i
+            guanyadors.append(millor)
+        return guanyadors
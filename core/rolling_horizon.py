@@ -0,0 +1,191 @@
+# rolling_horizon.py - PLANIFICACIÓ PER FINESTRES SOLAPADES (HORITZÓ MÒBIL)
+
+import copy
+import random
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.data_structures import (
+    Assignacio, Treballador, Torn, NecessitatCobertura, DiaCalendari, EstadistiquesGlobals
+)
+from core.constraints import RestriccionManager
+from core.genetic_algorithm import AlgorismeGenetic
+
+
+class PlanificadorHoritzoMobil:
+    """
+    Resol períodes llargs com una seqüència de finestres solapades
+    (p. ex. 4 setmanes amb 1 de solapament).
+
+    De cada finestra es fixen els dies anteriors al solapament i s'incorporen
+    a l'estat de partida de la següent: històric (descans de 12h, dies
+    consecutius, últim torn), hores anuals i canvis de zona/torn. Els dies del
+    solapament es tornen a resoldre a la finestra següent, sembrant-la amb el
+    resultat anterior, de manera que cada AG només veu una finestra i el temps
+    creix linealment amb la durada del període.
+    """
+
+    def __init__(self, treballadors: Dict[str, Treballador],
+                 torns: Dict[str, Torn],
+                 necessitats: List[NecessitatCobertura],
+                 calendari: Dict[date, DiaCalendari],
+                 restriccions: RestriccionManager,
+                 estadistiques: EstadistiquesGlobals,
+                 dies_finestra: int = 28,
+                 dies_solapament: int = 7,
+                 **parametres_ag):
+        if dies_solapament < 0 or dies_finestra <= dies_solapament:
+            raise ValueError("La finestra ha de ser més llarga que el solapament")
+
+        self.treballadors = treballadors
+        self.torns = torns
+        self.necessitats = necessitats
+        self.calendari = calendari
+        self.restriccions = restriccions
+        self.estadistiques = estadistiques
+        self.dies_finestra = dies_finestra
+        self.dies_solapament = dies_solapament
+        self.parametres_ag = parametres_ag  # mida_poblacio, exclude_map, construccio...
+
+        self.resum_execucio = {}
+
+    def finestres(self, data_inici: date, data_fi: date) -> List[Tuple[date, date, date]]:
+        """Finestres (inici, fi, últim dia que es fixa) que cobreixen [data_inici, data_fi]"""
+        avanc = self.dies_finestra - self.dies_solapament
+        finestres = []
+        inici = data_inici
+        while inici <= data_fi:
+            fi = min(inici + timedelta(days=self.dies_finestra - 1), data_fi)
+            fixa_fins = fi if fi == data_fi else inici + timedelta(days=avanc - 1)
+            finestres.append((inici, fi, fixa_fins))
+            inici += timedelta(days=avanc)
+            if fi == data_fi:
+                break
+        return finestres
+
+    def executa(self, data_inici: date, data_fi: date,
+                verbose: bool = True,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                temps_maxim: Optional[float] = None,
+                pla_previ: Optional[List[Tuple[str, date, str]]] = None,
+                **opcions_execucio) -> Tuple[List[Assignacio], Dict]:
+        """
+        Resol el període finestra a finestra.
+
+        Args:
+            data_inici, data_fi: Període complet
+            progress_callback: Es crida amb (finestres fetes, total de finestres)
+            temps_maxim: Temps total en segons; cada finestra rep la part proporcional
+                del que queda
+            pla_previ: Pla existent (treballador_id, data, servei) per sembrar els dies
+                nous de cada finestra (els del solapament surten de la finestra anterior)
+            **opcions_execucio: Arguments d'AlgorismeGenetic.executa per a cada finestra
+                (generacions, processos, criteris d'aturada...). Amb `cancel_lacio`, la
+                finestra en curs es fixa sencera i no se'n resolen més
+
+        Returns:
+            (assignacions de tot el període, avaluació del pla complet respecte de l'estat
+            de partida, amb el resum de cada finestra a 'finestres')
+        """
+        finestres = self.finestres(data_inici, data_fi)
+        # L'estat de partida es consolida sobre còpies: els treballadors i les
+        # estadístiques del cridador queden intactes per a altres execucions
+        treballadors, estadistiques = copy.deepcopy((self.treballadors, self.estadistiques))
+        cancel_lacio = opcions_execucio.get('cancel_lacio')
+        # Cada finestra rep la seva llavor del flux del planificador (reproduïble amb `llavor`)
+        rng = random.Random(self.parametres_ag.get('llavor'))
+        limit_temps = time.time() + temps_maxim if temps_maxim else None
+        fixades = []
+        pendents = []  # Assignacions del solapament: sembren la finestra següent
+        resums = []
+        encerts = errades = 0
+        temps = 0.0
+
+        for num, (inici, fi, fixa_fins) in enumerate(finestres, 1):
+            necessitats = [n for n in self.necessitats if inici <= n.data <= fi]
+            if verbose:
+                print(f"\n   ▶ Finestra {num}/{len(finestres)}: {inici} - {fi} "
+                      f"({len(necessitats)} necessitats)")
+
+            if necessitats:
+                ag = AlgorismeGenetic(
+                    treballadors=treballadors,
+                    torns=self.torns,
+                    necessitats=necessitats,
+                    calendari=self.calendari,
+                    restriccions=self.restriccions,
+                    estadistiques=estadistiques,
+                    **dict(self.parametres_ag, llavor=rng.getrandbits(32))
+                )
+                llavor = [(a.treballador_id, a.data, a.torn_id) for a in pendents]
+                if pla_previ:
+                    cobertes = {(a.torn_id, a.data) for a in pendents}
+                    llavor.extend(
+                        fila for fila in pla_previ
+                        if inici <= fila[1] <= fi and (fila[2], fila[1]) not in cobertes
+                    )
+                if limit_temps is not None:
+                    restants = len(finestres) - num + 1
+                    opcions_execucio['temps_maxim'] = max(limit_temps - time.time(), 0.0) / restants
+                solucio, info = ag.executa(
+                    verbose=verbose, pla_previ=llavor or None, **opcions_execucio
+                )
+
+                resum = dict(ag.resum_execucio)
+                resum.update({'inici': inici, 'fi': fi, 'total': info['total']})
+                resums.append(resum)
+                encerts += resum.get('cache_encerts', 0)
+                errades += resum.get('cache_errades', 0)
+                temps += resum.get('temps_execucio', 0.0)
+            else:
+                solucio = []
+
+            cancel_lada = cancel_lacio is not None and cancel_lacio.is_set()
+            if cancel_lada:
+                fixa_fins = fi
+            fixar = sorted((a for a in solucio if a.data <= fixa_fins), key=lambda a: a.data)
+            pendents = [a for a in solucio if a.data > fixa_fins]
+            self._consolida(fixar, treballadors, estadistiques)
+            fixades.extend(fixar)
+
+            if progress_callback:
+                progress_callback(num, len(finestres))
+            if cancel_lada:
+                break
+
+        self.resum_execucio = {
+            'finestres': len(finestres),
+            'temps_execucio': temps,
+            'cache_encerts': encerts,
+            'cache_errades': errades,
+            'cache_taxa_encerts': encerts / (encerts + errades) if encerts + errades else 0.0
+        }
+        # Les restriccions d'equitat són globals: el pla consolidat s'avalua sencer respecte
+        # de l'estat de partida (en una còpia de les estadístiques, on l'avaluació crea els
+        # històrics que falten)
+        info = self.restriccions.evalua_solucio(
+            fixades, self.treballadors, self.torns,
+            self.necessitats, self.calendari, copy.deepcopy(self.estadistiques)
+        )
+        info['finestres'] = resums
+        return fixades, info
+
+    @staticmethod
+    def _consolida(assignacions: List[Assignacio],
+                   treballadors: Dict[str, Treballador],
+                   estadistiques: EstadistiquesGlobals) -> None:
+        """
+        Incorpora les assignacions fixades (en ordre cronològic) a l'estat de partida:
+        històric, hores anuals i canvis de zona/torn del treballador
+        """
+        for assignacio in assignacions:
+            estadistiques.get_historic(assignacio.treballador_id).afegir_assignacio(assignacio)
+            treballador = treballadors.get(assignacio.treballador_id)
+            if treballador is None:
+                continue
+            treballador.hores_anuals_realitzades += assignacio.durada_hores
+            if assignacio.es_canvi_zona:
+                treballador.canvis_zona += 1
+            if assignacio.es_canvi_torn:
+                treballador.canvis_torn += 1
@@ -0,0 +1,136 @@
+# simulated_annealing.py - MOTOR DE RECUIT SIMULAT
+
+import math
+from array import array
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.data_structures import Assignacio
+from core.single_solution import MotorSolucioUnica, Nivells
+from core.stopping import CriterisAturada
+
+# Màxim d'iteracions entre comprovacions d'aturada (cancel·lació, temps...)
+MIDA_BLOC_MAXIMA = 200
+
+
+class RecuitSimulat(MotorSolucioUnica):
+    """
+    Recuit simulat sobre una sola solució, amb refredament geomètric.
+
+    Pensat per a replanificacions curtes (una o dues setmanes), on moviments
+    incrementals barats són més ràpids que una població sencera, i com a
+    referència per comparar l'AG. Un moviment que augmenta les violacions de
+    restriccions rígides es rebutja sempre; la resta s'accepten segons Metropolis.
+    Els criteris d'aturada reben el nivell tou menys les violacions rígides.
+    """
+
+    def __init__(self, *args,
+                 temperatura_inicial: Optional[float] = None,
+                 fraccio_temperatura_final: float = 1e-3,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        # temperatura_inicial None: s'estima a partir de mostres de moviments
+        self.temperatura_inicial = temperatura_inicial
+        self.fraccio_temperatura_final = fraccio_temperatura_final
+
+    def executa(self, iteracions: int = 20000,
+                verbose: bool = True,
+                temps_maxim: Optional[float] = None,
+                score_objectiu: Optional[float] = None,
+                generacions_estancament: Optional[int] = None,
+                epsilon_millora: float = 0.0,
+                pla_previ: Optional[List[Tuple[str, date, str]]] = None,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                cancel_lacio=None) -> Tuple[List[Assignacio], Dict]:
+        """
+        Executa el recuit simulat.
+
+        Args:
+            iteracions: Moviments que es proven (el refredament s'hi ajusta)
+            temps_maxim, score_objectiu, epsilon_millora: Com a AlgorismeGenetic.executa
+            generacions_estancament: S'atura després de N blocs d'iteracions sense millora
+                (un bloc = tantes iteracions com necessitats, fins a MIDA_BLOC_MAXIMA)
+            pla_previ: Pla existent (treballador_id, data, servei) des del qual es comença
+            progress_callback: Es crida amb (iteracions fetes, iteracions totals) a cada bloc
+            cancel_lacio: Com a AlgorismeGenetic.executa; es torna la millor solució trobada
+        """
+        self.resum_execucio = {}
+        criteris = CriterisAturada(temps_maxim, score_objectiu, generacions_estancament,
+                                   epsilon_millora, cancel_lacio)
+
+        avaluador = self.avaluador.carrega(self.solucio_inicial(pla_previ, verbose))
+        cromosoma = avaluador.cromosoma
+        actual = avaluador.nivells()
+        millor, millor_cromosoma = actual, array('i', cromosoma)
+
+        temperatura = self.temperatura_inicial or self._estima_temperatura(cromosoma, actual)
+        refredament = self.fraccio_temperatura_final ** (1 / max(iteracions, 1))
+        mida_bloc = max(min(len(self.posicions), MIDA_BLOC_MAXIMA), 1)
+        acceptats = fetes = 0
+
+        if verbose:
+            print(f"\n   Recuit simulat: {iteracions} iteracions, T0 = {temperatura:.3f}")
+            print(f"   Score inicial: {sum(actual):.2f}")
+
+        if self.posicions:
+            for fetes in range(1, iteracions + 1):
+                canvis = self.moviment_aleatori(cromosoma)
+                if canvis:
+                    inversos = self.inversos(cromosoma, canvis)
+                    for pos, idx in canvis:
+                        avaluador.canvia(pos, idx)
+                    nou = avaluador.nivells()
+                    if self._accepta(actual, nou, temperatura):
+                        actual = nou
+                        acceptats += 1
+                        if actual > millor:
+                            millor, millor_cromosoma = actual, array('i', cromosoma)
+                    else:
+                        avaluador.desfes(inversos)
+                temperatura *= refredament
+
+                if fetes % mida_bloc == 0 or fetes == iteracions:
+                    if progress_callback:
+                        progress_callback(fetes, iteracions)
+                    if criteris.comprova(sum(millor)):
+                        break
+
+        self.resum_execucio.update(criteris.resum())
+        self.resum_execucio.update({
+            'iteracions': fetes,
+            'moviments_acceptats': acceptats
+        })
+
+        assignacions, resultat = self.resultat(millor_cromosoma)
+        if verbose:
+            print("\n   ✓ Recuit simulat finalitzat!")
+            print(f"   → Aturada: {self.resum_execucio['motiu_aturada']} després de {fetes} iteracions "
+                  f"({self.resum_execucio['temps_execucio']:.1f} s)")
+            print(f"   → Millor score final: {resultat['total']:.2f}")
+            print(f"   → Assignacions finals: {len(assignacions)}/{len(self.necessitats)}")
+        return assignacions, resultat
+
+    def _accepta(self, actual: Nivells, nou: Nivells, temperatura: float) -> bool:
+        """Criteri de Metropolis sobre el nivell tou; les violacions rígides no poden augmentar"""
+        if nou[0] != actual[0]:
+            return nou[0] > actual[0]
+        delta = nou[1] - actual[1]
+        return delta >= 0 or self.rng.random() < math.exp(delta / temperatura)
+
+    def _estima_temperatura(self, cromosoma: array, actual: Nivells, mostres: int = 200) -> float:
+        """Temperatura a la qual un empitjorament mitjà s'accepta amb probabilitat 0.8"""
+        empitjoraments = []
+        for _ in range(mostres if self.posicions else 0):
+            canvis = self.moviment_aleatori(cromosoma)
+            if not canvis:
+                continue
+            inversos = self.inversos(cromosoma, canvis)
+            for pos, idx in canvis:
+                self.avaluador.canvia(pos, idx)
+            nou = self.avaluador.nivells()
+            if nou[0] == actual[0] and nou[1] < actual[1]:
+                empitjoraments.append(actual[1] - nou[1])
+            self.avaluador.desfes(inversos)
+        if not empitjoraments:
+            return 1.0
+        return (sum(empitjoraments) / len(empitjoraments)) / -math.log(0.8)
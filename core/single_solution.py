@@ -0,0 +1,92 @@
+# single_solution.py - BASE DELS MOTORS DE SOLUCIÓ ÚNICA
+
+from array import array
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from core.data_structures import (
+    Assignacio, Treballador, Torn, NecessitatCobertura, EstadistiquesGlobals
+)
+from core.constraints import RestriccionManager
+from core.genetic_algorithm import AlgorismeGenetic
+from core.incremental_evaluation import AvaluadorIncremental
+
+# Nivells de score (restriccions de pes infinit, resta): es comparen lexicogràficament
+Nivells = Tuple[float, float]
+
+
+class MotorSolucioUnica:
+    """
+    Base dels motors que milloren una sola solució (recuit simulat, cerca tabú).
+
+    Comparteixen el model del problema de l'AG (elegibilitat, cromosoma d'enters,
+    reparació, pla previ) i el mateix RestriccionManager: els moviments s'avaluen
+    amb l'AvaluadorIncremental i el resultat final amb l'avaluació completa, en el
+    mateix format que AlgorismeGenetic.executa.
+    """
+
+    def __init__(self, treballadors: Dict[str, Treballador],
+                 torns: Dict[str, Torn],
+                 necessitats: List[NecessitatCobertura],
+                 calendari: Dict,
+                 restriccions: RestriccionManager,
+                 estadistiques: EstadistiquesGlobals,
+                 exclude_map: Dict = None,
+                 assignacions_forcades: Dict[Tuple[str, date], str] = None,
+                 llavor: Optional[int] = None):
+        if not AvaluadorIncremental.suporta(restriccions):
+            raise ValueError("Els motors de solució única només admeten les restriccions predefinides")
+
+        self.model = AlgorismeGenetic(
+            treballadors=treballadors,
+            torns=torns,
+            necessitats=necessitats,
+            calendari=calendari,
+            restriccions=restriccions,
+            estadistiques=estadistiques,
+            mida_poblacio=1,
+            exclude_map=exclude_map,
+            mida_cache=0,
+            assignacions_forcades=assignacions_forcades,
+            llavor=llavor
+        )
+        self.necessitats = necessitats
+        self.avaluador = AvaluadorIncremental(self.model)
+        self.posicions = self.model.posicions_cerca_local
+        # Mateix flux que el model: els moviments del model i del motor en depenen
+        self.rng = self.model.rng
+
+        self.resum_execucio = {}
+
+    def solucio_inicial(self, pla_previ: Optional[List[Tuple[str, date, str]]] = None,
+                        verbose: bool = True) -> array:
+        """El pla previ reparat si n'hi ha; si no, una solució constructiva aleatòria"""
+        cromosoma = self.model.prepara_pla_previ(pla_previ, verbose)
+        if 'necessitats_pla_previ' in self.model.resum_execucio:
+            self.resum_execucio['necessitats_pla_previ'] = self.model.resum_execucio['necessitats_pla_previ']
+        if cromosoma is None:
+            cromosoma = self.model.genera_cromosoma_aleatori()
+        return cromosoma
+
+    def moviment_aleatori(self, cromosoma: array, prob_descobrir: float = 0.05) -> List[Tuple[int, int]]:
+        """
+        Canvis (posició, treballador) d'un moviment aleatori: reassignació a un altre
+        elegible, intercanvi entre dues necessitats o, amb `prob_descobrir`, deixar
+        una necessitat descoberta
+        """
+        pos = self.rng.choice(self.posicions)
+        atzar = self.rng.random()
+        if atzar < prob_descobrir:
+            return [(pos, -1)] if cromosoma[pos] >= 0 else []
+        if atzar < (1 + prob_descobrir) / 2:
+            return self.model.moviment_reassignacio(cromosoma, pos)
+        return self.model.moviment_intercanvi(cromosoma, pos)
+
+    @staticmethod
+    def inversos(cromosoma: array, canvis: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Canvis que desfan `canvis` (calculats abans d'aplicar-los)"""
+        return [(pos, cromosoma[pos]) for pos, _ in reversed(canvis)]
+
+    def resultat(self, cromosoma: array) -> Tuple[List[Assignacio], Dict]:
+        """Assignacions i resultat amb l'avaluació completa (detall per restricció)"""
+        return self.model.descodifica(cromosoma), self.model.puntua(cromosoma)
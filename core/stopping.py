@@ -0,0 +1,98 @@
+# stopping.py - CRITERIS D'ATURADA DE LES EXECUCIONS
+
+import time
+from typing import Dict, Optional
+
+# Motius d'aturada
+MOTIU_GENERACIONS = 'generacions'
+MOTIU_TEMPS = 'temps_maxim'
+MOTIU_OBJECTIU = 'score_objectiu'
+MOTIU_ESTANCAMENT = 'estancament'
+MOTIU_CANCEL_LACIO = 'cancel_lacio'
+
+
+class CriterisAturada:
+    """
+    Criteris per aturar una execució abans d'esgotar les generacions:
+    temps màxim de rellotge, score objectiu i estancament (N generacions
+    seguides sense millorar el millor score en més de `epsilon_millora`).
+
+    Es crida `comprova` un cop per generació amb el millor score global;
+    quan un criteri es compleix, `motiu` queda fixat i es retorna.
+    La `cancel_lacio` (un threading.Event o similar) s'activa des de fora i
+    els bucles la consulten amb `cancel_lada` sense esperar el final de la generació.
+    """
+
+    def __init__(self, temps_maxim: Optional[float] = None,
+                 score_objectiu: Optional[float] = None,
+                 generacions_estancament: Optional[int] = None,
+                 epsilon_millora: float = 0.0,
+                 cancel_lacio=None):
+        self.temps_maxim = temps_maxim
+        self.score_objectiu = score_objectiu
+        self.generacions_estancament = generacions_estancament
+        self.epsilon_millora = epsilon_millora
+        self.cancel_lacio = cancel_lacio
+
+        # Rellotge de paret (comparable entre processos)
+        self.inici = time.time()
+        self.limit_temps = self.inici + temps_maxim if temps_maxim is not None else None
+
+        self.motiu = None
+        self.generacions = 0
+        self.historial = []
+        self._referencia = None
+        self._estancades = 0
+
+    def per_illa(self) -> 'CriterisAturada':
+        """
+        Còpia per a una illa: comparteix el límit de temps i l'objectiu, però
+        l'estancament només es valora globalment. La cancel·lació no es copia (les
+        illes la reben pel procés treballador)
+        """
+        criteris = CriterisAturada(score_objectiu=self.score_objectiu)
+        criteris.inici = self.inici
+        criteris.limit_temps = self.limit_temps
+        return criteris
+
+    def cancel_lada(self) -> bool:
+        """Indica si s'ha demanat la cancel·lació (i en aquest cas en fixa el motiu)"""
+        if self.cancel_lacio is not None and self.cancel_lacio.is_set():
+            self.motiu = MOTIU_CANCEL_LACIO
+            return True
+        return False
+
+    def temps_esgotat(self) -> bool:
+        return self.limit_temps is not None and time.time() >= self.limit_temps
+
+    def temps_transcorregut(self) -> float:
+        return time.time() - self.inici
+
+    def comprova(self, millor: float) -> Optional[str]:
+        """Registra el millor score d'una generació i retorna el motiu d'aturada (o None)"""
+        self.generacions += 1
+        self.historial.append(millor)
+
+        if self._referencia is None or millor - self._referencia > self.epsilon_millora:
+            self._referencia = millor
+            self._estancades = 0
+        else:
+            self._estancades += 1
+
+        if self.cancel_lada():
+            return self.motiu
+        if self.score_objectiu is not None and millor >= self.score_objectiu:
+            self.motiu = MOTIU_OBJECTIU
+        elif self.generacions_estancament and self._estancades >= self.generacions_estancament:
+            self.motiu = MOTIU_ESTANCAMENT
+        elif self.temps_esgotat():
+            self.motiu = MOTIU_TEMPS
+        return self.motiu
+
+    def resum(self) -> Dict:
+        """Motiu d'aturada, temps (s) i generacions executades"""
+        return {
+            'motiu_aturada': self.motiu or MOTIU_GENERACIONS,
+            'temps_execucio': self.temps_transcorregut(),
+            'generacions_executades': self.generacions
+        }
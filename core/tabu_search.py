@@ -0,0 +1,128 @@
+# tabu_search.py - MOTOR DE CERCA TABÚ
+
+from array import array
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.data_structures import Assignacio
+from core.single_solution import MotorSolucioUnica
+from core.stopping import CriterisAturada
+
+
+class CercaTabu(MotorSolucioUnica):
+    """
+    Cerca tabú sobre una sola solució. El veïnatge és reassignar una necessitat a
+    un altre treballador elegible (o deixar-la descoberta).
+
+    Quan una necessitat deixa un treballador, la parella (necessitat, treballador)
+    queda tabú durant `durada_tabu` iteracions; un moviment tabú només s'accepta
+    si supera el millor score conegut (criteri d'aspiració). Partint del pla
+    actual, repara en segons una baixa o un descans nou sense tornar a executar
+    l'AG sencer.
+    """
+
+    def __init__(self, *args,
+                 durada_tabu: int = 10,
+                 mida_veinatge: Optional[int] = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durada_tabu = durada_tabu
+        # Moviments que s'avaluen per iteració: el veïnatge complet té un moviment per
+        # parella (necessitat, treballador elegible); `mida_veinatge` en limita la mostra
+        parelles = sum(len(self.model.elegibles[pos]) for pos in self.posicions)
+        self.mida_veinatge = min(mida_veinatge, parelles) if mida_veinatge else parelles
+
+    def executa(self, iteracions: int = 500,
+                verbose: bool = True,
+                temps_maxim: Optional[float] = None,
+                score_objectiu: Optional[float] = None,
+                generacions_estancament: Optional[int] = 50,
+                epsilon_millora: float = 0.0,
+                pla_previ: Optional[List[Tuple[str, date, str]]] = None,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                cancel_lacio=None) -> Tuple[List[Assignacio], Dict]:
+        """
+        Executa la cerca tabú.
+
+        Args:
+            iteracions: Nombre màxim d'iteracions (un moviment aplicat per iteració)
+            temps_maxim, score_objectiu, epsilon_millora: Com a AlgorismeGenetic.executa
+            generacions_estancament: S'atura després de N iteracions sense millora
+                (None = només pel nombre d'iteracions)
+            pla_previ: Pla existent (treballador_id, data, servei) des del qual es comença
+            progress_callback: Es crida amb (iteracions fetes, iteracions totals)
+            cancel_lacio: Com a AlgorismeGenetic.executa; es torna la millor solució trobada
+        """
+        self.resum_execucio = {}
+        criteris = CriterisAturada(temps_maxim, score_objectiu, generacions_estancament,
+                                   epsilon_millora, cancel_lacio)
+
+        avaluador = self.avaluador.carrega(self.solucio_inicial(pla_previ, verbose))
+        cromosoma = avaluador.cromosoma
+        actual = avaluador.nivells()
+        millor, millor_cromosoma = actual, array('i', cromosoma)
+        tabu = {}  # (posició, treballador) -> iteració fins a la qual és tabú
+        aspiracions = fetes = 0
+
+        if verbose:
+            print(f"\n   Cerca tabú: {iteracions} iteracions, durada tabú = {self.durada_tabu}")
+            print(f"   Score inicial: {sum(actual):.2f}")
+
+        for iteracio in range(1, iteracions + 1):
+            escollit = None
+            for pos, idx in self._veinatge(cromosoma):
+                vell = cromosoma[pos]
+                avaluador.canvia(pos, idx)
+                nou = avaluador.nivells()
+                avaluador.canvia(pos, vell)
+
+                es_tabu = tabu.get((pos, idx), 0) >= iteracio
+                if es_tabu and not nou > millor:
+                    continue
+                if escollit is None or nou > escollit[0]:
+                    escollit = (nou, pos, idx, es_tabu)
+
+            if escollit is None:
+                break
+            actual, pos, idx, es_tabu = escollit
+            tabu[(pos, cromosoma[pos])] = iteracio + self.durada_tabu
+            avaluador.canvia(pos, idx)
+            aspiracions += es_tabu
+            fetes = iteracio
+            if actual > millor:
+                millor, millor_cromosoma = actual, array('i', cromosoma)
+
+            if progress_callback:
+                progress_callback(fetes, iteracions)
+            if criteris.comprova(sum(millor)):
+                break
+
+        self.resum_execucio.update(criteris.resum())
+        self.resum_execucio.update({
+            'iteracions': fetes,
+            'aspiracions': aspiracions
+        })
+
+        assignacions, resultat = self.resultat(millor_cromosoma)
+        if verbose:
+            print("\n   ✓ Cerca tabú finalitzada!")
+            print(f"   → Aturada: {self.resum_execucio['motiu_aturada']} després de {fetes} iteracions "
+                  f"({self.resum_execucio['temps_execucio']:.1f} s)")
+            print(f"   → Millor score final: {resultat['total']:.2f}")
+            print(f"   → Assignacions finals: {len(assignacions)}/{len(self.necessitats)}")
+        return assignacions, resultat
+
+    def _veinatge(self, cromosoma: array) -> List[Tuple[int, int]]:
+        """
+        Moviments (posició, treballador nou) d'una iteració: totes les reassignacions
+        de necessitats triades a l'atzar fins a omplir `mida_veinatge`
+        """
+        moviments = []
+        for pos in self.rng.sample(self.posicions, len(self.posicions)):
+            actual = cromosoma[pos]
+            moviments.extend((pos, idx) for idx in self.model.elegibles[pos] if idx != actual)
+            if actual >= 0:
+                moviments.append((pos, -1))
+            if len(moviments) >= self.mida_veinatge:
+                break
+        return moviments
@@ -0,0 +1,74 @@
+# telemetry.py - TELEMETRIA PER GENERACIÓ DE L'ALGORISME GENÈTIC
+
+import json
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Fases que es cronometren en produir un individu (i a cada generació)
+FASES = ('seleccio', 'construccio', 'encreuament', 'mutacio', 'reparacio', 'avaluacio', 'cerca_local')
+
+# (avaluacions, temps per fase) que un procés treballador retorna amb cada lot
+Telemetria = Tuple[int, Dict[str, float]]
+
+
+@dataclass
+class EsdevenimentGeneracio:
+    """Estat d'una generació (la 0 és la població inicial)"""
+    generacio: int
+    generacions: int  # Generacions previstes de l'execució
+    millor: float  # Millor score global
+    actual: float  # Millor score de la generació
+    cobertes: int  # Necessitats cobertes pel millor individu global
+    necessitats: int
+    diversitat: float  # Fracció mitjana de gens que difereixen del millor de la generació
+    prob_mutacio: float
+    temps_fases: Dict[str, float]  # Segons per fase (sumats entre processos)
+    avaluacions: int  # Avaluacions completes (sense cache) de la generació
+    avaluacions_per_segon: float
+    temps_generacio: float
+    temps_transcorregut: float
+
+    def a_dict(self) -> Dict:
+        return asdict(self)
+
+
+class TempsFases:
+    """
+    Acumula el temps de cada fase: `inicia` posa el cronòmetre en marxa i cada
+    `marca` suma a la fase el temps des de la marca anterior
+    """
+
+    def __init__(self):
+        self.temps = dict.fromkeys(FASES, 0.0)
+        self._ultima = time.perf_counter()
+
+    def inicia(self) -> None:
+        self._ultima = time.perf_counter()
+
+    def marca(self, fase: str) -> None:
+        ara = time.perf_counter()
+        self.temps[fase] += ara - self._ultima
+        self._ultima = ara
+
+    def acumula(self, temps: Dict[str, float]) -> None:
+        for fase, segons in temps.items():
+            self.temps[fase] += segons
+
+    def pren(self) -> Dict[str, float]:
+        """Retorna i reinicia els temps acumulats"""
+        temps, self.temps = self.temps, dict.fromkeys(FASES, 0.0)
+        return temps
+
+
+class RegistreJsonl:
+    """Afegeix cada esdeveniment al fitxer com una línia JSON"""
+
+    def __init__(self, fitxer):
+        self.fitxer = Path(fitxer)
+        self.fitxer.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, esdeveniment: EsdevenimentGeneracio) -> None:
+        with open(self.fitxer, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(esdeveniment.a_dict()) + '\n')
@@ -0,0 +1,85 @@
+# timeline.py - ÍNDEX D'INTERVALS OCUPATS PER TREBALLADOR
+
+from bisect import bisect_left, bisect_right
+from datetime import date, time, datetime
+from typing import Dict, Hashable, List, Tuple
+
+from core.data_structures import Assignacio
+
+EPOCA = date(1970, 1, 1)
+
+
+def minuts_des_de_epoca(data: date, hora: time) -> int:
+    """Converteix una data i hora en minuts enters des de l'1/1/1970"""
+    return (data - EPOCA).days * 1440 + hora.hour * 60 + hora.minute
+
+
+def interval_assignacio(assignacio: Assignacio) -> Tuple[int, int]:
+    """Retorna (inici, fi) d'una assignació en minuts des de l'època (considerant creuar mitjanit)"""
+    inici = minuts_des_de_epoca(assignacio.data, assignacio.hora_inici)
+    fi_real = assignacio.hora_fi_real()
+    if not isinstance(fi_real, datetime):
+        fi_real = datetime.combine(assignacio.data, fi_real)
+    fi = minuts_des_de_epoca(fi_real.date(), fi_real.time())
+    return inici, fi
+
+
+class LiniaTemporal:
+    """
+    Intervals ocupats de cada treballador, ordenats per inici.
+
+    Parteix d'una base fixa (normalment l'històric) que només es copia quan es
+    modifica un treballador, i es manté incrementalment mentre es construeix o
+    muta una solució. La comprovació de descans és una cerca binària més la
+    comparació amb els dos veïns.
+    """
+
+    def __init__(self, base: Dict[Hashable, Tuple[List[int], List[int]]] = None,
+                 descans_minuts: int = 12 * 60):
+        self._base = base or {}
+        self.descans_minuts = descans_minuts
+        self._inicis = {}
+        self._fins = {}
+
+    def _llegeix(self, clau) -> Tuple[List[int], List[int]]:
+        if clau in self._inicis:
+            return self._inicis[clau], self._fins[clau]
+        return self._base.get(clau, ((), ()))
+
+    def _modificables(self, clau) -> Tuple[List[int], List[int]]:
+        if clau not in self._inicis:
+            inicis, fins = self._base.get(clau, ((), ()))
+            self._inicis[clau] = list(inicis)
+            self._fins[clau] = list(fins)
+        return self._inicis[clau], self._fins[clau]
+
+    def afegeix(self, clau, inici: int, fi: int) -> None:
+        """Afegeix un interval ocupat al treballador `clau`"""
+        inicis, fins = self._modificables(clau)
+        i = bisect_right(inicis, inici)
+        inicis.insert(i, inici)
+        fins.insert(i, fi)
+
+    def elimina(self, clau, inici: int, fi: int) -> None:
+        """Elimina un interval prèviament afegit (si no hi és, no fa res)"""
+        inicis, fins = self._modificables(clau)
+        i = bisect_left(inicis, inici)
+        while i < len(inicis) and inicis[i] == inici:
+            if fins[i] == fi:
+                del inicis[i]
+                del fins[i]
+                return
+            i += 1
+
+    def compleix_descans(self, clau, inici: int, fi: int) -> bool:
+        """
+        Comprova que l'interval [inici, fi] deixa el descans mínim respecte
+        l'interval anterior i el següent del treballador
+        """
+        inicis, fins = self._llegeix(clau)
+        i = bisect_right(inicis, inici)
+        if i > 0 and inici - fins[i - 1] < self.descans_minuts:
+            return False
+        if i < len(inicis) and inicis[i] - fi < self.descans_minuts:
+            return False
+        return True
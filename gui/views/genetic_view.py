@@ -15,6 +15,14 @@ logger = logging.getLogger(__name__)
 class GeneticView(ttk.Frame):
     """Vista per executar l'algorisme genètic"""
     
+    # Descripció dels motius d'aturada de l'algorisme
+    MOTIUS_ATURADA = {
+        'generacions': "generacions esgotades",
+        'temps_maxim': "temps màxim",
+        'score_objectiu': "score objectiu assolit",
+        'estancament': "sense millora"
+    }
+    
     def __init__(self, parent, controller):
         """
         Inicialitza la vista
@@ -104,6 +112,20 @@ class GeneticView(ttk.Frame):
             width=15
         ).pack(side=tk.LEFT)
         
+        # Temps màxim (0 = sense límit)
+        temps_frame = ttk.Frame(params_frame)
+        temps_frame.pack(fill=tk.X, pady=3)
+        ttk.Label(temps_frame, text="Temps màxim (min):", width=20).pack(side=tk.LEFT)
+        self.temps_maxim_var = tk.IntVar(value=int((config.AG_TEMPS_MAXIM or 0) // 60))
+        ttk.Spinbox(
+            temps_frame,
+            from_=0,
+            to=120,
+            textvariable=self.temps_maxim_var,
+            width=15
+        ).pack(side=tk.LEFT)
+        ttk.Label(temps_frame, text="(0 = sense límit)").pack(side=tk.LEFT, padx=(5, 0))
+        
         # Comportament en duplicats
         dup_frame = ttk.Frame(params_frame)
         dup_frame.pack(fill=tk.X, pady=3)
@@ -117,6 +139,23 @@ class GeneticView(ttk.Frame):
             width=13
         ).pack(side=tk.LEFT)
         
+        # Arrencada a partir del pla actual
+        self.pla_previ_var = tk.BooleanVar(value=config.AG_PARTIR_PLA_PREVI)
+        ttk.Checkbutton(
+            params_frame,
+            text="Partir del pla actual (assignacions existents)",
+            variable=self.pla_previ_var
+        ).pack(anchor=tk.W, pady=3)
+        
+        # Horitzó mòbil per a períodes llargs
+        self.horitzo_mobil_var = tk.BooleanVar(value=config.AG_HORITZO_MOBIL)
+        ttk.Checkbutton(
+            params_frame,
+            text=f"Horitzó mòbil (finestres de {config.AG_DIES_FINESTRA} dies, fins a "
+                 f"{config.AG_MAX_DIES_HORITZO_MOBIL} dies)",
+            variable=self.horitzo_mobil_var
+        ).pack(anchor=tk.W, pady=3)
+        
         # Botó d'execució
         button_frame = ttk.Frame(config_frame)
         button_frame.pack(fill=tk.X)
@@ -239,14 +278,22 @@ class GeneticView(ttk.Frame):
         
         data_inici, data_fi = self.date_range_picker.get_date_range()
         dies = (data_fi - data_inici).days + 1
-        
-        if dies > 90:
-            messagebox.showwarning(
-                "Validació",
-                "El període no pot superar 90 dies"
-            )
+        horitzo_mobil = self.horitzo_mobil_var.get()
+        max_dies = config.AG_MAX_DIES_HORITZO_MOBIL if horitzo_mobil else 90
+        
+        if dies > max_dies:
+            missatge = f"El període no pot superar {max_dies} dies"
+            if not horitzo_mobil:
+                missatge += "\n\nPer a períodes més llargs, activa l'horitzó mòbil."
+            messagebox.showwarning("Validació", missatge)
             return
         
+        temps_maxim = self.temps_maxim_var.get() * 60 or None
+        if temps_maxim:
+            durada = f"S'aturarà com a màxim en {self.temps_maxim_var.get()} minuts."
+        else:
+            durada = "Això pot trigar diversos minuts."
+        
         # Confirmació
         confirm = messagebox.askyesno(
             "Confirmar Execució",
@@ -255,12 +302,21 @@ class GeneticView(ttk.Frame):
             f"{data_fi.strftime(config.DATE_FORMAT_DISPLAY)}\n"
             f"Població: {self.poblacio_var.get()}\n"
             f"Generacions: {self.generacions_var.get()}\n\n"
-            f"Això pot trigar diversos minuts."
+            f"{durada}"
         )
         
         if not confirm:
             return
         
+        # Execució interrompuda del mateix període
+        reprendre = False
+        if not horitzo_mobil and self.controller.hi_ha_checkpoint(data_inici, data_fi):
+            reprendre = messagebox.askyesno(
+                "Reprendre Execució",
+                "Hi ha una execució interrompuda d'aquest període.\n\n"
+                "Vols reprendre-la des de l'últim punt de control?"
+            )
+        
         # Configurar UI per execució
         self.running = True
         self.run_button.config(state='disabled')
@@ -280,6 +336,10 @@ class GeneticView(ttk.Frame):
                 data_fi=data_fi,
                 mida_poblacio=self.poblacio_var.get(),
                 generacions=self.generacions_var.get(),
+                temps_maxim=temps_maxim,
+                reprendre=reprendre,
+                partir_pla_previ=self.pla_previ_var.get(),
+                horitzo_mobil=horitzo_mobil,
                 on_duplicate=self.duplicats_var.get(),
                 progress_callback=self._update_progress,
                 finish_callback=self._on_finish
@@ -318,6 +378,46 @@ class GeneticView(ttk.Frame):
                 f"Fitness final: {result['fitness_final']:.2f}\n"
                 f"Assignacions generades: {result['assignacions']}\n"
             )
+            if result.get('motiu_aturada'):
+                if 'iteracions' in result:
+                    execucio = f"{result['iteracions']} iteracions"
+                else:
+                    execucio = f"{result['generacions_executades']} generacions"
+                summary += (
+                    f"Aturada: {self.MOTIUS_ATURADA.get(result['motiu_aturada'], result['motiu_aturada'])} "
+                    f"({execucio}, {result['temps_execucio']:.1f} s)\n"
+                )
+            if result.get('motor') == 'recuit':
+                summary += f"Motor: recuit simulat ({result['moviments_acceptats']} moviments acceptats)\n"
+            elif result.get('motor') == 'tabu':
+                summary += f"Motor: cerca tabú ({result['aspiracions']} aspiracions)\n"
+            elif result.get('motor') == 'diari':
+                summary += (
+                    f"Motor: aparellament per dies ({result['necessitats_cobertes']} necessitats cobertes, "
+                    f"cota superior {result['cota_cobertura']}, {result['temps_execucio'] * 1000:.0f} ms)\n"
+                )
+            if result.get('necessitats_impossibles') or result.get('assignacions_forcades'):
+                summary += (
+                    f"Presolució: {result['necessitats_impossibles']} necessitats impossibles, "
+                    f"{result['assignacions_forcades']} assignacions forçades\n"
+                )
+            if result.get('components'):
+                summary += f"Components independents: {result['components']}\n"
+            if result.get('finestres'):
+                summary += f"Finestres de l'horitzó mòbil: {result['finestres']}\n"
+            if result.get('necessitats_pla_previ'):
+                summary += f"Necessitats cobertes pel pla previ: {result['necessitats_pla_previ']}\n"
+            if result.get('generacio_represa'):
+                summary += f"Represa des de la generació: {result['generacio_represa']}\n"
+            if result.get('millores_cerca_local'):
+                summary += f"Millores de la cerca local: {result['millores_cerca_local']}\n"
+            if result.get('llavor') is not None:
+                summary += f"Llavor aleatòria: {result['llavor']}\n"
+            if result.get('cache_encerts') is not None:
+                summary += (
+                    f"Cache de fitness: {result['cache_encerts']} encerts / "
+                    f"{result['cache_errades']} errades ({result['cache_taxa_encerts']:.0%})\n"
+                )
             
             self.summary_text.insert('1.0', summary)
             self.summary_text.config(state='disabled')
@@ -331,6 +431,8 @@ class GeneticView(ttk.Frame):
                 f"Fitness: {result['fitness_final']:.2f}\n"
                 f"Assignacions: {result['assignacions']}"
             )
+        elif self.controller.is_cancelled():
+            self.progress_label.config(text="❌ Cancel·lat per l'usuari")
         else:
             # Error
             self.progress_label.config(text=f"❌ Error: {result}")
@@ -0,0 +1,75 @@
+# conftest.py - DADES COMUNES DELS TESTS
+
+import contextlib
+import io
+import math
+import os
+import random
+import sys
+from array import array
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from controllers.genetic_controller import GeneticController
+from core.data_loader import DataLoader
+from core.data_structures import EstadistiquesGlobals
+from core.genetic_algorithm import AlgorismeGenetic
+
+
+@pytest.fixture(scope='session')
+def dades():
+    """Dades de la base de dades inclosa al repositori (15 necessitats del grup T)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = DataLoader(db_path=str(config.DB_PATH))
+        return {
+            'treballadors': loader.carrega_treballadors(),
+            'torns': loader.carrega_torns(),
+            'necessitats': loader.carrega_necessitats_cobertura(),
+            'calendari': loader.carrega_calendari(),
+            'exclude_map': loader.carrega_descansos_dies(),
+        }
+
+
+@pytest.fixture
+def crea_ag(dades):
+    """Construeix un AlgorismeGenetic amb les restriccions del controller (rígides amb pes infinit)"""
+    def crea(**parametres):
+        parametres.setdefault('mida_poblacio', 10)
+        parametres.setdefault('llavor', 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return AlgorismeGenetic(
+                restriccions=parametres.pop('restriccions', None) or GeneticController.crea_restriccions(),
+                estadistiques=EstadistiquesGlobals(),
+                **dades, **parametres
+            )
+    return crea
+
+
+@pytest.fixture
+def restriccions_finites():
+    """Les restriccions del controller amb pes 1000 a les rígides: el total es pot comparar"""
+    restriccions = GeneticController.crea_restriccions()
+    for restriccio in restriccions.restriccions:
+        if math.isinf(restriccio['pes']):
+            restriccio['pes'] = 1000.0
+    return restriccions
+
+
+@pytest.fixture
+def cromosomes_aleatoris():
+    """
+    Cromosomes amb gens elegibles a l'atzar o descoberts. La meitat dels gens
+    surten dels dos primers elegibles, perquè hi hagi duplicats i violacions
+    """
+    def gen(rng, elegibles):
+        if not elegibles or rng.random() < 0.15:
+            return -1
+        return rng.choice(elegibles[:2] if rng.random() < 0.5 else elegibles)
+
+    def genera(ag, num, llavor=0):
+        rng = random.Random(llavor)
+        return [array('i', [gen(rng, elegibles) for elegibles in ag.elegibles]) for _ in range(num)]
+    return genera
@@ -0,0 +1,40 @@
+# test_batch_evaluation.py - AVALUACIÓ PER LOTS (NUMPY) CONTRA L'AVALUACIÓ INCREMENTAL
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from core.batch_evaluation import AvaluadorLots
+from core.incremental_evaluation import AvaluadorIncremental
+
+
+def test_lot_igual_que_incremental(crea_ag, restriccions_finites, cromosomes_aleatoris):
+    ag = crea_ag(restriccions=restriccions_finites)
+    cromosomes = cromosomes_aleatoris(ag, 40, llavor=3)
+    resultats = AvaluadorLots(ag).avalua(cromosomes)
+    incremental = AvaluadorIncremental(ag)
+    assert len(resultats) == len(cromosomes)
+    for cromosoma, resultat in zip(cromosomes, resultats):
+        assert resultat['total'] == pytest.approx(incremental.carrega(cromosoma).total(), rel=1e-12)
+
+
+def test_detall_per_restriccio(crea_ag, restriccions_finites, cromosomes_aleatoris):
+    ag = crea_ag(restriccions=restriccions_finites)
+    cromosoma = cromosomes_aleatoris(ag, 1, llavor=4)[0]
+    resultat = AvaluadorLots(ag).avalua([cromosoma])[0]
+    complet = ag.restriccions.evalua_solucio(
+        ag.descodifica(cromosoma), ag.treballadors, ag.torns, ag.necessitats,
+        ag.calendari, ag.estadistiques
+    )
+    assert resultat['detall'].keys() == complet['detall'].keys()
+    for nom, detall in complet['detall'].items():
+        assert resultat['detall'][nom]['score'] == pytest.approx(detall['score'], rel=1e-12)
+
+
+def test_avaluacio_lots_no_canvia_el_pla(crea_ag):
+    plans = []
+    for lots in (False, True):
+        ag = crea_ag(avaluacio_lots=lots, llavor=7)
+        solucio, _ = ag.executa(generacions=5, verbose=False)
+        plans.append(sorted((a.treballador_id, a.data, a.torn_id) for a in solucio))
+    assert plans[0] == plans[1]
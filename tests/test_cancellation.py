@@ -0,0 +1,31 @@
+# test_cancellation.py - CANCEL·LACIÓ COOPERATIVA DE L'ALGORISME GENÈTIC
+
+import threading
+
+
+def test_cancel_lacio_retorna_el_millor_fins_ara(crea_ag, restriccions_finites):
+    cancel_lacio = threading.Event()
+    esdeveniments = []
+
+    def telemetria(esdeveniment):
+        esdeveniments.append(esdeveniment)
+        if esdeveniment.generacio == 2:
+            cancel_lacio.set()
+
+    ag = crea_ag(restriccions=restriccions_finites)
+    solucio, resultat = ag.executa(generacions=1000, verbose=False, telemetria=telemetria,
+                                   cancel_lacio=cancel_lacio)
+
+    assert ag.resum_execucio['motiu_aturada'] == 'cancel_lacio'
+    assert ag.resum_execucio['generacions_executades'] < 10
+    assert solucio
+    assert resultat['total'] >= max(e.millor for e in esdeveniments)
+
+
+def test_cancel_lacio_abans_de_comencar(crea_ag):
+    cancel_lacio = threading.Event()
+    cancel_lacio.set()
+    ag = crea_ag(mida_poblacio=50)
+    solucio, resultat = ag.executa(generacions=1000, verbose=False, cancel_lacio=cancel_lacio)
+    assert ag.resum_execucio['motiu_aturada'] == 'cancel_lacio'
+    assert isinstance(solucio, list) and 'total' in resultat
@@ -0,0 +1,17 @@
+# test_cerca_local.py - CERCA LOCAL MEMÈTICA AMB RESTRICCIONS DE PES INFINIT
+
+from array import array
+
+
+def test_cerca_local_millora_amb_pesos_infinits(crea_ag):
+    ag = crea_ag(cerca_local=1)
+    buit = array('i', [-1] * len(ag.necessitats))
+    resultat = ag.puntua(buit)
+
+    millorat, resultat_millorat = ag.cerca_local_individu(buit, resultat, max_moviments=2000)
+
+    cobertes = sum(1 for gen in millorat if gen >= 0)
+    assert cobertes > len(ag.necessitats) // 2
+    avaluador = ag._avaluador.carrega(millorat)
+    assert avaluador.nivells()[0] == 0  # Sense violacions rígides
+    assert resultat_millorat['total'] == float('inf')
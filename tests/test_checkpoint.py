@@ -0,0 +1,45 @@
+# test_checkpoint.py - PUNTS DE CONTROL I REPRESA DE L'ALGORISME GENÈTIC
+
+import gzip
+import pickle
+
+from core.checkpoint import carrega_checkpoint, desa_checkpoint, elimina_checkpoint
+
+
+def test_desa_i_carrega(tmp_path):
+    fitxer = tmp_path / 'nou' / 'ag.pkl.gz'  # El directori es crea en desar
+    desa_checkpoint(str(fitxer), {'generacio': 7, 'poblacio': [1, 2, 3]})
+    estat = carrega_checkpoint(str(fitxer))
+    assert estat['generacio'] == 7
+    assert estat['poblacio'] == [1, 2, 3]
+    elimina_checkpoint(str(fitxer))
+    assert carrega_checkpoint(str(fitxer)) is None
+
+
+def test_ignora_versio_diferent_i_fitxer_malmes(tmp_path):
+    fitxer = tmp_path / 'ag.pkl.gz'
+    with gzip.open(fitxer, 'wb') as f:
+        pickle.dump({'versio': -1}, f)
+    assert carrega_checkpoint(str(fitxer)) is None
+    fitxer.write_bytes(b'no es gzip')
+    assert carrega_checkpoint(str(fitxer)) is None
+
+
+def test_represa_igual_que_execucio_sense_checkpoint(crea_ag, restriccions_finites, tmp_path):
+    fitxer = str(tmp_path / 'ag.pkl.gz')
+
+    def executa(generacions, fitxer_checkpoint=None, reprendre=False):
+        ag = crea_ag(restriccions=restriccions_finites, llavor=11)
+        solucio, resultat = ag.executa(generacions=generacions, verbose=False,
+                                       fitxer_checkpoint=fitxer_checkpoint,
+                                       interval_checkpoint=5, reprendre=reprendre)
+        return sorted((a.treballador_id, a.data, a.torn_id) for a in solucio), resultat['total'], ag
+
+    sense_checkpoint = executa(12)[:2]
+    # Desar checkpoints no altera l'execució
+    assert executa(12, fitxer)[:2] == sense_checkpoint
+    elimina_checkpoint(fitxer)
+    executa(10, fitxer)  # S'interromp després del checkpoint de la generació 10
+    *represa, ag = executa(12, fitxer, reprendre=True)
+    assert ag.resum_execucio['generacio_represa'] == 10
+    assert tuple(represa) == sense_checkpoint
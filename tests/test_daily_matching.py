@@ -0,0 +1,68 @@
+# test_daily_matching.py - APARELLAMENT DE COST MÍNIM PER DIES
+
+import itertools
+import random
+import threading
+
+import pytest
+
+from controllers.genetic_controller import GeneticController
+from core.daily_matching import AssignacioPerDies, aparellament_cost_minim
+from core.data_structures import EstadistiquesGlobals
+from core.incremental_evaluation import AvaluadorIncremental
+
+
+def _cost(costos, columnes):
+    return sum(fila[j] for fila, j in zip(costos, columnes))
+
+
+def test_aparellament_optim_contra_forca_bruta():
+    rng = random.Random(0)
+    for _ in range(50):
+        n, m = rng.randint(1, 4), rng.randint(4, 6)
+        costos = [[rng.choice([rng.uniform(0, 10), float('inf')]) for _ in range(m)] for _ in range(n)]
+        for i, fila in enumerate(costos):
+            fila[i] = rng.uniform(0, 10)  # Com la columna de descoberta: sempre hi ha solució finita
+        columnes = aparellament_cost_minim(costos)
+        assert len(set(columnes)) == n
+        millor = min(_cost(costos, perm) for perm in itertools.permutations(range(m), n))
+        assert _cost(costos, columnes) == pytest.approx(millor)
+
+
+def test_aparellament_casos_limit():
+    assert aparellament_cost_minim([]) == []
+    with pytest.raises(ValueError):
+        aparellament_cost_minim([[1.0], [2.0]])
+
+
+def test_pla_per_dies_determinista_i_valid(dades):
+    plans = []
+    for _ in range(2):
+        motor = AssignacioPerDies(dades['treballadors'], dades['torns'], dades['necessitats'],
+                                  dades['calendari'], GeneticController.crea_restriccions(),
+                                  EstadistiquesGlobals(), exclude_map=dades['exclude_map'])
+        solucio, _ = motor.executa(verbose=False)
+        cromosoma = motor.model.codifica(solucio)
+        assert AvaluadorIncremental(motor.model).carrega(cromosoma).nivells()[0] == 0
+        assert motor.resum_execucio['necessitats_cobertes'] <= motor.resum_execucio['cota_cobertura']
+        plans.append(sorted((a.treballador_id, a.data, a.torn_id) for a in solucio))
+    assert plans[0] == plans[1]
+    assert len(plans[0]) == len(dades['necessitats'])
+
+
+def test_cancel_lacio_entre_dies(dades):
+    motor = AssignacioPerDies(dades['treballadors'], dades['torns'], dades['necessitats'],
+                              dades['calendari'], GeneticController.crea_restriccions(),
+                              EstadistiquesGlobals(), exclude_map=dades['exclude_map'])
+    cancel_lacio = threading.Event()
+    progres = []
+
+    def progress_callback(fets, total):
+        progres.append((fets, total))
+        cancel_lacio.set()  # Es cancel·la en acabar el primer dia
+
+    solucio, resultat = motor.executa(verbose=False, progress_callback=progress_callback,
+                                      cancel_lacio=cancel_lacio)
+    assert progres == [(1, progres[0][1])] and progres[0][1] > 1
+    assert motor.resum_execucio['motiu_aturada'] == 'cancel_lacio'
+    assert solucio and len({a.data for a in solucio}) == 1 and 'total' in resultat
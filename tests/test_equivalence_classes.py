@@ -0,0 +1,75 @@
+# test_equivalence_classes.py - FORMA CANÒNICA PER A TREBALLADORS EQUIVALENTS
+
+import contextlib
+import copy
+import io
+import math
+import random
+from array import array
+
+from controllers.genetic_controller import GeneticController
+from core.data_structures import EstadistiquesGlobals
+from core.genetic_algorithm import AlgorismeGenetic
+
+
+def _permuta_classes(ag, cromosoma):
+    """Intercanvia els paquets dels membres de cada classe (solució simètrica)"""
+    permutacio = {}
+    for classe in ag.classes_equivalencia:
+        for origen, desti in zip(classe, classe[1:] + classe[:1]):
+            permutacio[origen] = desti
+    return array('i', [permutacio.get(idx, idx) for idx in cromosoma])
+
+
+def _paquets(cromosoma):
+    paquets = {}
+    for pos, idx in enumerate(cromosoma):
+        if idx >= 0:
+            paquets.setdefault(idx, []).append(pos)
+    return paquets
+
+
+def test_forma_canonica_invariant_per_permutacions(crea_ag, cromosomes_aleatoris):
+    ag = crea_ag(classes_equivalencia=True)
+    assert ag.classes_equivalencia
+
+    for cromosoma in cromosomes_aleatoris(ag, 30):
+        canonic = ag._canonitza(cromosoma)
+        assert ag._canonitza(_permuta_classes(ag, cromosoma)) == canonic
+        assert ag._canonitza(canonic) == canonic
+        assert ag.evalua_validesa_cromosoma(canonic) == ag.evalua_validesa_cromosoma(cromosoma)
+
+
+def test_forma_canonica_no_empitjora_la_franja_d_hores(dades, cromosomes_aleatoris):
+    # Hores fetes diferents dins de cada classe, a prop dels límits anuals i ampliables
+    treballadors = copy.deepcopy(dades['treballadors'])
+    rng = random.Random(3)
+    for treb in treballadors.values():
+        treb.hores_anuals_realitzades = rng.choice([
+            rng.uniform(treb.max_hores_anuals - 20, treb.max_hores_anuals),
+            rng.uniform(treb.max_hores_ampliables - 20, treb.max_hores_ampliables)
+        ])
+    with contextlib.redirect_stdout(io.StringIO()):
+        ag = AlgorismeGenetic(
+            treballadors=treballadors, torns=dades['torns'], necessitats=dades['necessitats'],
+            calendari=dades['calendari'], restriccions=GeneticController.crea_restriccions(),
+            estadistiques=EstadistiquesGlobals(), mida_poblacio=10, exclude_map=dades['exclude_map'],
+            classes_equivalencia=True, llavor=1
+        )
+    assert ag.classes_equivalencia
+
+    for cromosoma in cromosomes_aleatoris(ag, 50, llavor=1):
+        canonic = ag._canonitza(cromosoma)
+        for propietari, paquet in _paquets(cromosoma).items():
+            nou = canonic[paquet[0]]
+            assert all(canonic[pos] == nou for pos in paquet)  # Els paquets no es parteixen
+            hores = sum(ag.horaris[pos].durada_hores for pos in paquet if ag.horaris[pos] is not None)
+            assert ag._nivell_hores(nou, hores) <= ag._nivell_hores(propietari, hores)
+
+
+def test_execucio_amb_classes_equivalents(crea_ag, restriccions_finites):
+    ag = crea_ag(classes_equivalencia=True, restriccions=restriccions_finites)
+    solucio, resultat = ag.executa(generacions=3, verbose=False)
+    assert solucio and math.isfinite(resultat['total'])
+    assert len({(a.torn_id, a.data) for a in solucio}) == len(solucio)
+    assert len({(a.treballador_id, a.data) for a in solucio}) == len(solucio)
@@ -0,0 +1,32 @@
+# test_feasibility.py - PRESOLUCIÓ: NECESSITATS IMPOSSIBLES I ASSIGNACIONS FORÇADES
+
+from datetime import date
+
+from core.data_structures import EstadistiquesGlobals
+from core.feasibility import analitza_viabilitat
+
+
+def test_impossibles_i_forcades(dades, crea_ag):
+    ag = crea_ag()
+    posicio = {(nec.servei, nec.data): pos for pos, nec in enumerate(ag.necessitats)}
+    candidats = lambda servei, dia: [ag.ids_treballadors[idx] for idx in ag.elegibles[posicio[(servei, dia)]]]
+
+    # 4/11: tots els candidats exclosos; 5/11: només en queda un
+    impossible, forcada = date(2025, 11, 4), date(2025, 11, 5)
+    unic, *resta = candidats('AIG2', forcada)
+    exclude_map = {impossible: set(candidats('AIG2', impossible)), forcada: set(resta)}
+
+    informe = analitza_viabilitat(dades['treballadors'], dades['torns'], dades['necessitats'],
+                                  dades['calendari'], EstadistiquesGlobals(), exclude_map)
+
+    assert [(nec.servei, nec.data) for nec, _ in informe.impossibles] == [('AIG2', impossible)]
+    assert informe.assignacions_forcades() == {('AIG2', forcada): unic}
+    viables = informe.necessitats_viables(dades['necessitats'])
+    assert len(viables) == len(dades['necessitats']) - 1
+    assert informe.resum() == {'necessitats_impossibles': 1, 'assignacions_forcades': 1}
+
+
+def test_sense_restriccions_extra_tot_es_viable(dades):
+    informe = analitza_viabilitat(dades['treballadors'], dades['torns'], dades['necessitats'],
+                                  dades['calendari'], EstadistiquesGlobals(), {})
+    assert informe.impossibles == []
@@ -0,0 +1,37 @@
+# test_population.py - POBLACIÓ COM A ESTRUCTURA DE VECTORS
+
+import random
+
+from core.population import Poblacio
+
+
+def _poblacio(scores):
+    return Poblacio((f"ind{i}", {'total': score}) for i, score in enumerate(scores))
+
+
+def test_seleccio_per_scores():
+    poblacio = _poblacio([3.0, 9.0, 1.0, 9.0, 5.0])
+    assert len(poblacio) == 5
+    assert poblacio.index_millor() == 1  # A igualtat, el primer
+    assert poblacio.millor() == ('ind1', {'total': 9.0})
+    assert poblacio.millors(3) == [1, 3, 4]
+    assert poblacio.pitjors(2) == [2, 0]
+
+
+def test_substitueix_actualitza_scores():
+    poblacio = _poblacio([3.0, 9.0, 1.0])
+    poblacio.substitueix(2, 'nou', {'total': 10.0})
+    assert poblacio.index_millor() == 2
+    assert poblacio.parelles()[2] == ('nou', {'total': 10.0})
+    assert list(poblacio.scores) == [3.0, 9.0, 10.0]
+
+
+def test_torneigs():
+    poblacio = _poblacio([float(i) for i in range(20)])
+    guanyadors = poblacio.torneigs(random.Random(1), 200, mida=3)
+    assert len(guanyadors) == 200
+    assert all(0 <= i < 20 for i in guanyadors)
+    assert sum(guanyadors) / len(guanyadors) > 10  # Guanya el millor de cada torneig
+    assert poblacio.torneigs(random.Random(1), 200) == guanyadors
+    # Torneig de tota la població: sempre guanya el millor
+    assert set(poblacio.torneigs(random.Random(2), 10, mida=20)) == {19}
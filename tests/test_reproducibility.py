@@ -0,0 +1,23 @@
+# test_reproducibility.py - MATEIXA LLAVOR, MATEIX PLA AMB 1 O N PROCESSOS
+
+
+def _pla(solucio):
+    return sorted((a.treballador_id, a.data, a.torn_id) for a in solucio)
+
+
+def test_mateix_pla_amb_qualsevol_nombre_de_processos(crea_ag, restriccions_finites):
+    resultats = []
+    for processos in (1, 2):
+        ag = crea_ag(restriccions=restriccions_finites, llavor=21)
+        solucio, resultat = ag.executa(generacions=6, processos=processos, verbose=False)
+        resultats.append((_pla(solucio), resultat['total']))
+    assert resultats[0] == resultats[1]
+
+
+def test_llavors_diferents_exploren_diferent(crea_ag, restriccions_finites):
+    plans = set()
+    for llavor in range(4):
+        ag = crea_ag(restriccions=restriccions_finites, llavor=llavor)
+        solucio, _ = ag.executa(generacions=2, verbose=False)
+        plans.add(tuple(_pla(solucio)))
+    assert len(plans) > 1
@@ -0,0 +1,53 @@
+# test_rolling_horizon.py - PLANIFICACIÓ PER FINESTRES SOLAPADES
+
+import pickle
+from datetime import date, timedelta
+
+import pytest
+
+from core.data_structures import EstadistiquesGlobals
+from core.rolling_horizon import PlanificadorHoritzoMobil
+
+
+def _planificador(dades, restriccions, estadistiques, **parametres):
+    return PlanificadorHoritzoMobil(
+        dades['treballadors'], dades['torns'], dades['necessitats'], dades['calendari'],
+        restriccions, estadistiques,
+        exclude_map=dades['exclude_map'], mida_poblacio=8, llavor=4, **parametres
+    )
+
+
+def test_finestres_cobreixen_el_periode(dades, restriccions_finites):
+    planificador = _planificador(dades, restriccions_finites, EstadistiquesGlobals(),
+                                 dies_finestra=7, dies_solapament=2)
+    inici, fi = date(2025, 11, 1), date(2025, 11, 30)
+    finestres = planificador.finestres(inici, fi)
+    assert finestres[0][0] == inici and finestres[-1][1] == fi and finestres[-1][2] == fi
+    for (_, _, fixa_fins), (inici_seguent, _, _) in zip(finestres, finestres[1:]):
+        assert inici_seguent == fixa_fins + timedelta(days=1)  # Cada dia es fixa un sol cop
+    with pytest.raises(ValueError):
+        _planificador(dades, restriccions_finites, EstadistiquesGlobals(), dies_finestra=7, dies_solapament=7)
+
+
+def test_pla_complet_sense_modificar_l_estat(dades, restriccions_finites):
+    estadistiques = EstadistiquesGlobals()
+    abans = pickle.dumps((dades['treballadors'], estadistiques))
+    plans = []
+    for _ in range(2):
+        planificador = _planificador(dades, restriccions_finites, estadistiques,
+                                     dies_finestra=7, dies_solapament=2)
+        solucio, info = planificador.executa(date(2025, 11, 3), date(2025, 11, 15),
+                                             verbose=False, generacions=3)
+        plans.append(sorted((a.treballador_id, a.data, a.torn_id) for a in solucio))
+        assert len(info['finestres']) == planificador.resum_execucio['finestres']
+        # El total és el del pla consolidat sencer, no la suma de les finestres
+        complet = restriccions_finites.evalua_solucio(
+            solucio, dades['treballadors'], dades['torns'], dades['necessitats'],
+            dades['calendari'], EstadistiquesGlobals()
+        )
+        assert info['total'] == pytest.approx(complet['total'])
+        assert info['detall'] == complet['detall']
+    # Cada necessitat es fixa un sol cop i dues execucions parteixen del mateix estat
+    assert len({(servei, dia) for _, dia, servei in plans[0]}) == len(plans[0])
+    assert plans[0] == plans[1]
+    assert pickle.dumps((dades['treballadors'], estadistiques)) == abans
@@ -0,0 +1,86 @@
+# test_single_solution.py - RECUIT SIMULAT I CERCA TABÚ
+
+import threading
+
+import pytest
+
+from controllers.genetic_controller import GeneticController
+from core.data_structures import EstadistiquesGlobals
+from core.incremental_evaluation import AvaluadorIncremental
+from core.simulated_annealing import RecuitSimulat
+from core.tabu_search import CercaTabu
+
+
+def _motor(classe, dades, **parametres):
+    return classe(dades['treballadors'], dades['torns'], dades['necessitats'], dades['calendari'],
+                  GeneticController.crea_restriccions(), EstadistiquesGlobals(),
+                  exclude_map=dades['exclude_map'], **parametres)
+
+
+def _nivells(motor, solucio):
+    return AvaluadorIncremental(motor.model).carrega(motor.model.codifica(solucio)).nivells()
+
+
+@pytest.mark.parametrize('classe, iteracions', [(RecuitSimulat, 3000), (CercaTabu, 30)])
+def test_millora_sense_violacions_i_reproduible(dades, classe, iteracions):
+    plans = []
+    for _ in range(2):
+        motor = _motor(classe, dades, llavor=5)
+        inicial = _nivells(motor, motor.model.descodifica(motor.solucio_inicial(verbose=False)))
+        motor = _motor(classe, dades, llavor=5)
+        solucio, _ = motor.executa(iteracions=iteracions, verbose=False)
+        nivells = _nivells(motor, solucio)
+        assert nivells[0] == 0
+        assert nivells >= inicial
+        plans.append(sorted((a.treballador_id, a.data, a.torn_id) for a in solucio))
+    assert plans[0] == plans[1]
+
+
+def test_tabu_repara_el_pla_previ(dades):
+    motor = _motor(CercaTabu, dades, llavor=1)
+    solucio, _ = motor.executa(iteracions=30, verbose=False)
+    pla = [(a.treballador_id, a.data, a.torn_id) for a in solucio]
+    assert len(pla) == len(dades['necessitats'])
+
+    # Una baixa deixa una necessitat descoberta: es torna a cobrir i la resta del pla es manté
+    motor = _motor(CercaTabu, dades, llavor=1)
+    replanificat, _ = motor.executa(iteracions=5, verbose=False, pla_previ=pla[1:])
+    nou = {(a.treballador_id, a.data, a.torn_id) for a in replanificat}
+    assert len(nou) == len(dades['necessitats'])
+    assert len(nou & set(pla[1:])) >= len(pla) - 1 - 5
+
+
+def test_tabu_veinatge_complet_i_aturada_per_estancament(dades):
+    motor = _motor(CercaTabu, dades, llavor=3)
+    parelles = sum(len(motor.model.elegibles[pos]) for pos in motor.posicions)
+    assert motor.mida_veinatge == parelles
+    assert _motor(CercaTabu, dades, mida_veinatge=10 ** 6).mida_veinatge == parelles
+    assert _motor(CercaTabu, dades, mida_veinatge=20).mida_veinatge == 20
+    motor.executa(iteracions=10 ** 6, verbose=False)
+    assert motor.resum_execucio['motiu_aturada'] == 'estancament'
+
+
+@pytest.mark.parametrize('classe', [RecuitSimulat, CercaTabu])
+def test_cancel_lacio_retorna_la_millor_solucio(dades, classe):
+    cancel_lacio = threading.Event()
+    cancel_lacio.set()
+    motor = _motor(classe, dades, llavor=2)
+    solucio, resultat = motor.executa(iteracions=10 ** 6, verbose=False, cancel_lacio=cancel_lacio)
+    assert motor.resum_execucio['motiu_aturada'] == 'cancel_lacio'
+    assert solucio and 'total' in resultat
+
+
+def test_recuit_comprova_l_aturada_cada_pocs_moviments(dades, monkeypatch):
+    monkeypatch.setattr('core.simulated_annealing.MIDA_BLOC_MAXIMA', 4)
+    cancel_lacio = threading.Event()
+    crides = []
+
+    def progres(fetes, total):
+        crides.append(fetes)
+        cancel_lacio.set()
+
+    motor = _motor(RecuitSimulat, dades, llavor=2)
+    motor.executa(iteracions=10 ** 6, verbose=False, progress_callback=progres, cancel_lacio=cancel_lacio)
+    assert crides == [4]
+    assert motor.resum_execucio['iteracions'] == 4
+    assert motor.resum_execucio['motiu_aturada'] == 'cancel_lacio'
@@ -0,0 +1,44 @@
+# test_stopping.py - CRITERIS D'ATURADA
+
+import threading
+import time
+
+from core.stopping import (
+    CriterisAturada, MOTIU_CANCEL_LACIO, MOTIU_ESTANCAMENT, MOTIU_GENERACIONS,
+    MOTIU_OBJECTIU, MOTIU_TEMPS
+)
+
+
+def test_sense_criteris_no_s_atura():
+    criteris = CriterisAturada()
+    assert all(criteris.comprova(float(i)) is None for i in range(50))
+    assert criteris.resum()['motiu_aturada'] == MOTIU_GENERACIONS
+    assert criteris.resum()['generacions_executades'] == 50
+
+
+def test_score_objectiu():
+    criteris = CriterisAturada(score_objectiu=10.0)
+    assert criteris.comprova(9.0) is None
+    assert criteris.comprova(10.0) == MOTIU_OBJECTIU
+
+
+def test_estancament_amb_epsilon():
+    criteris = CriterisAturada(generacions_estancament=3, epsilon_millora=0.5)
+    assert criteris.comprova(1.0) is None
+    assert criteris.comprova(1.4) is None  # Millora per sota de l'epsilon
+    assert criteris.comprova(1.2) is None
+    assert criteris.comprova(1.3) == MOTIU_ESTANCAMENT
+
+
+def test_temps_maxim():
+    criteris = CriterisAturada(temps_maxim=0.01)
+    time.sleep(0.02)
+    assert criteris.comprova(1.0) == MOTIU_TEMPS
+
+
+def test_cancel_lacio():
+    cancel_lacio = threading.Event()
+    criteris = CriterisAturada(score_objectiu=0.0, cancel_lacio=cancel_lacio)
+    assert not criteris.cancel_lada()
+    cancel_lacio.set()
+    assert criteris.comprova(1.0) == MOTIU_CANCEL_LACIO
@@ -0,0 +1,32 @@
+# test_timeline.py - LÍNIA TEMPORAL D'INTERVALS PER TREBALLADOR
+
+from datetime import date, time
+
+from core.timeline import LiniaTemporal, minuts_des_de_epoca
+
+HORA = 60
+
+
+def test_minuts_des_de_epoca():
+    assert minuts_des_de_epoca(date(1970, 1, 2), time(1, 30)) == 1440 + 90
+
+
+def test_descans_amb_veins():
+    linia = LiniaTemporal()
+    linia.afegeix('A', 100 * HORA, 108 * HORA)
+    assert linia.compleix_descans('A', 120 * HORA, 128 * HORA)  # 12h exactes després
+    assert not linia.compleix_descans('A', 119 * HORA, 127 * HORA)
+    assert linia.compleix_descans('A', 80 * HORA, 88 * HORA)  # 12h exactes abans
+    assert not linia.compleix_descans('A', 81 * HORA, 89 * HORA)
+    assert linia.compleix_descans('B', 101 * HORA, 109 * HORA)  # Un altre treballador
+
+
+def test_elimina_i_base_compartida():
+    base = {'A': ([100 * HORA], [108 * HORA])}
+    linia = LiniaTemporal(base)
+    assert not linia.compleix_descans('A', 110 * HORA, 118 * HORA)
+    linia.elimina('A', 100 * HORA, 108 * HORA)
+    assert linia.compleix_descans('A', 110 * HORA, 118 * HORA)
+    # La base (històric) no es modifica
+    assert base == {'A': ([100 * HORA], [108 * HORA])}
+    assert not LiniaTemporal(base).compleix_descans('A', 110 * HORA, 118 * HORA)